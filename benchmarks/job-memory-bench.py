@@ -0,0 +1,81 @@
+#! /usr/bin/env python
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import reqless
+
+
+# First off, read the arguments
+parser = argparse.ArgumentParser(
+    description="Measure the memory and time taken to fetch many jobs."
+)
+
+parser.add_argument(
+    "--url",
+    dest="url",
+    default="redis://localhost:6379",
+    help="The url of the remote data structure server",
+)
+parser.add_argument(
+    "--jobs",
+    dest="numJobs",
+    default=10000,
+    type=int,
+    help="How many jobs to fetch",
+)
+parser.add_argument(
+    "--no-flush",
+    dest="flush",
+    default=True,
+    action="store_false",
+    help="Don't flush the remote data structure server after running",
+)
+
+args = parser.parse_args()
+
+# Our reqless client
+client = reqless.Client(args.url)
+
+# Make sure that the data structure server instance is empty first
+if len(client.database.keys("*")):
+    print("Must begin with empty data structure server")
+    exit(1)
+
+# Put the jobs, and pop them so they have a worker and some history
+queue = client.queues["testing"]
+jids = queue.put_many(
+    {"klass": "reqless.Job", "data": '{"test": "benchmark"}', "tags": ["bench"]}
+    for _ in range(args.numJobs)
+)
+client.pop_from(["testing"], args.numJobs)
+
+
+def measure(fetch):
+    """Return the bytes retained per job by the result of fetch, and the time
+    it took"""
+    gc.collect()
+    tracemalloc.start()
+    elapsed = -time.time()
+    result = fetch()
+    elapsed += time.time()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return retained / args.numJobs, elapsed
+
+
+# The decoded mappings alone, as a baseline for the jobs built from them
+decoded = measure(lambda: client.serializer.loads(client("multiget", *jids)))
+jobs = measure(lambda: client.jobs.get(*jids))
+
+print("Fetched %i jobs" % args.numJobs)
+print("Decoded mappings: %8.1f bytes/job, %fs" % decoded)
+print("Job objects     : %8.1f bytes/job, %fs" % jobs)
+
+# Flush the database when we're done
+if args.flush:
+    print("Flushing")
+    client.database.flushdb()
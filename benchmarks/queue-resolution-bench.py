@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+
+import argparse
+import random
+import time
+
+from reqless.qmore.client import QueuePriorityPattern
+from reqless.queue_resolvers import (
+    QmoreDynamicMappingQueueIdentifiersTransformer,
+    QmoreDynamicPriorityQueueIdentifiersTransformer,
+)
+from reqless.queue_resolvers.queue_name_matcher import QueueNameMatcher
+
+
+# First off, read the arguments
+parser = argparse.ArgumentParser(
+    description="Measure the time taken to resolve queue patterns to queues."
+)
+
+parser.add_argument(
+    "--queues",
+    dest="numQueues",
+    default=10000,
+    type=int,
+    help="How many queues there are",
+)
+parser.add_argument(
+    "--patterns",
+    dest="numPatterns",
+    default=100,
+    type=int,
+    help="How many patterns to resolve",
+)
+parser.add_argument(
+    "--rounds",
+    dest="rounds",
+    default=10,
+    type=int,
+    help="How many times to resolve the patterns",
+)
+
+args = parser.parse_args()
+
+# Queues named like `team-3-queue-1234`, and patterns that are mostly prefixes,
+# with some suffixes, some exact names and some negations mixed in
+random.seed(0)
+teams = max(1, args.numQueues // 100)
+queue_names = [
+    "team-%i-queue-%i" % (random.randrange(teams), index)
+    for index in range(args.numQueues)
+]
+patterns = []
+for index in range(args.numPatterns):
+    kind = index % 10
+    if kind == 0:
+        patterns.append("*queue-%i" % random.randrange(args.numQueues))
+    elif kind == 1:
+        patterns.append(random.choice(queue_names))
+    elif kind == 2:
+        patterns.append("!team-%i-*" % random.randrange(teams))
+    else:
+        patterns.append("team-%i-*" % random.randrange(teams))
+priority_patterns = [
+    QueuePriorityPattern(patterns=[pattern], should_distribute_fairly=False)
+    for pattern in patterns
+    if not pattern.startswith("!")
+]
+
+
+def measure(resolve):
+    """Return the average time taken by resolve"""
+    elapsed = -time.time()
+    for _ in range(args.rounds):
+        resolve()
+    elapsed += time.time()
+    return elapsed / args.rounds
+
+
+matcher = QueueNameMatcher(queue_names)
+resolved = QmoreDynamicMappingQueueIdentifiersTransformer.resolve_queue_names(
+    {}, queue_names, patterns, matcher
+)
+timings = [
+    (
+        "Resolve, new matcher",
+        measure(
+            lambda: QmoreDynamicMappingQueueIdentifiersTransformer.resolve_queue_names(
+                {}, queue_names, patterns
+            )
+        ),
+    ),
+    (
+        "Resolve, kept matcher",
+        measure(
+            lambda: QmoreDynamicMappingQueueIdentifiersTransformer.resolve_queue_names(
+                {}, queue_names, patterns, matcher
+            )
+        ),
+    ),
+    (
+        "Prioritize",
+        measure(
+            lambda: QmoreDynamicPriorityQueueIdentifiersTransformer.prioritize_queues(
+                resolved, priority_patterns
+            )
+        ),
+    ),
+]
+
+print(
+    "Resolved %i patterns against %i queues to %i queues"
+    % (len(patterns), len(queue_names), len(resolved))
+)
+for name, elapsed in timings:
+    print("%-22s: %fs" % (name, elapsed))
@@ -1,10 +1,20 @@
 """Main reqless business"""
 
-import json
 import pkgutil
 import socket
 import time
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
 
 import decorator
 from redis import Redis, ResponseError
@@ -12,21 +22,26 @@ from redis.commands.core import Script
 
 from reqless.abstract import (
     AbstractClient,
+    AbstractCompressor,
     AbstractConfig,
     AbstractJob,
     AbstractJobs,
     AbstractQueue,
     AbstractQueues,
+    AbstractSerializer,
     AbstractThrottles,
     AbstractWorkers,
 )
-from reqless.config import Config
+from reqless.config import CachedConfig, Config
 from reqless.exceptions import ReqlessError
 from reqless.job import Job, RecurringJob
 from reqless.listener import Events
 from reqless.logger import logger
-from reqless.queue import Queue
+from reqless.pagination import JidsOf, iter_listing, multiget_hydration, page_jids
+from reqless.queue import DEFAULT_CHUNK_SIZE, Queue
+from reqless.serializer import default_serializer
 from reqless.throttle import Throttle
+from reqless.util import chunks
 
 
 def retry(*excepts: Type[Exception]) -> Callable:
@@ -57,13 +72,13 @@ class Jobs(AbstractJobs):
 
     def tracked(self) -> Dict[str, List[Any]]:
         """Return an array of job objects that are being tracked"""
-        results: Dict[str, Any] = json.loads(self.client("track"))
+        results: Dict[str, Any] = self.client.serializer.loads(self.client("track"))
         results["jobs"] = [Job(self.client, **job) for job in results["jobs"]]
         return results
 
     def tagged(self, tag: str, offset: int = 0, count: int = 25) -> Dict[str, Any]:
         """Return the paginated jids of jobs tagged with a tag"""
-        response: Dict[str, Any] = json.loads(
+        response: Dict[str, Any] = self.client.serializer.loads(
             self.client("tag", "get", tag, offset, count)
         )
         return response
@@ -79,20 +94,80 @@ class Jobs(AbstractJobs):
         paginated job objects affected by that kind of failure."""
         results: Dict[str, Any]
         if not group:
-            results = json.loads(self.client("failed"))
+            results = self.client.serializer.loads(self.client("failed"))
         else:
-            results = json.loads(self.client("failed", group, start, limit))
+            results = self.client.serializer.loads(
+                self.client("failed", group, start, limit)
+            )
             results["jobs"] = self.get(*results["jobs"])
         return results
 
-    def get(self, *jids: str) -> List[AbstractJob]:
-        """Return jobs objects for all the jids"""
-        if jids:
-            return [
-                Job(self.client, **j)
-                for j in json.loads(self.client("multiget", *jids))
-            ]
-        return []
+    def get(self, *jids: str, light: bool = False) -> List[AbstractJob]:
+        """Return jobs objects for all the jids, fetched in chunks. Light jobs
+        are fetched without their history, dependents and dependencies, which
+        then appear empty."""
+        return list(self.iter_get(jids, light=light))
+
+    def iter_get(
+        self,
+        jids: Iterable[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> Iterator[AbstractJob]:
+        """Lazily yield job objects for all the jids, fetching at most
+        chunk_size of them per call so that no one call blocks the server for
+        long, or has a huge response to decode"""
+        command = "multiget.light" if light else "multiget"
+        for chunk in chunks(jids, chunk_size):
+            for job in self.client.serializer.loads(self.client(command, *chunk)):
+                yield Job(self.client, **job)
+
+    def iter_complete(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:
+        """Stream through the jids of all the complete jobs, fetching page_size
+        at a time so as to use constant memory. With hydrate, the jobs are
+        yielded instead, each page of them fetched in the same round trip as
+        the next page of jids, and light as in `get`."""
+        return self._iter(("jobs", "complete"), hydrate, page_size, light)
+
+    def iter_failed(
+        self,
+        group: str,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:
+        """Stream through all the jobs that failed with a group of failure.
+        See `iter_complete`."""
+        return self._iter(("failed", group), hydrate, page_size, light, self._jobs_of)
+
+    def iter_tagged(
+        self,
+        tag: str,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:
+        """Stream through all the jobs tagged with a tag. See `iter_complete`."""
+        return self._iter(("tag", "get", tag), hydrate, page_size, light, self._jobs_of)
+
+    def _iter(
+        self,
+        command: Sequence[Any],
+        hydrate: bool,
+        page_size: int,
+        light: bool,
+        jids_of: JidsOf = page_jids,
+    ) -> Iterator[Union[str, AbstractJob]]:
+        hydration = multiget_hydration(self.client, Job, light) if hydrate else None
+        return iter_listing(self.client, command, page_size, jids_of, hydration)
+
+    def _jobs_of(self, response: str) -> List[str]:
+        return page_jids(self.client.serializer.loads(response)["jobs"])
 
     def __getitem__(self, jid: str) -> Optional[Union[Job, RecurringJob]]:
         """Get a job object corresponding to that jid, or ``None`` if it
@@ -102,8 +177,8 @@ class Jobs(AbstractJobs):
             results = self.client("recur.get", jid)
             if not results:
                 return None
-            return RecurringJob(self.client, **json.loads(results))
-        return Job(self.client, **json.loads(results))
+            return RecurringJob(self.client, **self.client.serializer.loads(results))
+        return Job(self.client, **self.client.serializer.loads(results))
 
 
 class Workers(AbstractWorkers):
@@ -114,12 +189,14 @@ class Workers(AbstractWorkers):
 
     @property
     def counts(self) -> Dict[str, Any]:
-        counts: Dict[str, Any] = json.loads(self.client("workers"))
+        counts: Dict[str, Any] = self.client.serializer.loads(self.client("workers"))
         return counts
 
     def __getitem__(self, worker_name: str) -> Dict[str, Any]:
         """Which jobs does a particular worker have running"""
-        result: Dict[str, Any] = json.loads(self.client("workers", worker_name))
+        result: Dict[str, Any] = self.client.serializer.loads(
+            self.client("workers", worker_name)
+        )
         result["jobs"] = result["jobs"] or []
         result["stalled"] = result["stalled"] or []
         return result
@@ -133,7 +210,7 @@ class Queues(AbstractQueues):
 
     @property
     def counts(self) -> Dict:
-        counts: Dict = json.loads(self.client("queues"))
+        counts: Dict = self.client.serializer.loads(self.client("queues"))
         return counts
 
     def __getitem__(self, queue_name: str) -> AbstractQueue:
@@ -159,10 +236,17 @@ class Client(AbstractClient):
         self,
         url: str = "redis://localhost:6379",
         hostname: Optional[str] = None,
+        serializer: Optional[AbstractSerializer] = None,
+        compressor: Optional[AbstractCompressor] = None,
+        config_ttl: Optional[float] = None,
         **kwargs: Any,
     ):
         # This is our unique identifier as a worker
         self._worker_name: str = hostname or socket.gethostname()
+        # How we encode and decode everything exchanged with the server
+        self._serializer: AbstractSerializer = serializer or default_serializer()
+        # How job data is compressed, if at all
+        self._compressor: Optional[AbstractCompressor] = compressor
         kwargs["decode_responses"] = True
         # This is just the data structure server instance we're connected to
         # conceivably someone might want to work with multiple instances
@@ -171,7 +255,10 @@ class Client(AbstractClient):
         self._jobs: AbstractJobs = Jobs(self)
         self._queues: AbstractQueues = Queues(self)
         self._throttles: AbstractThrottles = Throttles(self)
-        self._config: AbstractConfig = Config(self)
+        # With a ttl, the config is cached rather than fetched on every read
+        self._config: AbstractConfig = (
+            Config(self) if config_ttl is None else CachedConfig(self, config_ttl)
+        )
         self._workers: AbstractWorkers = Workers(self)
         self._events: Optional[Events] = None
 
@@ -181,10 +268,18 @@ class Client(AbstractClient):
             raise RuntimeError("Failed to load reqless lua!")
         self._lua: Script = self.database.register_script(data)
 
+    @property
+    def compressor(self) -> Optional[AbstractCompressor]:
+        return self._compressor
+
     @property
     def config(self) -> AbstractConfig:
         return self._config
 
+    @property
+    def serializer(self) -> AbstractSerializer:
+        return self._serializer
+
     @property
     def jobs(self) -> AbstractJobs:
         return self._jobs
@@ -219,6 +314,16 @@ class Client(AbstractClient):
             self._events = Events(self.database)
         return self._events
 
+    def reconnect(self) -> None:
+        """Forget the connections in our pool, without closing them, so that
+        new ones are made as they're needed. Forked children should do this,
+        so that they never share sockets with their parent. redis-py resets
+        a pool it finds used from another process anyway; this is a safety net
+        that makes sure it's done before the child's first command."""
+        self._database.connection_pool.reset()
+        # Events listen on a connection of their own, which was the parent's
+        self._events = None
+
     def __call__(self, command: str, *args: Any) -> Any:
         lua_args = [command, repr(time.time())]
         lua_args.extend(args)
@@ -227,6 +332,62 @@ class Client(AbstractClient):
         except ResponseError as exc:
             raise ReqlessError(str(exc))
 
+    def call_many(
+        self,
+        commands: Iterable[Sequence[Any]],
+        transaction: bool = False,
+    ) -> List[Any]:
+        """Invoke several commands in a single round trip. Each command is a
+        sequence of the arguments that would be given to ``__call__``. Results
+        are returned in order, with a ``ReqlessError`` in place of the result
+        of any command that failed. With ``transaction``, the commands are
+        wrapped in MULTI/EXEC and so are applied atomically."""
+        now = repr(time.time())
+        pipeline = self.database.pipeline(transaction=transaction)
+        for command, *args in commands:
+            self._lua(keys=[], args=[command, now, *args], client=pipeline)
+        return [
+            ReqlessError(str(result)) if isinstance(result, ResponseError) else result
+            for result in pipeline.execute(raise_on_error=False)
+        ]
+
+    def pop_from(
+        self, queue_names: Iterable[str], count: int = 1, light: bool = False
+    ) -> List[AbstractJob]:
+        """Pop up to count jobs for this worker from the provided queues in a
+        single round trip. Queues are visited in the order given, and each is
+        drained as far as it can be before moving on to the next. Light jobs
+        are fetched without their history, dependents and dependencies."""
+        _queue_names = list(queue_names)
+        if not _queue_names:
+            return []
+        command = "multipop.light" if light else "multipop"
+        return [
+            Job(self, **job)
+            for job in self.serializer.loads(
+                self(command, self.worker_name, count, *_queue_names)
+            )
+        ]
+
+    def heartbeat_many(self, jobs: Iterable[AbstractJob]) -> Dict[str, Optional[float]]:
+        """Renew the locks this worker holds on the provided jobs in a single
+        round trip, without re-sending their data. Returns the new expiry of
+        each jid, or None for the jobs whose locks have been lost. The jobs'
+        expiries are updated to match."""
+        _jobs = {job.jid: job for job in jobs}
+        if not _jobs:
+            return {}
+        expiries: Dict[str, Union[float, bool]] = self.serializer.loads(
+            self("heartbeat.many", self.worker_name, *_jobs)
+        )
+        response: Dict[str, Optional[float]] = {}
+        for jid, job in _jobs.items():
+            expires = expiries.get(jid)
+            if expires:
+                job.expires_at = float(expires)
+            response[jid] = float(expires) if expires else None
+        return response
+
     def track(self, jid: str) -> bool:
         """Begin tracking this job"""
         response: str = self("track", "track", jid)
@@ -239,7 +400,7 @@ class Client(AbstractClient):
 
     def tags(self, offset: int = 0, count: int = 100) -> List[str]:
         """The most common tags among jobs"""
-        tags: List[str] = json.loads(self("tag", "top", offset, count))
+        tags: List[str] = self.serializer.loads(self("tag", "top", offset, count))
         return tags
 
     def unfail(self, group: str, queue: str, count: int = 500) -> int:
@@ -249,6 +410,7 @@ class Client(AbstractClient):
 
 
 __all__ = [
+    "CachedConfig",
     "Client",
     "Config",
     "Events",
@@ -1,4 +1,5 @@
 from reqless.abstract.abstract_client import AbstractClient
+from reqless.abstract.abstract_compressor import AbstractCompressor
 from reqless.abstract.abstract_config import AbstractConfig
 from reqless.abstract.abstract_job import (
     AbstractBaseJob,
@@ -15,6 +16,7 @@ from reqless.abstract.abstract_queue_identifiers_transformer import (
 from reqless.abstract.abstract_queue_jobs import AbstractQueueJobs
 from reqless.abstract.abstract_queue_resolver import AbstractQueueResolver
 from reqless.abstract.abstract_queues import AbstractQueues
+from reqless.abstract.abstract_serializer import AbstractSerializer
 from reqless.abstract.abstract_throttle import AbstractThrottle
 from reqless.abstract.abstract_throttles import AbstractThrottles
 from reqless.abstract.abstract_workers import AbstractWorkers
@@ -23,6 +25,7 @@ from reqless.abstract.abstract_workers import AbstractWorkers
 __all__ = [
     "AbstractBaseJob",
     "AbstractClient",
+    "AbstractCompressor",
     "AbstractConfig",
     "AbstractJob",
     "AbstractJobData",
@@ -34,6 +37,7 @@ __all__ = [
     "AbstractQueueResolver",
     "AbstractQueues",
     "AbstractRecurringJob",
+    "AbstractSerializer",
     "AbstractThrottle",
     "AbstractThrottles",
     "AbstractWorkers",
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 from redis import Redis
 
+from reqless.abstract.abstract_compressor import AbstractCompressor
 from reqless.abstract.abstract_config import AbstractConfig
+from reqless.abstract.abstract_job import AbstractJob
 from reqless.abstract.abstract_jobs import AbstractJobs
 from reqless.abstract.abstract_queues import AbstractQueues
+from reqless.abstract.abstract_serializer import AbstractSerializer
 from reqless.abstract.abstract_throttles import AbstractThrottles
 from reqless.abstract.abstract_workers import AbstractWorkers
 
@@ -15,6 +18,19 @@ class AbstractClient(ABC):
     def __call__(self, command: str, *args: Any) -> Any:  # pragma: no cover
         pass
 
+    @abstractmethod
+    def call_many(
+        self,
+        commands: Iterable[Sequence[Any]],
+        transaction: bool = False,
+    ) -> List[Any]:  # pragma: no cover
+        pass
+
+    @property
+    @abstractmethod
+    def compressor(self) -> Optional[AbstractCompressor]:  # pragma: no cover
+        pass
+
     @property
     @abstractmethod
     def config(self) -> AbstractConfig:  # pragma: no cover
@@ -25,16 +41,38 @@ class AbstractClient(ABC):
     def jobs(self) -> AbstractJobs:  # pragma: no cover
         pass
 
+    @abstractmethod
+    def pop_from(
+        self, queue_names: Iterable[str], count: int = 1, light: bool = False
+    ) -> List[AbstractJob]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def heartbeat_many(
+        self, jobs: Iterable[AbstractJob]
+    ) -> Dict[str, Optional[float]]:  # pragma: no cover
+        pass
+
     @property
     @abstractmethod
     def queues(self) -> AbstractQueues:  # pragma: no cover
         pass
 
+    @abstractmethod
+    def reconnect(self) -> None:  # pragma: no cover
+        """Forget any pooled connections, so that new ones are made"""
+        pass
+
     @property
     @abstractmethod
     def database(self) -> Redis:  # pragma: no cover
         pass
 
+    @property
+    @abstractmethod
+    def serializer(self) -> AbstractSerializer:  # pragma: no cover
+        pass
+
     @property
     @abstractmethod
     def throttles(self) -> AbstractThrottles:  # pragma: no cover
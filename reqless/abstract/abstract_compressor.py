@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractCompressor(ABC):
+    @property
+    @abstractmethod
+    def name(self) -> str:  # pragma: no cover
+        pass
+
+    @property
+    @abstractmethod
+    def threshold(self) -> int:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:  # pragma: no cover
+        pass
@@ -69,3 +69,8 @@ class AbstractConfig(ABC):
     def values(self) -> ValuesView:  # pragma: no cover
         """Just like `dict.values`"""
         pass
+
+    @abstractmethod
+    def invalidate(self) -> None:  # pragma: no cover
+        """Forget any cached options, so that the next read fetches them"""
+        pass
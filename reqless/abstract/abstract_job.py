@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Type, Union
+from typing import Dict, List, Optional, Type, Union
 
 
 class AbstractBaseJob(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def cancel(self) -> List[str]:  # pragma: no cover
         pass
@@ -17,6 +19,11 @@ class AbstractBaseJob(ABC):
     def data(self, value: str) -> None:  # pragma: no cover
         pass
 
+    @property
+    @abstractmethod
+    def data_modified(self) -> bool:  # pragma: no cover
+        pass
+
     @property
     @abstractmethod
     def jid(self) -> str:  # pragma: no cover
@@ -62,12 +69,20 @@ class AbstractBaseJob(ABC):
 
 
 class AbstractJob(AbstractBaseJob):
+    __slots__ = ()
+
+    @abstractmethod
+    def check(self) -> None:  # pragma: no cover
+        """Raise LostLockError if the lock on this job has been lost"""
+        pass
+
     @abstractmethod
     def complete(
         self,
         next_queue: Optional[str] = None,
         delay: Optional[int] = None,
         depends: Optional[List[str]] = None,
+        pop_next: Optional[int] = None,
     ) -> bool:  # pragma: no cover
         pass
 
@@ -81,6 +96,21 @@ class AbstractJob(AbstractBaseJob):
     def dependencies(self, value: List[str]) -> None:  # pragma: no cover
         pass
 
+    @property
+    @abstractmethod
+    def dependents(self) -> List[str]:  # pragma: no cover
+        pass
+
+    @property
+    @abstractmethod
+    def expires_at(self) -> float:  # pragma: no cover
+        pass
+
+    @expires_at.setter
+    @abstractmethod
+    def expires_at(self, value: float) -> None:  # pragma: no cover
+        pass
+
     @abstractmethod
     def fail(self, group: str, message: str) -> Union[bool, str]:  # pragma: no cover
         pass
@@ -89,6 +119,11 @@ class AbstractJob(AbstractBaseJob):
     def heartbeat(self) -> float:  # pragma: no cover
         pass
 
+    @property
+    @abstractmethod
+    def history(self) -> List[Dict]:  # pragma: no cover
+        pass
+
     @property
     @abstractmethod
     def klass(self) -> Type:  # pragma: no cover
@@ -99,6 +134,37 @@ class AbstractJob(AbstractBaseJob):
     def klass(self, value: Type) -> None:  # pragma: no cover
         pass
 
+    @property
+    @abstractmethod
+    def lost(self) -> bool:  # pragma: no cover
+        """Whether the worker processing this job has lost its lock on it"""
+        pass
+
+    @lost.setter
+    @abstractmethod
+    def lost(self, value: bool) -> None:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def move(
+        self,
+        queue: str,
+        delay: Optional[int] = 0,
+        depends: Optional[List[str]] = None,
+    ) -> str:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def pop_on_complete(
+        self, count: int, queue_names: Optional[List[str]] = None
+    ) -> None:  # pragma: no cover
+        pass
+
+    @property
+    @abstractmethod
+    def popped(self) -> List["AbstractJob"]:  # pragma: no cover
+        pass
+
     @abstractmethod
     def process(self) -> None:  # pragma: no cover
         pass
@@ -158,6 +224,8 @@ class AbstractJob(AbstractBaseJob):
 
 
 class AbstractRecurringJob(AbstractBaseJob):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def next(self) -> Optional[float]:  # pragma: no cover
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
 from reqless.abstract.abstract_job import AbstractJob, AbstractRecurringJob
 
@@ -23,7 +23,41 @@ class AbstractJobs(ABC):
         pass
 
     @abstractmethod
-    def get(self, *jids: str) -> List[AbstractJob]:  # pragma: no cover
+    def get(
+        self, *jids: str, light: bool = False
+    ) -> List[AbstractJob]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def iter_complete(
+        self, hydrate: bool = False, page_size: int = 500, light: bool = False
+    ) -> Iterator[Union[str, AbstractJob]]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def iter_failed(
+        self,
+        group: str,
+        hydrate: bool = False,
+        page_size: int = 500,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def iter_get(
+        self, jids: Iterable[str], chunk_size: int = 500, light: bool = False
+    ) -> Iterator[AbstractJob]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def iter_tagged(
+        self,
+        tag: str,
+        hydrate: bool = False,
+        page_size: int = 500,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:  # pragma: no cover
         pass
 
     @abstractmethod
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Type, Union
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
 
 from reqless.abstract.abstract_job import AbstractJob
 from reqless.abstract.abstract_queue_jobs import AbstractQueueJobs
 from reqless.abstract.abstract_throttle import AbstractThrottle
+from reqless.exceptions import ReqlessError
 
 
 class AbstractQueue(ABC):
@@ -38,13 +39,16 @@ class AbstractQueue(ABC):
 
     @abstractmethod
     def peek(
-        self, offset: Optional[int] = None, count: Optional[int] = None
+        self,
+        offset: Optional[int] = None,
+        count: Optional[int] = None,
+        light: bool = False,
     ) -> Union[AbstractJob, List[AbstractJob], None]:  # pragma: no cover
         pass
 
     @abstractmethod
     def pop(
-        self, count: Optional[int] = None
+        self, count: Optional[int] = None, light: bool = False
     ) -> Union[AbstractJob, List[AbstractJob], None]:  # pragma: no cover
         pass
 
@@ -63,6 +67,14 @@ class AbstractQueue(ABC):
     ) -> str:  # pragma: no cover
         pass
 
+    @abstractmethod
+    def put_many(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        chunk_size: int = 500,
+    ) -> List[Union[str, ReqlessError]]:  # pragma: no cover
+        pass
+
     @abstractmethod
     def requeue(
         self,
@@ -93,6 +105,14 @@ class AbstractQueue(ABC):
     ) -> str:  # pragma: no cover
         pass
 
+    @abstractmethod
+    def recur_many(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        chunk_size: int = 500,
+    ) -> List[Union[str, ReqlessError]]:  # pragma: no cover
+        pass
+
     @abstractmethod
     def stats(self, date: Optional[str] = None) -> Dict:  # pragma: no cover
         pass
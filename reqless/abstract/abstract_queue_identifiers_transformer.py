@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Hashable, List, Optional
 
 
 class AbstractQueueIdentifiersTransformer(ABC):
     @abstractmethod
     def transform(self, queue_identifiers: List[str]) -> List[str]:  # pragma: no cover
         pass
+
+    def generation(self) -> Optional[Hashable]:
+        """A value that changes whenever the same queue identifiers might be
+        transformed differently. None, the default, means that can't be told,
+        and so the result of a transformation is never reused."""
+        return None
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Union
+
+from reqless.abstract.abstract_job import AbstractJob, AbstractRecurringJob
 
 
 class AbstractQueueJobs(ABC):
@@ -9,6 +11,36 @@ class AbstractQueueJobs(ABC):
     ) -> List[str]:  # pragma: no cover
         pass
 
+    @abstractmethod
+    def iter_depends(
+        self, hydrate: bool = False, page_size: int = 500, light: bool = False
+    ) -> Iterator[Union[str, AbstractJob]]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def iter_recurring(
+        self, hydrate: bool = False, page_size: int = 500
+    ) -> Iterator[Union[str, AbstractRecurringJob]]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def iter_running(
+        self, hydrate: bool = False, page_size: int = 500, light: bool = False
+    ) -> Iterator[Union[str, AbstractJob]]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def iter_scheduled(
+        self, hydrate: bool = False, page_size: int = 500, light: bool = False
+    ) -> Iterator[Union[str, AbstractJob]]:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def iter_stalled(
+        self, hydrate: bool = False, page_size: int = 500, light: bool = False
+    ) -> Iterator[Union[str, AbstractJob]]:  # pragma: no cover
+        pass
+
     @abstractmethod
     def recurring(
         self,
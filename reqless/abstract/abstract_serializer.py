@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+
+class AbstractSerializer(ABC):
+    @abstractmethod
+    def dumps(self, value: Any) -> str:  # pragma: no cover
+        pass
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:  # pragma: no cover
+        pass
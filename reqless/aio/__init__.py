@@ -0,0 +1,375 @@
+"""An asyncio reqless client, built on redis.asyncio and the same Lua core as
+the synchronous client"""
+
+import pkgutil
+import socket
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Union
+
+from redis import ResponseError
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from reqless.abstract import AbstractCompressor, AbstractSerializer
+from reqless.aio.config import CachedConfig, Config
+from reqless.aio.job import Job, RecurringJob
+from reqless.aio.listener import Events
+from reqless.aio.pagination import iter_listing
+from reqless.aio.queue import Queue
+from reqless.aio.throttle import Throttle
+from reqless.exceptions import ReqlessError
+from reqless.pagination import JidsOf, multiget_hydration, page_jids
+from reqless.queue import DEFAULT_CHUNK_SIZE
+from reqless.serializer import default_serializer
+from reqless.util import chunks
+
+
+class Jobs:
+    """Class for accessing jobs and job information lazily"""
+
+    def __init__(self, client: "Client"):
+        self.client: "Client" = client
+
+    async def complete(self, offset: int = 0, count: int = 25) -> List[str]:
+        """Return the paginated jids of complete jobs"""
+        response: List[str] = await self.client("jobs", "complete", offset, count)
+        return response
+
+    async def tracked(self) -> Dict[str, List[Any]]:
+        """Return an array of job objects that are being tracked"""
+        results: Dict[str, Any] = self.client.serializer.loads(
+            await self.client("track")
+        )
+        results["jobs"] = [Job(self.client, **job) for job in results["jobs"]]
+        return results
+
+    async def tagged(
+        self, tag: str, offset: int = 0, count: int = 25
+    ) -> Dict[str, Any]:
+        """Return the paginated jids of jobs tagged with a tag"""
+        response: Dict[str, Any] = self.client.serializer.loads(
+            await self.client("tag", "get", tag, offset, count)
+        )
+        return response
+
+    async def failed(
+        self,
+        group: Optional[str] = None,
+        start: int = 0,
+        limit: int = 25,
+    ) -> Dict[str, Any]:
+        """If no group is provided, this returns a JSON blob of the counts of
+        the various types of failures known. If a type is provided, returns
+        paginated job objects affected by that kind of failure."""
+        results: Dict[str, Any]
+        if not group:
+            results = self.client.serializer.loads(await self.client("failed"))
+        else:
+            results = self.client.serializer.loads(
+                await self.client("failed", group, start, limit)
+            )
+            results["jobs"] = await self.get(*results["jobs"])
+        return results
+
+    async def get(self, *jids: str, light: bool = False) -> List[Job]:
+        """Return jobs objects for all the jids. See `reqless.Jobs.get`."""
+        return [job async for job in self.iter_get(jids, light=light)]
+
+    async def iter_get(
+        self,
+        jids: Iterable[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> AsyncIterator[Job]:
+        """Lazily yield job objects for all the jids, fetching at most
+        chunk_size of them per call. See `reqless.Jobs.iter_get`."""
+        command = "multiget.light" if light else "multiget"
+        for chunk in chunks(jids, chunk_size):
+            response = await self.client(command, *chunk)
+            for job in self.client.serializer.loads(response):
+                yield Job(self.client, **job)
+
+    def iter_complete(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> AsyncIterator[Union[str, Job]]:
+        """Stream through all the complete jobs. See
+        `reqless.Jobs.iter_complete`."""
+        return self._iter(("jobs", "complete"), hydrate, page_size, light)
+
+    def iter_failed(
+        self,
+        group: str,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> AsyncIterator[Union[str, Job]]:
+        """Stream through all the jobs that failed with a group of failure.
+        See `reqless.Jobs.iter_complete`."""
+        return self._iter(("failed", group), hydrate, page_size, light, self._jobs_of)
+
+    def iter_tagged(
+        self,
+        tag: str,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> AsyncIterator[Union[str, Job]]:
+        """Stream through all the jobs tagged with a tag. See
+        `reqless.Jobs.iter_complete`."""
+        return self._iter(("tag", "get", tag), hydrate, page_size, light, self._jobs_of)
+
+    def _iter(
+        self,
+        command: Sequence[Any],
+        hydrate: bool,
+        page_size: int,
+        light: bool,
+        jids_of: JidsOf = page_jids,
+    ) -> AsyncIterator[Union[str, Job]]:
+        hydration = multiget_hydration(self.client, Job, light) if hydrate else None
+        return iter_listing(self.client, command, page_size, jids_of, hydration)
+
+    def _jobs_of(self, response: str) -> List[str]:
+        return page_jids(self.client.serializer.loads(response)["jobs"])
+
+    async def __getitem__(self, jid: str) -> Optional[Union[Job, RecurringJob]]:
+        """Get a job object corresponding to that jid, or ``None`` if it
+        doesn't exist. Use as ``await client.jobs[jid]``"""
+        results = await self.client("get", jid)
+        if not results:
+            results = await self.client("recur.get", jid)
+            if not results:
+                return None
+            return RecurringJob(self.client, **self.client.serializer.loads(results))
+        return Job(self.client, **self.client.serializer.loads(results))
+
+
+class Workers:
+    """Class for accessing worker information lazily"""
+
+    def __init__(self, client: "Client"):
+        self.client: "Client" = client
+
+    async def counts(self) -> Dict[str, Any]:
+        counts: Dict[str, Any] = self.client.serializer.loads(
+            await self.client("workers")
+        )
+        return counts
+
+    async def __getitem__(self, worker_name: str) -> Dict[str, Any]:
+        """Which jobs does a particular worker have running"""
+        result: Dict[str, Any] = self.client.serializer.loads(
+            await self.client("workers", worker_name)
+        )
+        result["jobs"] = result["jobs"] or []
+        result["stalled"] = result["stalled"] or []
+        return result
+
+
+class Queues:
+    """Class for accessing queues lazily"""
+
+    def __init__(self, client: "Client"):
+        self.client: "Client" = client
+
+    async def counts(self) -> Dict:
+        counts: Dict = self.client.serializer.loads(await self.client("queues"))
+        return counts
+
+    def __getitem__(self, queue_name: str) -> Queue:
+        """Get a queue object associated with the provided queue name"""
+        return Queue(queue_name, self.client, self.client.worker_name)
+
+
+class Throttles:
+    def __init__(self, client: "Client"):
+        self.client: "Client" = client
+
+    def __getitem__(self, throttle_name: str) -> Throttle:
+        return Throttle(client=self.client, name=throttle_name)
+
+
+class Client:
+    """Asynchronous counterpart of `reqless.Client`. Every method that talks
+    to the server is a coroutine, so many commands may be in flight at once
+    on a single event loop."""
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379",
+        hostname: Optional[str] = None,
+        serializer: Optional[AbstractSerializer] = None,
+        compressor: Optional[AbstractCompressor] = None,
+        config_ttl: Optional[float] = None,
+        **kwargs: Any,
+    ):
+        # This is our unique identifier as a worker
+        self._worker_name: str = hostname or socket.gethostname()
+        # How we encode and decode everything exchanged with the server
+        self._serializer: AbstractSerializer = serializer or default_serializer()
+        # How job data is compressed, if at all
+        self._compressor: Optional[AbstractCompressor] = compressor
+        kwargs["decode_responses"] = True
+        self._database: Redis = Redis.from_url(url, **kwargs)
+        self._jobs: Jobs = Jobs(self)
+        self._queues: Queues = Queues(self)
+        self._throttles: Throttles = Throttles(self)
+        # With a ttl, the config is cached rather than fetched on every read
+        self._config: Config = (
+            Config(self) if config_ttl is None else CachedConfig(self, config_ttl)
+        )
+        self._workers: Workers = Workers(self)
+        self._events: Optional[Events] = None
+
+        data = pkgutil.get_data("reqless", "lua/qless.lua")
+        if data is None:
+            raise RuntimeError("Failed to load reqless lua!")
+        self._lua: AsyncScript = self.database.register_script(data)
+
+    @property
+    def compressor(self) -> Optional[AbstractCompressor]:
+        return self._compressor
+
+    @property
+    def config(self) -> Config:
+        return self._config
+
+    @property
+    def serializer(self) -> AbstractSerializer:
+        return self._serializer
+
+    @property
+    def jobs(self) -> Jobs:
+        return self._jobs
+
+    @property
+    def queues(self) -> Queues:
+        return self._queues
+
+    @property
+    def database(self) -> Redis:
+        return self._database
+
+    @property
+    def throttles(self) -> Throttles:
+        return self._throttles
+
+    @property
+    def workers(self) -> Workers:
+        return self._workers
+
+    @property
+    def worker_name(self) -> str:
+        return self._worker_name
+
+    @worker_name.setter
+    def worker_name(self, value: str) -> None:
+        self._worker_name = value
+
+    @property
+    def events(self) -> Events:
+        if self._events is None:
+            self._events = Events(self.database)
+        return self._events
+
+    async def __call__(self, command: str, *args: Any) -> Any:
+        lua_args = [command, repr(time.time())]
+        lua_args.extend(args)
+        try:
+            return await self._lua(keys=[], args=lua_args)
+        except ResponseError as exc:
+            raise ReqlessError(str(exc))
+
+    async def call_many(
+        self,
+        commands: Iterable[Sequence[Any]],
+        transaction: bool = False,
+    ) -> List[Any]:
+        """Invoke several commands in a single round trip. See
+        `reqless.Client.call_many`."""
+        now = repr(time.time())
+        pipeline = self.database.pipeline(transaction=transaction)
+        for command, *args in commands:
+            await self._lua(keys=[], args=[command, now, *args], client=pipeline)
+        return [
+            ReqlessError(str(result)) if isinstance(result, ResponseError) else result
+            for result in await pipeline.execute(raise_on_error=False)
+        ]
+
+    async def close(self) -> None:
+        """Close the connections to the server"""
+        # aclose supersedes the deprecated close as of redis 5.0.1
+        close = getattr(self.database, "aclose", None) or self.database.close
+        await close()
+
+    async def pop_from(
+        self, queue_names: Iterable[str], count: int = 1, light: bool = False
+    ) -> List[Job]:
+        """Pop up to count jobs for this worker from the provided queues in a
+        single round trip. See `reqless.Client.pop_from`."""
+        _queue_names = list(queue_names)
+        if not _queue_names:
+            return []
+        command = "multipop.light" if light else "multipop"
+        return [
+            Job(self, **job)
+            for job in self.serializer.loads(
+                await self(command, self.worker_name, count, *_queue_names)
+            )
+        ]
+
+    async def heartbeat_many(self, jobs: Iterable[Job]) -> Dict[str, Optional[float]]:
+        """Renew the locks this worker holds on the provided jobs in a single
+        round trip. See `reqless.Client.heartbeat_many`."""
+        _jobs = {job.jid: job for job in jobs}
+        if not _jobs:
+            return {}
+        expiries: Dict[str, Union[float, bool]] = self.serializer.loads(
+            await self("heartbeat.many", self.worker_name, *_jobs)
+        )
+        response: Dict[str, Optional[float]] = {}
+        for jid, job in _jobs.items():
+            expires = expiries.get(jid)
+            if expires:
+                job.expires_at = float(expires)
+            response[jid] = float(expires) if expires else None
+        return response
+
+    async def track(self, jid: str) -> bool:
+        """Begin tracking this job"""
+        response: str = await self("track", "track", jid)
+        return response == "1"
+
+    async def untrack(self, jid: str) -> bool:
+        """Stop tracking this job"""
+        response: str = await self("track", "untrack", jid)
+        return response == "1"
+
+    async def tags(self, offset: int = 0, count: int = 100) -> List[str]:
+        """The most common tags among jobs"""
+        tags: List[str] = self.serializer.loads(await self("tag", "top", offset, count))
+        return tags
+
+    async def unfail(self, group: str, queue: str, count: int = 500) -> int:
+        """Move jobs from the failed group to the provided queue"""
+        unfail_count = await self("unfail", queue, group, count)
+        return int(unfail_count)
+
+
+__all__ = [
+    "CachedConfig",
+    "Client",
+    "Config",
+    "Events",
+    "Job",
+    "Jobs",
+    "Queue",
+    "Queues",
+    "RecurringJob",
+    "Throttle",
+    "Throttles",
+    "Workers",
+]
@@ -0,0 +1,155 @@
+"""Asynchronous configuration operations"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, Iterable, Optional
+
+from reqless.aio.listener import Listener
+from reqless.config import CHANGE_CHANNEL
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from reqless.aio import Client
+
+
+class Config:
+    """Asynchronous counterpart of `reqless.config.Config`. Since item
+    assignment cannot be awaited, options are changed with `set` and `unset`
+    rather than with dictionary syntax."""
+
+    def __init__(self, client: "Client"):
+        self._client: "Client" = client
+
+    async def all(self) -> Dict[str, Any]:
+        """All the configuration options and their values"""
+        response: Dict[str, Any] = self._client.serializer.loads(
+            await self._client("config.get")
+        )
+        return response
+
+    async def get(self, option: str, default: Any = None) -> Any:
+        """Get a particular option, or the default if it's missing"""
+        result = self._decode(await self._client("config.get", option))
+        return default if result is None else result
+
+    async def set(self, option: str, value: Any) -> None:
+        """Set a particular option"""
+        await self._client("config.set", option, value)
+
+    async def unset(self, option: str) -> None:
+        """Restore a particular option to its default"""
+        await self._client("config.unset", option)
+
+    async def clear(self) -> None:
+        """Remove all keys, in a single call"""
+        keys = list(await self.all())
+        if keys:
+            await self._client("config.unset.many", *keys)
+
+    async def pop(self, option: str, default: Any = None) -> Any:
+        """Just like `dict.pop`"""
+        val = await self.get(option)
+        await self.unset(option)
+        return (val is None and default) or val
+
+    async def update(self, other: Iterable = (), **kwargs: Any) -> None:
+        """Just like `dict.update`"""
+        _kwargs = dict(kwargs)
+        _kwargs.update(other)
+        # All the options are set in a single call
+        if _kwargs:
+            await self._client("config.set.many", *itertools.chain(*_kwargs.items()))
+
+    def invalidate(self) -> None:
+        """Forget any cached options. Nothing is cached, so this does nothing"""
+
+    def _decode(self, result: Any) -> Any:
+        if not result:
+            return None
+        # Numbers come back from the server as they are, not as JSON
+        if not isinstance(result, str):
+            return result
+        return self._client.serializer.loads(result)
+
+
+class CachedConfig(Config):
+    """Asynchronous counterpart of `reqless.config.CachedConfig`"""
+
+    def __init__(self, client: "Client", ttl: float = 5.0):
+        super().__init__(client)
+        self.ttl: float = ttl
+        self._cache: Optional[Dict[str, Any]] = None
+        self._fetched_at: float = 0.0
+        # Bumped on every invalidation, so that a fetch racing an invalidation
+        # doesn't cache what it fetched
+        self._generation: int = 0
+
+    async def all(self) -> Dict[str, Any]:
+        """All the configuration options and their values"""
+        cache = self._cache
+        if cache is None or time.monotonic() - self._fetched_at >= self.ttl:
+            generation = self._generation
+            fetched_at = time.monotonic()
+            cache = await super().all()
+            if generation == self._generation:
+                self._cache, self._fetched_at = cache, fetched_at
+        return dict(cache)
+
+    async def get(self, option: str, default: Any = None) -> Any:
+        """Get a particular option, or the default if it's missing"""
+        result = self._decode((await self.all()).get(option))
+        return default if result is None else result
+
+    async def set(self, option: str, value: Any) -> None:
+        """Set a particular option"""
+        try:
+            await super().set(option, value)
+        finally:
+            self.invalidate()
+
+    async def unset(self, option: str) -> None:
+        """Restore a particular option to its default"""
+        try:
+            await super().unset(option)
+        finally:
+            self.invalidate()
+
+    async def clear(self) -> None:
+        """Remove all keys, in a single call"""
+        try:
+            await super().clear()
+        finally:
+            self.invalidate()
+
+    async def update(self, other: Iterable = (), **kwargs: Any) -> None:
+        """Just like `dict.update`"""
+        try:
+            await super().update(other, **kwargs)
+        finally:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the cached options, so that the next read fetches them"""
+        self._generation += 1
+        self._cache = None
+
+    @asynccontextmanager
+    async def watching(self) -> AsyncGenerator["CachedConfig", None]:
+        """Invalidate the cache whenever any client changes an option, for the
+        duration of the context. We are subscribed by the time it's entered."""
+        listener = Listener(self._client.database, [CHANGE_CHANNEL])
+        await listener.subscribe()
+        # Anything cached until now may have missed a change
+        self.invalidate()
+        task = asyncio.ensure_future(self._watch(listener))
+        try:
+            yield self
+        finally:
+            await listener.unlisten()
+            await task
+
+    async def _watch(self, listener: Listener) -> None:
+        async for _ in listener.listen():
+            self.invalidate()
@@ -0,0 +1,442 @@
+"""Asynchronous counterparts of the Job and RecurringJob classes"""
+
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, Union
+
+from reqless.compression import compress_payload, decompress_payload
+from reqless.exceptions import LostLockError, ReqlessError
+from reqless.importer import Importer
+from reqless.logger import logger
+from reqless.util import intern_history, intern_strings
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from reqless.aio import Client
+    from reqless.aio.queue import Queue
+
+
+# The attributes that hold the recur.update options whose names differ
+RECUR_UPDATE_ATTRIBUTES = {"klass": "klass_name", "queue": "queue_name"}
+
+
+class BaseJob:
+    # As with `reqless.job.BaseJob`, fields are kept in slots, and strings
+    # repeated across jobs are interned
+    __slots__ = (
+        "__weakref__",
+        "client",
+        "_data",
+        "_data_modified",
+        "_encoded_data",
+        "_jid",
+        "_klass",
+        "_klass_name",
+        "_priority",
+        "_queue_name",
+        "_tags",
+        "_throttles",
+    )
+
+    def __init__(self, client: "Client", **kwargs: Any):
+        self.client: "Client" = client
+        # The data as it's stored on the server, which may be compressed. It's
+        # only decompressed when first accessed.
+        self._encoded_data: str = kwargs["data"]
+        self._data: Optional[str] = None
+        # Whether data has been changed since it was fetched, and so needs to
+        # be sent back to the server
+        self._data_modified: bool = False
+        self._jid: str = kwargs["jid"]
+        self._klass: Optional[Type] = None
+        self._klass_name: str = sys.intern(kwargs["klass"])
+        self._priority: int = kwargs["priority"]
+        self._queue_name: str = sys.intern(kwargs["queue"])
+        # Because of how Lua parses JSON, empty tags comes through as {}
+        self._tags: List[str] = intern_strings(kwargs.get("tags") or [])
+        self._throttles: List[str] = intern_strings(kwargs.get("throttles") or [])
+
+    @property
+    def data(self) -> str:
+        if self._data is None:
+            self._data = decompress_payload(self._encoded_data, self.client.compressor)
+        return self._data
+
+    @data.setter
+    def data(self, value: str) -> None:
+        self._data = value
+        self._encoded_data = compress_payload(value, self.client.compressor)
+        self._data_modified = True
+
+    @property
+    def data_modified(self) -> bool:
+        return self._data_modified
+
+    @property
+    def jid(self) -> str:
+        return self._jid
+
+    @property
+    def klass(self) -> Type:
+        if self._klass is None:
+            self._klass = Importer.import_class(class_name=self.klass_name)
+
+        return self._klass
+
+    @property
+    def klass_name(self) -> str:
+        return self._klass_name
+
+    @property
+    def priority(self) -> int:
+        return self._priority
+
+    @property
+    def queue(self) -> "Queue":
+        return self.client.queues[self.queue_name]
+
+    @property
+    def queue_name(self) -> str:
+        return self._queue_name
+
+    @property
+    def tags(self) -> List[str]:
+        return self._tags
+
+    @property
+    def throttles(self) -> List[str]:
+        return self._throttles
+
+    async def cancel(self) -> List[str]:
+        """Cancel a job. It will be deleted from the system, the thinking
+        being that if you don't want to do any work on it, it shouldn't be in
+        the queuing system."""
+        response: List[str] = await self.client("cancel", self.jid)
+        return response
+
+    async def set_priority(self, value: int) -> None:
+        """Change the priority of this job"""
+        await self.client("priority", self.jid, value)
+        self._priority = value
+
+    async def tag(self, *tags: str) -> List[str]:
+        """Tag a job with additional tags"""
+        response: List[str] = await self.client("tag", "add", self.jid, *tags)
+        return response
+
+    async def untag(self, *tags: str) -> List[str]:
+        """Remove tags from a job"""
+        response: List[str] = await self.client("tag", "remove", self.jid, *tags)
+        return response
+
+
+class Job(BaseJob):
+    """Asynchronous counterpart of `reqless.job.Job`. Jobs are processed by
+    the synchronous workers, so this offers everything but `process`."""
+
+    __slots__ = (
+        "_dependencies",
+        "_dependents",
+        "_expires_at",
+        "_failure",
+        "_history",
+        "_original_retries",
+        "_retries_left",
+        "_state",
+        "_tracked",
+        "_worker_name",
+    )
+
+    def __init__(self, client: "Client", **kwargs: Any):
+        super().__init__(client, **kwargs)
+        self._state: str = sys.intern(kwargs["state"])
+        self._tracked: bool = kwargs["tracked"]
+        self._worker_name: str = sys.intern(kwargs["worker"])
+        self._retries_left: int = kwargs["remaining"]
+        self._expires_at: float = kwargs["expires"]
+        self._original_retries: int = kwargs["retries"]
+        # These are decoded along with the rest of the job, but most of them
+        # are empty. Because of how Lua parses JSON, empty lists come through
+        # as {}, which are dropped right away and only replaced with an empty
+        # list or dict when first accessed. Light jobs are fetched without the
+        # last three. History mostly repeats what happened, where and on which
+        # worker, so its strings are interned.
+        self._failure: Optional[Dict] = kwargs["failure"] or None
+        self._dependents: Optional[List[str]] = kwargs.get("dependents") or None
+        self._dependencies: Optional[List[str]] = kwargs.get("dependencies") or None
+        self._history: Optional[List[Dict]] = (
+            intern_history(kwargs["history"]) if kwargs.get("history") else None
+        )
+
+    @property
+    def dependencies(self) -> List[str]:
+        if self._dependencies is None:
+            self._dependencies = []
+        return self._dependencies
+
+    @property
+    def dependents(self) -> List[str]:
+        if self._dependents is None:
+            self._dependents = []
+        return self._dependents
+
+    @property
+    def expires_at(self) -> float:
+        return self._expires_at
+
+    @expires_at.setter
+    def expires_at(self, value: float) -> None:
+        self._expires_at = value
+
+    @property
+    def failure(self) -> Optional[Dict]:
+        if self._failure is None:
+            self._failure = {}
+        return self._failure
+
+    @property
+    def history(self) -> List[Dict]:
+        if self._history is None:
+            self._history = []
+        return self._history
+
+    @property
+    def original_retries(self) -> int:
+        return self._original_retries
+
+    @property
+    def retries_left(self) -> int:
+        return self._retries_left
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def ttl(self) -> float:
+        return self.expires_at - time.time()
+
+    @property
+    def tracked(self) -> bool:
+        return self._tracked
+
+    @property
+    def worker_name(self) -> str:
+        return self._worker_name
+
+    def __repr__(self) -> str:
+        return "<%s %s>" % (self.klass_name, self.jid)
+
+    async def move(
+        self,
+        queue: str,
+        delay: Optional[int] = 0,
+        depends: Optional[List[str]] = None,
+    ) -> str:
+        """Move this job out of its existing state and into another queue"""
+        logger.info("Moving %s to %s from %s", self.jid, queue, self.queue_name)
+        response: str = await self.client(
+            "put",
+            self.worker_name,
+            queue,
+            self.jid,
+            self.klass_name,
+            self._encoded_data,
+            delay,
+            "depends",
+            self.client.serializer.dumps(depends or []),
+            "throttles",
+            self.client.serializer.dumps(self.throttles or []),
+        )
+        return response
+
+    async def complete(
+        self,
+        next_queue: Optional[str] = None,
+        delay: Optional[int] = None,
+        depends: Optional[List[str]] = None,
+    ) -> bool:
+        """Turn this job in as complete, optionally advancing it to another
+        queue"""
+        args: List[Any] = [
+            "complete",
+            self.jid,
+            self.client.worker_name,
+            self.queue_name,
+            self._completion_data(),
+        ]
+        if next_queue:
+            logger.info(
+                "Advancing %s to %s from %s", self.jid, next_queue, self.queue_name
+            )
+            args.extend(
+                [
+                    "next",
+                    next_queue,
+                    "delay",
+                    delay or 0,
+                    "depends",
+                    self.client.serializer.dumps(depends or []),
+                ]
+            )
+        else:
+            logger.info("Completing %s", self.jid)
+        return await self.client(*args) or False
+
+    async def heartbeat(self) -> float:
+        """Renew the heartbeat, if possible, updating the job's user data if
+        it's been modified."""
+        logger.debug("Heartbeating %s (ttl = %s)", self.jid, self.ttl)
+        try:
+            self._expires_at = float(
+                await self.client(
+                    "heartbeat",
+                    self.jid,
+                    self.client.worker_name,
+                    *self._modified_data(),
+                )
+                or 0
+            )
+        except ReqlessError:
+            raise LostLockError(self.jid)
+        self._data_modified = False
+        logger.debug("Heartbeated %s (ttl = %s)", self.jid, self.ttl)
+        return self._expires_at
+
+    async def fail(self, group: str, message: str) -> Union[bool, str]:
+        """Mark the particular job as failed, with the provided type, and a
+        more specific message"""
+        logger.warning("Failing %s (%s): %s", self.jid, group, message)
+        response: Union[bool, str] = await self.client(
+            "fail",
+            self.jid,
+            self.client.worker_name,
+            group,
+            message,
+            *self._modified_data(),
+        )
+        return response or False
+
+    def _modified_data(self) -> List[str]:
+        # Data is only sent back if it's been changed, since it may be large
+        return [self._encoded_data] if self._data_modified else []
+
+    def _completion_data(self) -> str:
+        # Completion requires a data argument, but an empty one leaves the
+        # job's data as it is
+        return self._encoded_data if self._data_modified else ""
+
+    async def track(self) -> bool:
+        """Begin tracking this job"""
+        response: str = await self.client("track", "track", self.jid)
+        return response == "1"
+
+    async def untrack(self) -> bool:
+        """Stop tracking this job"""
+        response: str = await self.client("track", "untrack", self.jid)
+        return response == "1"
+
+    async def retry(
+        self,
+        delay: int = 0,
+        group: Optional[str] = None,
+        message: Optional[str] = None,
+    ) -> int:
+        """Retry this job in a little bit, in the same queue"""
+        args: List[str] = [
+            "retry",
+            self.jid,
+            self.queue_name,
+            self.worker_name,
+            str(delay),
+        ]
+        if group is not None and message is not None:
+            args.append(group)
+            args.append(message)
+        response: int = await self.client(*args)
+        return response
+
+    async def depend(self, *args: str) -> bool:
+        """If and only if a job already has other dependencies, this will add
+        more jids to the list of this job's dependencies."""
+        return await self.client("depends", self.jid, "on", *args) or False
+
+    async def undepend(self, *args: str, **kwargs: bool) -> bool:
+        """Remove specific (or all) job dependencies from this job"""
+        if kwargs.get("all", False):
+            return await self.client("depends", self.jid, "off", "all") or False
+        return await self.client("depends", self.jid, "off", *args) or False
+
+    async def timeout(self) -> None:
+        """Time out this job"""
+        await self.client("timeout", self.jid)
+
+
+class RecurringJob(BaseJob):
+    """Asynchronous counterpart of `reqless.job.RecurringJob`"""
+
+    __slots__ = ("_count", "_interval", "_retries")
+
+    def __init__(self, client: "Client", **kwargs: Any):
+        super().__init__(client, **kwargs)
+        self._retries: int = kwargs["retries"]
+        self._interval: int = kwargs["interval"]
+        self._count: int = kwargs["count"]
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def interval(self) -> int:
+        return self._interval
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    async def update(self, **kwargs: Any) -> None:
+        """Update the template of this recurring job. Accepts any of `count`,
+        `data`, `interval`, `klass`, `priority`, `queue` and `retries`"""
+        klass = kwargs.get("klass")
+        if klass is not None and not isinstance(klass, str):
+            kwargs["klass"] = klass.__module__ + "." + klass.__name__
+        options = dict(kwargs)
+        if "data" in options:
+            options["data"] = compress_payload(options["data"], self.client.compressor)
+        args = [item for option in options.items() for item in option]
+        await self.client("recur.update", self.jid, *args)
+        for key, value in kwargs.items():
+            setattr(self, "_" + RECUR_UPDATE_ATTRIBUTES.get(key, key), value)
+        if "data" in options:
+            self._encoded_data = options["data"]
+        if klass is not None:
+            self._klass = None if isinstance(klass, str) else klass
+
+    async def next(self) -> Optional[float]:
+        """When the next instance of this job will be spawned"""
+        response: Optional[float] = await self.client.database.zscore(
+            "ql:q:" + self.queue_name + "-recur", self.jid
+        )
+        return response
+
+    async def move(self, queue: str) -> bool:
+        """Make this recurring job attached to another queue"""
+        response: bool = await self.client("recur.update", self.jid, "queue", queue)
+        self._queue_name = queue
+        return response
+
+    async def cancel(self) -> List[str]:
+        """Cancel all future recurring jobs"""
+        await self.client("unrecur", self.jid)
+        return [self.jid]
+
+    async def tag(self, *tags: str) -> List[str]:
+        """Add tags to this recurring job"""
+        response: List[str] = await self.client("recur.tag", self.jid, *tags)
+        return response
+
+    async def untag(self, *tags: str) -> List[str]:
+        """Remove tags from this job"""
+        response: List[str] = await self.client("recur.untag", self.jid, *tags)
+        return response
@@ -0,0 +1,98 @@
+"""An asynchronous class that listens to pubsub channels and can unlisten"""
+
+import asyncio
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from reqless import listener
+
+
+logger = logging.getLogger("reqless")
+
+
+class Listener:
+    """Asynchronous counterpart of `reqless.listener.Listener`"""
+
+    def __init__(self, database: Redis, channels: List[str]):
+        self._pubsub: PubSub = database.pubsub()
+        self._channels: List[str] = channels
+        self._subscribed: bool = False
+
+    async def subscribe(self) -> None:
+        """Subscribe to our channels, if we haven't already"""
+        if not self._subscribed:
+            await self._pubsub.subscribe(*self._channels)
+            self._subscribed = True
+
+    async def listen(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """Listen for events as they come in"""
+        try:
+            await self.subscribe()
+            async for message in self._pubsub.listen():
+                if message["type"] == "message":
+                    yield message
+        finally:
+            self._channels = []
+
+    async def unlisten(self) -> None:
+        """Stop listening for events"""
+        await self._pubsub.unsubscribe(*self._channels)
+
+
+class Events:
+    """Asynchronous counterpart of `reqless.listener.Events`. Callbacks may be
+    plain functions or coroutine functions."""
+
+    namespace = listener.Events.namespace
+    events = listener.Events.events
+
+    def __init__(self, database: Redis):
+        self._listener = Listener(
+            channels=[self.namespace + event for event in self.events],
+            database=database,
+        )
+        self._callbacks: Dict[str, Optional[Callable]] = {k: None for k in self.events}
+
+    async def listen(self) -> None:
+        """Listen for events"""
+        async for message in self._listener.listen():
+            logger.debug("Message: %s", message)
+            # Strip off the 'namespace' from the channel
+            channel = message["channel"][len(self.namespace) :]
+            func = self._callbacks.get(channel)
+            if func:
+                result = func(message["data"])
+                if inspect.isawaitable(result):
+                    await result
+
+    def on(self, evt: str, func: Optional[Callable]) -> None:
+        """Set a callback handler for a pubsub event"""
+        if evt not in self._callbacks:
+            raise NotImplementedError('callback "%s"' % evt)
+        else:
+            self._callbacks[evt] = func
+
+    def off(self, evt: str) -> Optional[Callable]:
+        """Deactivate the callback for a pubsub event"""
+        return self._callbacks.pop(evt, None)
+
+    async def unlisten(self) -> None:
+        """Stop listening for events"""
+        await self._listener.unlisten()
+
+    @asynccontextmanager
+    async def task(self) -> AsyncGenerator["Events", None]:
+        """Listen in a background task for the duration of the context. We
+        are subscribed by the time the context is entered."""
+        await self._listener.subscribe()
+        task = asyncio.ensure_future(self.listen())
+        try:
+            yield self
+        finally:
+            await self.unlisten()
+            await task
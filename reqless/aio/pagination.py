@@ -0,0 +1,40 @@
+"""Asynchronous counterpart of `reqless.pagination`"""
+
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Optional, Sequence
+
+from reqless.pagination import Hydration, JidsOf, check, page_jids
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from reqless.aio import Client
+
+
+async def iter_listing(
+    client: "Client",
+    command: Sequence[Any],
+    page_size: int,
+    jids_of: JidsOf = page_jids,
+    hydration: Optional[Hydration] = None,
+) -> AsyncIterator[Any]:
+    """Yield everything listed by a paginated command, one page at a time. See
+    `reqless.pagination.iter_listing`."""
+    if page_size < 1:
+        raise ValueError("Page size must be positive, got %s" % page_size)
+    page = jids_of(await client(*command, 0, page_size))
+    offset = page_size
+    while page:
+        following: List[Sequence[Any]] = []
+        if len(page) == page_size:
+            following.append([*command, offset, page_size])
+        offset += page_size
+        if hydration is None:
+            for jid in page:
+                yield jid
+            page = jids_of(await client(*following[0])) if following else []
+            continue
+        commands, to_jobs = hydration
+        hydrating = commands(page)
+        results = check(await client.call_many(hydrating + following))
+        for job in to_jobs(results[: len(hydrating)]):
+            yield job
+        page = jids_of(results[-1]) if following else []
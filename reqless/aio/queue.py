@@ -0,0 +1,333 @@
+"""Asynchronous counterparts of the Queue and supporting classes"""
+
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+)
+
+from reqless.aio.job import Job, RecurringJob
+from reqless.aio.pagination import iter_listing
+from reqless.aio.throttle import Throttle
+from reqless.exceptions import ReqlessError
+from reqless.pagination import multiget_hydration, recurring_hydration
+from reqless.queue import DEFAULT_CHUNK_SIZE, BaseQueue
+from reqless.util import chunks
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from reqless.aio import Client
+
+
+class Jobs:
+    """A proxy object for queue-specific job information"""
+
+    def __init__(self, name: str, client: "Client"):
+        self._name: str = name
+        self.client: "Client" = client
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def depends(self, offset: int = 0, count: int = 25) -> List[str]:
+        """Return all the currently dependent jobs"""
+        return await self._jobs("depends", offset, count)
+
+    async def recurring(self, offset: int = 0, count: int = 25) -> List[str]:
+        """Return all the recurring jobs"""
+        return await self._jobs("recurring", offset, count)
+
+    async def running(self, offset: int = 0, count: int = 25) -> List[str]:
+        """Return all the currently-running jobs"""
+        return await self._jobs("running", offset, count)
+
+    async def scheduled(self, offset: int = 0, count: int = 25) -> List[str]:
+        """Return all the currently-scheduled jobs"""
+        return await self._jobs("scheduled", offset, count)
+
+    async def stalled(self, offset: int = 0, count: int = 25) -> List[str]:
+        """Return all the currently-stalled jobs"""
+        return await self._jobs("stalled", offset, count)
+
+    def iter_depends(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> AsyncIterator[Union[str, Job]]:
+        """Stream through all the currently dependent jobs. See
+        `reqless.queue.Jobs.iter_running`"""
+        return self._iter("depends", hydrate, page_size, light)
+
+    def iter_recurring(
+        self, hydrate: bool = False, page_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[Union[str, RecurringJob]]:
+        """Stream through all the recurring jobs. See
+        `reqless.queue.Jobs.iter_running`"""
+        hydration = recurring_hydration(self.client, RecurringJob) if hydrate else None
+        return iter_listing(
+            self.client,
+            ("jobs", "recurring", self.name),
+            page_size,
+            hydration=hydration,
+        )
+
+    def iter_running(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> AsyncIterator[Union[str, Job]]:
+        """Stream through all the currently-running jobs. See
+        `reqless.queue.Jobs.iter_running`"""
+        return self._iter("running", hydrate, page_size, light)
+
+    def iter_scheduled(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> AsyncIterator[Union[str, Job]]:
+        """Stream through all the currently-scheduled jobs. See
+        `reqless.queue.Jobs.iter_running`"""
+        return self._iter("scheduled", hydrate, page_size, light)
+
+    def iter_stalled(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> AsyncIterator[Union[str, Job]]:
+        """Stream through all the currently-stalled jobs. See
+        `reqless.queue.Jobs.iter_running`"""
+        return self._iter("stalled", hydrate, page_size, light)
+
+    def _iter(
+        self, state: str, hydrate: bool, page_size: int, light: bool
+    ) -> AsyncIterator[Union[str, Job]]:
+        hydration = multiget_hydration(self.client, Job, light) if hydrate else None
+        return iter_listing(
+            self.client, ("jobs", state, self.name), page_size, hydration=hydration
+        )
+
+    async def _jobs(self, state: str, offset: int, count: int) -> List[str]:
+        response: List[str] = await self.client("jobs", state, self.name, offset, count)
+        return response
+
+
+class Queue(BaseQueue):
+    """Asynchronous counterpart of `reqless.queue.Queue`"""
+
+    def __init__(self, name: str, client: "Client", worker_name: str):
+        super().__init__(name, worker_name, client.serializer, client.compressor)
+        self.client: "Client" = client
+        self._jobs: Optional[Jobs] = None
+
+    async def counts(self) -> Dict[str, Any]:
+        response: Dict[str, Any] = self.client.serializer.loads(
+            await self.client("queues", self.name)
+        )
+        return response
+
+    async def heartbeat(self) -> int:
+        """The heartbeat interval of jobs in this queue"""
+        config = await self.client.config.all()
+        return int(config.get(self.name + "-heartbeat", config.get("heartbeat", 60)))
+
+    async def set_heartbeat(self, value: int) -> None:
+        """Change the heartbeat interval of jobs in this queue"""
+        await self.client.config.set(self.name + "-heartbeat", value)
+
+    @property
+    def jobs(self) -> Jobs:
+        if self._jobs is None:
+            self._jobs = Jobs(self.name, self.client)
+
+        return self._jobs
+
+    @property
+    def throttle(self) -> Throttle:
+        return self.client.throttles[f"ql:q:{self.name}"]
+
+    async def pause(self) -> None:
+        await self.client("pause", self.name)
+
+    async def unpause(self) -> None:
+        await self.client("unpause", self.name)
+
+    async def put(
+        self,
+        klass: Union[str, Type],
+        data: str,
+        priority: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        delay: Optional[int] = None,
+        retries: Optional[int] = None,
+        jid: Optional[str] = None,
+        depends: Optional[List[str]] = None,
+        throttles: Optional[List[str]] = None,
+    ) -> str:
+        """Either create a new job in the provided queue with the provided
+        attributes, or move that job into that queue"""
+        response: str = await self.client(
+            *self._put_command(
+                "put",
+                klass,
+                data,
+                priority=priority,
+                tags=tags,
+                delay=delay,
+                retries=retries,
+                jid=jid,
+                depends=depends,
+                throttles=throttles,
+            )
+        )
+        return response
+
+    async def put_many(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[Union[str, ReqlessError]]:
+        """Put many jobs into this queue, one round trip per chunk"""
+        results: List[Union[str, ReqlessError]] = []
+        for chunk in chunks(jobs, chunk_size):
+            results.extend(
+                await self.client.call_many(
+                    [self._put_command("put", **job) for job in chunk]
+                )
+            )
+        return results
+
+    async def requeue(
+        self,
+        klass: Union[str, Type],
+        data: str,
+        priority: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        delay: Optional[int] = None,
+        retries: Optional[int] = None,
+        jid: Optional[str] = None,
+        depends: Optional[List[str]] = None,
+        throttles: Optional[List[str]] = None,
+    ) -> str:
+        """Like `put`, but only for jobs that already exist"""
+        response: str = await self.client(
+            *self._put_command(
+                "requeue",
+                klass,
+                data,
+                priority=priority,
+                tags=tags,
+                delay=delay,
+                retries=retries,
+                jid=jid,
+                depends=depends,
+                throttles=throttles,
+            )
+        )
+        return response
+
+    async def recur(
+        self,
+        klass: Union[str, Type],
+        data: str,
+        interval: Optional[int] = None,
+        offset: Optional[int] = 0,
+        priority: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        retries: Optional[int] = None,
+        jid: Optional[str] = None,
+        throttles: Optional[List[str]] = None,
+    ) -> str:
+        """Place a recurring job in this queue"""
+        response: str = await self.client(
+            *self._recur_command(
+                klass,
+                data,
+                interval=interval,
+                offset=offset,
+                priority=priority,
+                tags=tags,
+                retries=retries,
+                jid=jid,
+                throttles=throttles,
+            )
+        )
+        return response
+
+    async def recur_many(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[Union[str, ReqlessError]]:
+        """Place many recurring jobs in this queue, one round trip per chunk"""
+        results: List[Union[str, ReqlessError]] = []
+        for chunk in chunks(jobs, chunk_size):
+            results.extend(
+                await self.client.call_many(
+                    [self._recur_command(**job) for job in chunk]
+                )
+            )
+        return results
+
+    async def pop(
+        self, count: Optional[int] = None, light: bool = False
+    ) -> Union[Job, List[Job], None]:
+        """Pop one job, or a list of up to `count` jobs, for this worker"""
+        results: List[Job] = [
+            Job(self.client, **job)
+            for job in self.client.serializer.loads(
+                await self.client(
+                    "pop",
+                    self.name,
+                    self.worker_name,
+                    count or 1,
+                    *self.projection(light),
+                )
+            )
+        ]
+        if count is None:
+            return (len(results) and results[0]) or None
+        return results
+
+    async def peek(
+        self,
+        offset: Optional[int] = None,
+        count: Optional[int] = None,
+        light: bool = False,
+    ) -> Union[Job, List[Job], None]:
+        """Similar to the pop command, except that it merely peeks at the next
+        items"""
+        results: List[Job] = [
+            Job(self.client, **rec)
+            for rec in self.client.serializer.loads(
+                await self.client(
+                    "peek", self.name, offset or 0, count or 1, *self.projection(light)
+                )
+            )
+        ]
+        if count is None:
+            return (len(results) and results[0]) or None
+        return results
+
+    async def stats(self, date: Optional[str] = None) -> Dict:
+        """Return the current statistics for a given queue on a given date"""
+        response: Dict = self.client.serializer.loads(
+            await self.client("stats", self.name, date or repr(time.time()))
+        )
+        return response
+
+    async def length(self) -> int:
+        """The number of jobs in this queue"""
+        response: int = await self.client("length", self.name)
+        return response
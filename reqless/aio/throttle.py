@@ -0,0 +1,48 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from reqless.aio import Client
+
+
+class Throttle:
+    """Asynchronous counterpart of `reqless.throttle.Throttle`"""
+
+    def __init__(self, client: "Client", name: str):
+        self.client: "Client" = client
+        self._name: str = name
+
+    async def delete(self) -> None:
+        await self.client("throttle.delete", self.name)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def locks(self) -> List[str]:
+        response: List[str] = await self.client("throttle.locks", self.name)
+        return response
+
+    async def maximum(self) -> int:
+        json_state = await self.client("throttle.get", self.name)
+        state: Dict[str, Any] = (
+            self.client.serializer.loads(json_state) if json_state else {}
+        )
+        maximum: int = state.get("maximum", 0)
+        return maximum
+
+    async def set_maximum(
+        self,
+        maximum: Optional[int] = None,
+        expiration: Optional[int] = None,
+    ) -> None:
+        _maximum = maximum if maximum is not None else await self.maximum()
+        await self.client("throttle.set", self.name, _maximum, expiration or 0)
+
+    async def pending(self) -> List[str]:
+        response: List[str] = await self.client("throttle.pending", self.name)
+        return response
+
+    async def ttl(self) -> int:
+        response: int = await self.client("throttle.ttl", self.name)
+        return response
@@ -0,0 +1,133 @@
+"""Transparent compression of large job payloads.
+
+Compressed payloads are stored as a JSON object with a single reserved key, so
+that the Lua scripts still see valid JSON, whose value names the compressor
+followed by the base64 encoded compressed data:
+`{"__reqless_compressed__":"zlib:eJzL..."}`. Anything else is returned as it
+is, so jobs put before compression was enabled, or by clients without it,
+decode correctly. Since the Lua scripts may re-encode it, escaping slashes
+for instance, it's decoded as JSON before anything else."""
+
+import base64
+import binascii
+import json
+import zlib
+from typing import Callable, Dict, Optional
+
+from reqless.abstract import AbstractCompressor
+from reqless.exceptions import ReqlessError
+
+
+try:
+    import lz4.frame
+except ImportError:  # pragma: no cover
+    lz4 = None
+
+# Job data may not be an object with only this key
+RESERVED_KEY = "__reqless_compressed__"
+# Compressed payloads start with this, however they've been re-encoded, since
+# neither we nor the Lua scripts put whitespace between the brace and the key
+PREFIX = '{"%s":' % RESERVED_KEY
+
+
+class ZlibCompressor(AbstractCompressor):
+    """Compresses payloads of at least `threshold` characters with zlib"""
+
+    def __init__(self, level: int = 6, threshold: int = 1024):
+        self.level: int = level
+        self._threshold: int = threshold
+
+    @property
+    def name(self) -> str:
+        return "zlib"
+
+    @property
+    def threshold(self) -> int:
+        return self._threshold
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class Lz4Compressor(AbstractCompressor):
+    """Compresses payloads of at least `threshold` characters with lz4, which
+    must be installed. It's much faster than zlib, at a lower ratio."""
+
+    def __init__(self, threshold: int = 1024):
+        if lz4 is None:  # pragma: no cover
+            raise ReqlessError("lz4 must be installed to use lz4 compression")
+        self._threshold: int = threshold
+
+    @property
+    def name(self) -> str:
+        return "lz4"
+
+    @property
+    def threshold(self) -> int:
+        return self._threshold
+
+    def compress(self, data: bytes) -> bytes:
+        result: bytes = lz4.frame.compress(data)
+        return result
+
+    def decompress(self, data: bytes) -> bytes:
+        result: bytes = lz4.frame.decompress(data)
+        return result
+
+
+def _decompressors() -> Dict[str, Callable[[bytes], bytes]]:
+    decompressors: Dict[str, Callable[[bytes], bytes]] = {"zlib": zlib.decompress}
+    if lz4 is not None:  # pragma: no cover
+        decompressors["lz4"] = lz4.frame.decompress
+    return decompressors
+
+
+DECOMPRESSORS: Dict[str, Callable[[bytes], bytes]] = _decompressors()
+
+
+def compress_payload(data: str, compressor: Optional[AbstractCompressor]) -> str:
+    """Compress data if it's large enough, and it's worth it"""
+    if compressor is None or len(data) < compressor.threshold:
+        return data
+    compressed = base64.b64encode(compressor.compress(data.encode())).decode()
+    result = json.dumps(
+        {RESERVED_KEY: "%s:%s" % (compressor.name, compressed)}, separators=(",", ":")
+    )
+    # Incompressible data is better left as it is
+    return result if len(result) < len(data) else data
+
+
+def decompress_payload(
+    data: str, compressor: Optional[AbstractCompressor] = None
+) -> str:
+    """Decompress data if it was compressed, whichever compressor was used"""
+    if not data.startswith(PREFIX):
+        return data
+    try:
+        wrapper = json.loads(data)
+    except ValueError:
+        return data
+    if len(wrapper) != 1 or not isinstance(wrapper[RESERVED_KEY], str):
+        return data
+    name, _, compressed = wrapper[RESERVED_KEY].partition(":")
+    decompress: Optional[Callable[[bytes], bytes]] = DECOMPRESSORS.get(name)
+    if compressor is not None and compressor.name == name:
+        decompress = compressor.decompress
+    if decompress is None:
+        raise ReqlessError("Unable to decompress %s compressed data" % name)
+    try:
+        decoded = base64.b64decode(compressed, validate=True)
+    except binascii.Error:
+        raise ReqlessError("Unable to decode %s compressed data" % name)
+    return decompress(decoded).decode()
+
+
+__all__ = [
+    "Lz4Compressor",
+    "ZlibCompressor",
+    "compress_payload",
+    "decompress_payload",
+]
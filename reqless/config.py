@@ -1,10 +1,28 @@
 """All our configuration operations"""
 
-import json
-from typing import Any, Dict, ItemsView, Iterable, Iterator, KeysView, ValuesView
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    ItemsView,
+    Iterable,
+    Iterator,
+    KeysView,
+    Optional,
+    ValuesView,
+)
 
 from reqless.abstract.abstract_client import AbstractClient
 from reqless.abstract.abstract_config import AbstractConfig
+from reqless.listener import Listener
+
+
+# The name of each option changed is published on this channel
+CHANGE_CHANNEL = "ql:config"
 
 
 class Config(AbstractConfig):
@@ -15,20 +33,16 @@ class Config(AbstractConfig):
 
     @property
     def all(self) -> Dict[str, Any]:
-        response: Dict[str, Any] = json.loads(self._client("config.get"))
+        response: Dict[str, Any] = self._client.serializer.loads(
+            self._client("config.get")
+        )
         return response
 
     def __len__(self) -> int:
         return len(self.all)
 
     def __getitem__(self, option: str) -> Any:
-        result = self._client("config.get", option)
-        if not result:
-            return None
-        try:
-            return json.loads(result)
-        except TypeError:
-            return result
+        return self._decode(self._client("config.get", option))
 
     def __setitem__(self, option: str, value: Any) -> None:
         self._client("config.set", option, value)
@@ -43,9 +57,10 @@ class Config(AbstractConfig):
         return iter(self.all)
 
     def clear(self) -> None:
-        """Remove all keys"""
-        for key in self.keys():
-            self._client("config.unset", key)
+        """Remove all keys, in a single call"""
+        keys = list(self.keys())
+        if keys:
+            self._client("config.unset.many", *keys)
 
     def get(self, option: str, default: Any = None) -> Any:
         """Get a particular option, or the default if it's missing"""
@@ -70,9 +85,102 @@ class Config(AbstractConfig):
         """Just like `dict.update`"""
         _kwargs = dict(kwargs)
         _kwargs.update(other)
-        for key, value in _kwargs.items():
-            self[key] = value
+        # All the options are set in a single call
+        if _kwargs:
+            self._client("config.set.many", *itertools.chain(*_kwargs.items()))
 
     def values(self) -> ValuesView:
         """Just like `dict.values`"""
         return self.all.values()
+
+    def invalidate(self) -> None:
+        """Forget any cached options. Nothing is cached, so this does nothing"""
+
+    def _decode(self, result: Any) -> Any:
+        if not result:
+            return None
+        # Numbers come back from the server as they are, not as JSON
+        if not isinstance(result, str):
+            return result
+        return self._client.serializer.loads(result)
+
+
+class CachedConfig(Config):
+    """A view of the config that fetches all the options at most once every
+    `ttl` seconds, rather than on every read. Changes made through this view
+    invalidate the cache right away. Changes made by other clients are seen
+    once the cache expires, or as soon as they're published while `watching`."""
+
+    def __init__(self, client: AbstractClient, ttl: float = 5.0):
+        super().__init__(client)
+        self.ttl: float = ttl
+        self._cache: Optional[Dict[str, Any]] = None
+        self._fetched_at: float = 0.0
+        # Bumped on every invalidation, so that a fetch racing an invalidation
+        # doesn't cache what it fetched
+        self._generation: int = 0
+
+    @property
+    def all(self) -> Dict[str, Any]:
+        cache = self._cache
+        if cache is None or time.monotonic() - self._fetched_at >= self.ttl:
+            generation = self._generation
+            fetched_at = time.monotonic()
+            cache = super().all
+            if generation == self._generation:
+                self._cache, self._fetched_at = cache, fetched_at
+        return dict(cache)
+
+    def __getitem__(self, option: str) -> Any:
+        return self._decode(self.all.get(option))
+
+    def __setitem__(self, option: str, value: Any) -> None:
+        try:
+            super().__setitem__(option, value)
+        finally:
+            self.invalidate()
+
+    def __delitem__(self, option: str) -> None:
+        try:
+            super().__delitem__(option)
+        finally:
+            self.invalidate()
+
+    def clear(self) -> None:
+        """Remove all keys, in a single call"""
+        try:
+            super().clear()
+        finally:
+            self.invalidate()
+
+    def update(self, other: Iterable = (), **kwargs: Any) -> None:
+        """Just like `dict.update`"""
+        try:
+            super().update(other, **kwargs)
+        finally:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the cached options, so that the next read fetches them"""
+        self._generation += 1
+        self._cache = None
+
+    @contextmanager
+    def watching(self) -> Generator["CachedConfig", None, None]:
+        """Invalidate the cache whenever any client changes an option, for the
+        duration of the context. We are subscribed by the time it's entered."""
+        listener = Listener(self._client.database, [CHANGE_CHANNEL])
+        listener.subscribe()
+        # Anything cached until now may have missed a change
+        self.invalidate()
+        thread = threading.Thread(target=self._watch, args=(listener,), daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            listener.unlisten()
+            thread.join()
+
+    def _watch(self, listener: Listener) -> None:
+        for _ in listener.listen():
+            self.invalidate()
@@ -1,7 +1,8 @@
 import importlib
 import os
 import time
-from typing import Dict, Type
+import weakref
+from typing import Callable, Dict, Optional, Tuple, Type
 
 from reqless.logger import logger
 
@@ -14,31 +15,87 @@ class Importer:
     the debug mode or the general mechanism"""
     _loaded: Dict[str, float] = {}
 
+    """The classes we've resolved, and when we last checked whether their
+    modules needed reloading"""
+    _classes: Dict[str, Tuple[Type, float]] = {}
+
+    """The name of the method that processes jobs of each class in each queue.
+    Only names are kept, since methods may refer back to their class, so that
+    classes that have been reloaded are forgotten along with them."""
+    _methods: "weakref.WeakKeyDictionary[Type, Dict[str, Optional[str]]]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    """How often, in seconds, to check whether a class's module has changed
+    and should be reloaded. Zero checks on every import, and None never checks,
+    so that classes are resolved once and for all, as befits production"""
+    reload_interval: Optional[float] = 0.0
+
+    @staticmethod
+    def set_reload_interval(reload_interval: Optional[float]) -> None:
+        Importer.reload_interval = reload_interval
+
     @staticmethod
     def mark_for_reload_on_next_import(class_name: str) -> None:
         Importer._loaded[class_name] = 0
+        Importer._classes.pop(class_name, None)
 
     @staticmethod
     def import_class(class_name: str) -> Type:
         """1) Get a reference to the module
-        2) Check the file that module's imported from
+        2) Check the file that module's imported from, unless that was done
+           less than `reload_interval` seconds ago
         3) If that file's been updated, force a reload of that module
              return it"""
+        now = time.time()
+        resolved = Importer._classes.get(class_name)
+        if resolved is not None:
+            _class, checked_at = resolved
+            if Importer.reload_interval is None or (
+                now - checked_at < Importer.reload_interval
+            ):
+                return _class
+
         mod = __import__(class_name.rpartition(".")[0])
         for segment in class_name.split(".")[1:-1]:
             mod = getattr(mod, segment)
 
         # Alright, now check the file associated with it. Note that classes
-        # defined in __main__ don't have a __file__ attribute
+        # defined in __main__ don't have a __file__ attribute. Unless it's been
+        # marked for reloading, it's not checked at all when never reloading.
         if class_name not in Importer._loaded:
-            Importer._loaded[class_name] = time.time()
-        if hasattr(mod, "__file__") and mod.__file__:
+            Importer._loaded[class_name] = now
+        should_check = (
+            Importer.reload_interval is not None or Importer._loaded[class_name] == 0
+        )
+        if should_check and hasattr(mod, "__file__") and mod.__file__:
             try:
                 mtime = os.stat(mod.__file__).st_mtime
                 if Importer._loaded[class_name] < mtime:
                     mod = importlib.reload(mod)
+                    Importer._loaded[class_name] = now
             except OSError:
                 logger.warning("Could not check modification time of %s", mod.__file__)
 
-        _class: Type = getattr(mod, class_name.rpartition(".")[2])
+        _class = getattr(mod, class_name.rpartition(".")[2])
+        Importer._classes[class_name] = (_class, now)
         return _class
+
+    @staticmethod
+    def job_method(klass: Type, queue_name: str) -> Optional[Callable]:
+        """The method of a class that processes its jobs in a queue: the one
+        named after the queue if there is one, or else `process`"""
+        methods = Importer._methods.get(klass)
+        if methods is None:
+            methods = Importer._methods[klass] = {}
+        try:
+            name = methods[queue_name]
+        except KeyError:
+            if hasattr(klass, queue_name):
+                name = queue_name
+            elif hasattr(klass, "process"):
+                name = "process"
+            else:
+                name = None
+            methods[queue_name] = name
+        return None if name is None else getattr(klass, name)
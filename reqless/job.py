@@ -1,6 +1,6 @@
 """Both the regular Job and RecurringJob classes"""
 
-import json
+import sys
 import time
 import traceback
 import types
@@ -13,33 +13,69 @@ from reqless.abstract import (
     AbstractQueue,
     AbstractRecurringJob,
 )
+from reqless.compression import compress_payload, decompress_payload
 from reqless.exceptions import LostLockError, ReqlessError
 from reqless.importer import Importer
 from reqless.logger import logger
+from reqless.util import intern_history, intern_strings
 
 
 class BaseJob(AbstractBaseJob):
+    # Jobs are created by the thousand when listing them, so their fields are
+    # kept in slots and they have no __dict__. Strings repeated across jobs,
+    # like queue and worker names, are interned so that they're only kept once
+    __slots__ = (
+        "__weakref__",
+        "client",
+        "_data",
+        "_data_modified",
+        "_encoded_data",
+        "_jid",
+        "_klass",
+        "_klass_name",
+        "_priority",
+        "_queue",
+        "_queue_name",
+        "_sandbox",
+        "_tags",
+        "_throttles",
+    )
+
     def __init__(self, client: AbstractClient, **kwargs: Any):
         self.client: AbstractClient = client
-        self._data: str = kwargs["data"]
+        # The data as it's stored on the server, which may be compressed. It's
+        # only decompressed when first accessed.
+        self._encoded_data: str = kwargs["data"]
+        self._data: Optional[str] = None
+        # Whether data has been changed since it was fetched, and so needs to
+        # be sent back to the server
+        self._data_modified: bool = False
         self._jid: str = kwargs["jid"]
         self._klass: Optional[Type] = None
-        self._klass_name: str = kwargs["klass"]
+        self._klass_name: str = sys.intern(kwargs["klass"])
         self._priority: int = kwargs["priority"]
         self._queue: Optional[AbstractQueue] = None
-        self._queue_name: str = kwargs["queue"]
+        self._queue_name: str = sys.intern(kwargs["queue"])
         self._sandbox: Optional[str] = None
         # Because of how Lua parses JSON, empty tags comes through as {}
-        self._tags: List[str] = kwargs.get("tags") or []
-        self._throttles: List[str] = kwargs.get("throttles") or []
+        self._tags: List[str] = intern_strings(kwargs.get("tags") or [])
+        self._throttles: List[str] = intern_strings(kwargs.get("throttles") or [])
 
     @property
     def data(self) -> str:
+        if self._data is None:
+            self._data = decompress_payload(self._encoded_data, self.client.compressor)
         return self._data
 
     @data.setter
     def data(self, value: str) -> None:
         self._data = value
+        self._encoded_data = compress_payload(value, self.client.compressor)
+        self._data_modified = True
+
+    @property
+    def data_modified(self) -> bool:
+        return self._data_modified
 
     @property
     def jid(self) -> str:
@@ -138,23 +174,54 @@ class BaseJob(AbstractBaseJob):
 class Job(BaseJob, AbstractJob):
     """The Job class"""
 
+    __slots__ = (
+        "_dependencies",
+        "_dependents",
+        "_expires_at",
+        "_failure",
+        "_history",
+        "_lost",
+        "_original_retires",
+        "_pop_from",
+        "_pop_next",
+        "_popped",
+        "_retries_left",
+        "_state",
+        "_tracked",
+        "_worker_name",
+    )
+
     def __init__(self, client: AbstractClient, **kwargs: Any):
         super().__init__(client, **kwargs)
-        self.client: AbstractClient = client
-        self._state: str = kwargs["state"]
-        self._failure: Optional[Dict] = kwargs["failure"]
-        # Because of how Lua parses JSON, empty lists come through as {}
-        self._dependents: List[str] = kwargs["dependents"] or []
-        self._dependencies: List[str] = kwargs["dependencies"] or []
+        self._state: str = sys.intern(kwargs["state"])
         self._tracked: bool = kwargs["tracked"]
-        self._worker_name: str = kwargs["worker"]
+        self._worker_name: str = sys.intern(kwargs["worker"])
         self._retries_left: int = kwargs["remaining"]
         self._expires_at: float = kwargs["expires"]
         self._original_retires: int = kwargs["retries"]
-        self._history: List[Dict] = kwargs["history"] or []
+        # These are decoded along with the rest of the job, but most of them
+        # are empty. Because of how Lua parses JSON, empty lists come through
+        # as {}, which are dropped right away and only replaced with an empty
+        # list or dict when first accessed. Light jobs are fetched without the
+        # last three. History mostly repeats what happened, where and on which
+        # worker, so its strings are interned.
+        self._failure: Optional[Dict] = kwargs["failure"] or None
+        self._dependents: Optional[List[str]] = kwargs.get("dependents") or None
+        self._dependencies: Optional[List[str]] = kwargs.get("dependencies") or None
+        self._history: Optional[List[Dict]] = (
+            intern_history(kwargs["history"]) if kwargs.get("history") else None
+        )
+        # Set by the worker when its lock on this job is lost, for jobs to poll
+        self._lost: bool = False
+        # Jobs to pop when completing this one, and those that were popped
+        self._pop_next: int = 0
+        self._pop_from: Optional[List[str]] = None
+        self._popped: Optional[List[AbstractJob]] = None
 
     @property
     def dependencies(self) -> List[str]:
+        if self._dependencies is None:
+            self._dependencies = []
         return self._dependencies
 
     @dependencies.setter
@@ -163,6 +230,8 @@ class Job(BaseJob, AbstractJob):
 
     @property
     def dependents(self) -> List[str]:
+        if self._dependents is None:
+            self._dependents = []
         return self._dependents
 
     @property
@@ -175,6 +244,8 @@ class Job(BaseJob, AbstractJob):
 
     @property
     def failure(self) -> Optional[Dict]:
+        if self._failure is None:
+            self._failure = {}
         return self._failure
 
     @failure.setter
@@ -183,8 +254,18 @@ class Job(BaseJob, AbstractJob):
 
     @property
     def history(self) -> List[Dict]:
+        if self._history is None:
+            self._history = []
         return self._history
 
+    @property
+    def lost(self) -> bool:
+        return self._lost
+
+    @lost.setter
+    def lost(self, value: bool) -> None:
+        self._lost = value
+
     @property
     def original_retries(self) -> int:
         return self._original_retires
@@ -218,9 +299,7 @@ class Job(BaseJob, AbstractJob):
         ``testing``, then this would invoke the ``testing`` staticmethod of
         your class."""
         try:
-            method = getattr(
-                self.klass, self.queue_name, getattr(self.klass, "process", None)
-            )
+            method = Importer.job_method(self.klass, self.queue_name)
         except Exception as exc:
             # We failed to import the module containing this class
             logger.exception("Failed to import %s", self.klass_name)
@@ -260,6 +339,11 @@ class Job(BaseJob, AbstractJob):
             logger.info("Processing %s in %s", self.jid, self.queue_name)
             method(self)
             logger.info("Completed %s in %s", self.jid, self.queue_name)
+        except LostLockError:
+            # Someone else owns this job now, so it's not ours to fail, but the
+            # worker needs to know that it was abandoned
+            logger.warning("Lost lock on %s in %s", self.jid, self.queue_name)
+            raise
         except Exception as exc:
             # Make error type based on exception type
             logger.exception(
@@ -287,12 +371,12 @@ class Job(BaseJob, AbstractJob):
             queue,
             self.jid,
             self.klass_name,
-            self.data,
+            self._encoded_data,
             delay,
             "depends",
-            json.dumps(depends or []),
+            self.client.serializer.dumps(depends or []),
             "throttles",
-            json.dumps(self.throttles or []),
+            self.client.serializer.dumps(self.throttles or []),
         )
         return response
 
@@ -301,10 +385,16 @@ class Job(BaseJob, AbstractJob):
         next_queue: Optional[str] = None,
         delay: Optional[int] = None,
         depends: Optional[List[str]] = None,
+        pop_next: Optional[int] = None,
     ) -> bool:
         """Turn this job in as complete, optionally advancing it to another
         queue. Like ``Queue.put`` and ``move``, it accepts a delay, and
-        dependencies"""
+        dependencies.
+
+        If ``pop_next`` (or the count given to ``pop_on_complete``) is
+        positive, up to that many more jobs are popped for this worker in the
+        same call, and made available as ``popped``."""
+        options: List[Any] = []
         if next_queue:
             logger.info(
                 "Advancing %s to %s from %s",
@@ -312,38 +402,65 @@ class Job(BaseJob, AbstractJob):
                 next_queue,
                 self.queue_name,
             )
-            return (
-                self.client(
-                    "complete",
-                    self.jid,
-                    self.client.worker_name,
-                    self.queue_name,
-                    self.data,
-                    "next",
-                    next_queue,
-                    "delay",
-                    delay or 0,
-                    "depends",
-                    json.dumps(depends or []),
-                )
-                or False
-            )
+            options = [
+                "next",
+                next_queue,
+                "delay",
+                delay or 0,
+                "depends",
+                self.client.serializer.dumps(depends or []),
+            ]
         else:
             logger.info("Completing %s", self.jid)
-            return (
-                self.client(
-                    "complete",
-                    self.jid,
-                    self.client.worker_name,
-                    self.queue_name,
-                    self.data,
-                )
-                or False
+        count = self._pop_next if pop_next is None else pop_next
+        if count <= 0:
+            state = self.client(
+                "complete",
+                self.jid,
+                self.client.worker_name,
+                self.queue_name,
+                self._completion_data(),
+                *options,
             )
+            if state:
+                self._state = state
+            return state or False
+        response = self.client.serializer.loads(
+            self.client(
+                "complete.multipop",
+                self.jid,
+                self.client.worker_name,
+                self.queue_name,
+                self._completion_data(),
+                count,
+                self.client.serializer.dumps(self._pop_from or [self.queue_name]),
+                *options,
+            )
+        )
+        # Because of how Lua encodes JSON, empty lists come through as {}
+        self._popped = [Job(self.client, **job) for job in response["jobs"] or []]
+        if response["state"]:
+            self._state = response["state"]
+        return response["state"] or False
+
+    def pop_on_complete(
+        self, count: int, queue_names: Optional[List[str]] = None
+    ) -> None:
+        """Have completing this job pop up to ``count`` more jobs for this
+        worker from the provided queues, or this job's queue, in the same
+        call"""
+        self._pop_next = count
+        self._pop_from = queue_names
+
+    @property
+    def popped(self) -> List[AbstractJob]:
+        """The jobs popped when this job was completed"""
+        return self._popped or []
 
     def heartbeat(self) -> float:
-        """Renew the heartbeat, if possible, and optionally update the job's
-        user data."""
+        """Renew the heartbeat, if possible, updating the job's user data if
+        it's been modified."""
+        self.check()
         logger.debug("Heartbeating %s (ttl = %s)", self.jid, self.ttl)
         try:
             self.expires_at = float(
@@ -351,15 +468,24 @@ class Job(BaseJob, AbstractJob):
                     "heartbeat",
                     self.jid,
                     self.client.worker_name,
-                    self.data,
+                    *self._modified_data(),
                 )
                 or 0
             )
         except ReqlessError:
+            self._lost = True
             raise LostLockError(self.jid)
+        self._data_modified = False
         logger.debug("Heartbeated %s (ttl = %s)", self.jid, self.ttl)
         return self.expires_at
 
+    def check(self) -> None:
+        """Raise `LostLockError` if our worker has lost its lock on this job.
+        Long-running jobs that don't heartbeat should call this now and then,
+        so that they stop once someone else owns them."""
+        if self._lost:
+            raise LostLockError(self.jid)
+
     def fail(self, group: str, message: str) -> Union[bool, str]:
         """Mark the particular job as failed, with the provided type, and a
         more specific message. By `type`, we mean some phrase that might be
@@ -385,10 +511,21 @@ class Job(BaseJob, AbstractJob):
             self.client.worker_name,
             group,
             message,
-            self.data,
+            *self._modified_data(),
         )
+        if response:
+            self._state = "failed"
         return response or False
 
+    def _modified_data(self) -> List[str]:
+        # Data is only sent back if it's been changed, since it may be large
+        return [self._encoded_data] if self._data_modified else []
+
+    def _completion_data(self) -> str:
+        # Completion requires a data argument, but an empty one leaves the
+        # job's data as it is
+        return self._encoded_data if self._data_modified else ""
+
     def track(self) -> bool:
         """Begin tracking this job"""
         response: str = self.client("track", "track", self.jid)
@@ -443,6 +580,8 @@ class Job(BaseJob, AbstractJob):
 class RecurringJob(BaseJob, AbstractRecurringJob):
     """Recurring Job object"""
 
+    __slots__ = ("_count", "_interval", "_retries")
+
     def __init__(self, client: AbstractClient, **kwargs: Any):
         super().__init__(client, **kwargs)
         self._retries: int = kwargs["retries"]
@@ -459,12 +598,13 @@ class RecurringJob(BaseJob, AbstractRecurringJob):
 
     @property
     def data(self) -> str:
-        return self._data
+        return super().data
 
     @data.setter
     def data(self, value: str) -> None:
         self._data = value
-        self.client("recur.update", self.jid, "data", self.data)
+        self._encoded_data = compress_payload(value, self.client.compressor)
+        self.client("recur.update", self.jid, "data", self._encoded_data)
 
     @property
     def interval(self) -> int:
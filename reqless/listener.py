@@ -18,17 +18,34 @@ class Listener:
     def __init__(self, database: Redis, channels: List[str]):
         self._pubsub: PubSub = database.pubsub()
         self._channels: List[str] = channels
+        self._subscribed: bool = False
+
+    def subscribe(self) -> None:
+        """Subscribe to our channels, if we haven't already"""
+        if not self._subscribed:
+            self._pubsub.subscribe(*self._channels)
+            self._subscribed = True
 
     def listen(self) -> Generator[Dict[str, Any], None, None]:
         """Listen for events as they come in"""
         try:
-            self._pubsub.subscribe(*self._channels)
+            self.subscribe()
             for message in self._pubsub.listen():  # type: ignore[no-untyped-call]
                 if message["type"] == "message":
                     yield message
         finally:
             self._channels = []
 
+    def resubscribe(self, channels: List[str]) -> None:
+        """Listen to the provided channels instead of our current ones"""
+        added = [channel for channel in channels if channel not in self._channels]
+        removed = [channel for channel in self._channels if channel not in channels]
+        self._channels = list(channels)
+        if added:
+            self._pubsub.subscribe(*added)
+        if removed:
+            self._pubsub.unsubscribe(*removed)
+
     def unlisten(self) -> None:
         """Stop listening for events"""
         self._pubsub.unsubscribe(*self._channels)
@@ -470,6 +470,26 @@ function Qless.cancel(now, ...)
   return arg
 end
 
+-- Pop up to `count` jobs for `worker` from the provided queues, visiting them
+-- in the order given and draining each as far as possible before moving on to
+-- the next. With `light`, jobs come without their history, dependents and
+-- dependencies.
+function Qless.multipop(now, worker, count, light, ...)
+  count = assert(tonumber(count),
+    'Multipop(): Arg "count" missing or not a number: ' .. tostring(count))
+  local response = {}
+  for _, queue in ipairs(arg) do
+    if #response >= count then
+      break
+    end
+    local jids = Qless.queue(queue):pop(now, worker, count - #response)
+    for _, jid in ipairs(jids) do
+      table.insert(response, Qless.job(jid):projected_data(light))
+    end
+  end
+  return response
+end
+
 -------------------------------------------------------------------------------
 -- Configuration interactions
 -------------------------------------------------------------------------------
@@ -510,6 +530,8 @@ Qless.config.set = function(option, value)
     option = option,
     value  = value
   }))
+  -- And on a channel of its own, for those only caching the config
+  Qless.publish('config', option)
 
   redis.call('hset', 'ql:config', option, value)
 end
@@ -522,6 +544,8 @@ Qless.config.unset = function(option)
     event  = 'config_unset',
     option = option
   }))
+  -- And on a channel of its own, for those only caching the config
+  Qless.publish('config', option)
 
   redis.call('hdel', 'ql:config', option)
 end
@@ -531,10 +555,10 @@ end
 -- It returns an object that represents the job with the provided JID
 -------------------------------------------------------------------------------
 
--- This gets all the data associated with the job with the provided id. If the
--- job is not found, it returns nil. If found, it returns an object with the
--- appropriate properties
-function QlessJob:data(...)
+-- This gets the data associated with the job with the provided id, save for its
+-- history, dependents and dependencies. If the job is not found, it returns
+-- nil. If found, it returns an object with the appropriate properties
+function QlessJob:light_data()
   local job = redis.call(
       'hmget', QlessJob.ns .. self.jid, 'jid', 'klass', 'state', 'queue',
       'worker', 'priority', 'expires', 'retries', 'remaining', 'data',
@@ -545,7 +569,7 @@ function QlessJob:data(...)
     return nil
   end
 
-  local data = {
+  return {
     jid = job[1],
     klass = job[2],
     state = job[3],
@@ -558,13 +582,26 @@ function QlessJob:data(...)
     remaining = math.floor(tonumber(job[9])),
     data = job[10],
     tags = cjson.decode(job[11]),
-    history = self:history(),
     failure = cjson.decode(job[12] or '{}'),
     throttles = cjson.decode(job[13] or '[]'),
     spawned_from_jid = job[14],
-    dependents = redis.call('smembers', QlessJob.ns .. self.jid .. '-dependents'),
-    dependencies = redis.call('smembers', QlessJob.ns .. self.jid .. '-dependencies'),
   }
+end
+
+-- This gets all the data associated with the job with the provided id. If the
+-- job is not found, it returns nil. If found, it returns an object with the
+-- appropriate properties
+function QlessJob:data(...)
+  local data = self:light_data()
+  if not data then
+    return nil
+  end
+
+  data.history = self:history()
+  data.dependents = redis.call(
+    'smembers', QlessJob.ns .. self.jid .. '-dependents')
+  data.dependencies = redis.call(
+    'smembers', QlessJob.ns .. self.jid .. '-dependencies')
 
   if #arg > 0 then
     -- This section could probably be optimized, but I wanted the interface
@@ -579,6 +616,15 @@ function QlessJob:data(...)
   end
 end
 
+-- The full data of the job, or without its history, dependents and
+-- dependencies if `light`
+function QlessJob:projected_data(light)
+  if light then
+    return self:light_data()
+  end
+  return self:data()
+end
+
 -- Complete a job and optionally put it in another queue, either scheduled or
 -- to be considered waiting immediately. It can also optionally accept other
 -- jids on which this job will be considered dependent before it's considered
@@ -594,8 +640,13 @@ end
 function QlessJob:complete(now, worker, queue_name, raw_data, ...)
   assert(worker, 'Complete(): Arg "worker" missing')
   assert(queue_name , 'Complete(): Arg "queue_name" missing')
-  local data = assert(cjson.decode(raw_data),
-    'Complete(): Arg "data" missing or not JSON: ' .. tostring(raw_data))
+  -- Empty data leaves the job's data as it is
+  if raw_data == '' then
+    raw_data = nil
+  else
+    assert(cjson.decode(raw_data),
+      'Complete(): Arg "data" missing or not JSON: ' .. tostring(raw_data))
+  end
 
   -- Read in all the optional parameters
   local options = {}
@@ -684,6 +735,8 @@ function QlessJob:complete(now, worker, queue_name, raw_data, ...)
       queue = queue_name,
       to = next_queue_name,
     }))
+    -- Workers idling on the next queue subscribe to this to wake up early
+    Qless.publish('wake:' .. next_queue_name, self.jid)
 
     -- Enqueue the job
     self:history(now, 'put', {q = next_queue_name})
@@ -1978,6 +2031,8 @@ function QlessQueue:put(now, worker, jid, klass, raw_data, delay, ...)
     event = 'put',
     queue = self.name
   }))
+  -- Workers idling on this queue subscribe to this to wake up early
+  Qless.publish('wake:' .. self.name, jid)
 
   -- Update the history to include this new change
   job:history(now, 'put', {q = self.name})
@@ -332,6 +332,22 @@ function Qless.cancel(now, ...)
   return arg
 end
 
+function Qless.multipop(now, worker, count, light, ...)
+  count = assert(tonumber(count),
+    'Multipop(): Arg "count" missing or not a number: ' .. tostring(count))
+  local response = {}
+  for _, queue in ipairs(arg) do
+    if #response >= count then
+      break
+    end
+    local jids = Qless.queue(queue):pop(now, worker, count - #response)
+    for _, jid in ipairs(jids) do
+      table.insert(response, Qless.job(jid):projected_data(light))
+    end
+  end
+  return response
+end
+
 
 Qless.config.defaults = {
   ['application']        = 'qless',
@@ -364,6 +380,7 @@ Qless.config.set = function(option, value)
     option = option,
     value  = value
   }))
+  Qless.publish('config', option)
 
   redis.call('hset', 'ql:config', option, value)
 end
@@ -374,11 +391,12 @@ Qless.config.unset = function(option)
     event  = 'config_unset',
     option = option
   }))
+  Qless.publish('config', option)
 
   redis.call('hdel', 'ql:config', option)
 end
 
-function QlessJob:data(...)
+function QlessJob:light_data()
   local job = redis.call(
       'hmget', QlessJob.ns .. self.jid, 'jid', 'klass', 'state', 'queue',
       'worker', 'priority', 'expires', 'retries', 'remaining', 'data',
@@ -388,7 +406,7 @@ function QlessJob:data(...)
     return nil
   end
 
-  local data = {
+  return {
     jid = job[1],
     klass = job[2],
     state = job[3],
@@ -401,13 +419,23 @@ function QlessJob:data(...)
     remaining = math.floor(tonumber(job[9])),
     data = job[10],
     tags = cjson.decode(job[11]),
-    history = self:history(),
     failure = cjson.decode(job[12] or '{}'),
     throttles = cjson.decode(job[13] or '[]'),
     spawned_from_jid = job[14],
-    dependents = redis.call('smembers', QlessJob.ns .. self.jid .. '-dependents'),
-    dependencies = redis.call('smembers', QlessJob.ns .. self.jid .. '-dependencies'),
   }
+end
+
+function QlessJob:data(...)
+  local data = self:light_data()
+  if not data then
+    return nil
+  end
+
+  data.history = self:history()
+  data.dependents = redis.call(
+    'smembers', QlessJob.ns .. self.jid .. '-dependents')
+  data.dependencies = redis.call(
+    'smembers', QlessJob.ns .. self.jid .. '-dependencies')
 
   if #arg > 0 then
     local response = {}
@@ -420,11 +448,22 @@ function QlessJob:data(...)
   end
 end
 
+function QlessJob:projected_data(light)
+  if light then
+    return self:light_data()
+  end
+  return self:data()
+end
+
 function QlessJob:complete(now, worker, queue_name, raw_data, ...)
   assert(worker, 'Complete(): Arg "worker" missing')
   assert(queue_name , 'Complete(): Arg "queue_name" missing')
-  local data = assert(cjson.decode(raw_data),
-    'Complete(): Arg "data" missing or not JSON: ' .. tostring(raw_data))
+  if raw_data == '' then
+    raw_data = nil
+  else
+    assert(cjson.decode(raw_data),
+      'Complete(): Arg "data" missing or not JSON: ' .. tostring(raw_data))
+  end
 
   local options = {}
   for i = 1, #arg, 2 do options[arg[i]] = arg[i + 1] end
@@ -492,6 +531,7 @@ function QlessJob:complete(now, worker, queue_name, raw_data, ...)
       queue = queue_name,
       to = next_queue_name,
     }))
+    Qless.publish('wake:' .. next_queue_name, self.jid)
 
     self:history(now, 'put', {q = next_queue_name})
 
@@ -1474,6 +1514,7 @@ function QlessQueue:put(now, worker, jid, klass, raw_data, delay, ...)
     event = 'put',
     queue = self.name
   }))
+  Qless.publish('wake:' .. self.name, jid)
 
   job:history(now, 'put', {q = self.name})
 
@@ -2161,6 +2202,14 @@ function QlessAPI.multiget(now, ...)
   return cjson.encode(results)
 end
 
+QlessAPI['multiget.light'] = function(now, ...)
+  local results = {}
+  for _, jid in ipairs(arg) do
+    table.insert(results, Qless.job(jid):light_data())
+  end
+  return cjson.encode(results)
+end
+
 QlessAPI['config.get'] = function(now, key)
   if not key then
     return cjson.encode(Qless.config.get(key))
@@ -2177,14 +2226,48 @@ QlessAPI['config.unset'] = function(now, key)
   return Qless.config.unset(key)
 end
 
+QlessAPI['config.set.many'] = function(now, ...)
+  assert(#arg % 2 == 0, 'config.set.many(): Arg "value" missing')
+  for i = 1, #arg, 2 do
+    Qless.config.set(arg[i], arg[i + 1])
+  end
+end
+
+QlessAPI['config.unset.many'] = function(now, ...)
+  for _, key in ipairs(arg) do
+    Qless.config.unset(key)
+  end
+end
+
 QlessAPI.queues = function(now, queue)
   return cjson.encode(QlessQueue.counts(now, queue))
 end
 
+-- The names of the queues first seen at or after `since`, interleaved with
+-- when they were first seen, along with how many queues there are in total
+QlessAPI['queues.names'] = function(now, since)
+  return cjson.encode({
+    count = redis.call('zcard', 'ql:queues'),
+    queues = redis.call(
+      'zrangebyscore', 'ql:queues', since or '-inf', '+inf', 'withscores')
+  })
+end
+
 QlessAPI.complete = function(now, jid, worker, queue, data, ...)
   return Qless.job(jid):complete(now, worker, queue, data, unpack(arg))
 end
 
+QlessAPI['complete.multipop'] = function(
+  now, jid, worker, queue, data, count, queues, ...)
+  queues = assert(cjson.decode(queues),
+    'Complete(): Arg "queues" missing or not JSON: ' .. tostring(queues))
+  local state = Qless.job(jid):complete(now, worker, queue, data, unpack(arg))
+  return cjson.encode({
+    state = state,
+    jobs = Qless.multipop(now, worker, count, false, unpack(queues)),
+  })
+end
+
 QlessAPI.failed = function(now, group, start, limit)
   return cjson.encode(Qless.failed(group, start, limit))
 end
@@ -2209,6 +2292,17 @@ QlessAPI.heartbeat = function(now, jid, worker, data)
   return Qless.job(jid):heartbeat(now, worker, data)
 end
 
+QlessAPI['heartbeat.many'] = function(now, worker, ...)
+  local response = {}
+  for _, jid in ipairs(arg) do
+    local ok, expires = pcall(function()
+      return Qless.job(jid):heartbeat(now, worker)
+    end)
+    response[jid] = ok and expires or false
+  end
+  return cjson.encode(response)
+end
+
 QlessAPI.workers = function(now, worker)
   return cjson.encode(QlessWorker.counts(now, worker))
 end
@@ -2242,24 +2336,32 @@ QlessAPI.log = function(now, jid, message, data)
   job:history(now, message, data)
 end
 
-QlessAPI.peek = function(now, queue, offset, count)
+QlessAPI.peek = function(now, queue, offset, count, light)
   local jids = Qless.queue(queue):peek(now, offset, count)
   local response = {}
   for _, jid in ipairs(jids) do
-    table.insert(response, Qless.job(jid):data())
+    table.insert(response, Qless.job(jid):projected_data(light))
   end
   return cjson.encode(response)
 end
 
-QlessAPI.pop = function(now, queue, worker, count)
+QlessAPI.pop = function(now, queue, worker, count, light)
   local jids = Qless.queue(queue):pop(now, worker, count)
   local response = {}
   for _, jid in ipairs(jids) do
-    table.insert(response, Qless.job(jid):data())
+    table.insert(response, Qless.job(jid):projected_data(light))
   end
   return cjson.encode(response)
 end
 
+QlessAPI.multipop = function(now, worker, count, ...)
+  return cjson.encode(Qless.multipop(now, worker, count, false, unpack(arg)))
+end
+
+QlessAPI['multipop.light'] = function(now, worker, count, ...)
+  return cjson.encode(Qless.multipop(now, worker, count, true, unpack(arg)))
+end
+
 QlessAPI.pause = function(now, ...)
   return QlessQueue.pause(now, unpack(arg))
 end
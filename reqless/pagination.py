@@ -0,0 +1,84 @@
+"""Streaming through paginated listings of jobs"""
+
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from reqless.abstract import AbstractClient
+from reqless.exceptions import ReqlessError
+
+
+# The page of jids in the response of a listing command
+JidsOf = Callable[[Any], List[str]]
+# The commands that fetch the jobs for a page of jids, and what turns their
+# responses into jobs
+Hydration = Tuple[
+    Callable[[List[str]], List[Sequence[Any]]],
+    Callable[[List[Any]], List[Any]],
+]
+
+
+def page_jids(response: Any) -> List[str]:
+    """The jids listed by the `jobs` command"""
+    return list(response or [])
+
+
+def check(results: List[Any]) -> List[Any]:
+    """Raise the first error among the results of `call_many`, if any"""
+    for result in results:
+        if isinstance(result, ReqlessError):
+            raise result
+    return results
+
+
+def multiget_hydration(client: Any, job_class: Type, light: bool) -> Hydration:
+    """Fetch the jobs for a page of jids with a single `multiget`"""
+    command = "multiget.light" if light else "multiget"
+    return (
+        lambda jids: [(command, *jids)],
+        lambda results: [
+            job_class(client, **job) for job in client.serializer.loads(results[0])
+        ],
+    )
+
+
+def recurring_hydration(client: Any, job_class: Type) -> Hydration:
+    """Fetch the recurring jobs for a page of jids, one `recur.get` each"""
+    return (
+        lambda jids: [("recur.get", jid) for jid in jids],
+        lambda results: [
+            job_class(client, **client.serializer.loads(result))
+            for result in results
+            if result
+        ],
+    )
+
+
+def iter_listing(
+    client: AbstractClient,
+    command: Sequence[Any],
+    page_size: int,
+    jids_of: JidsOf = page_jids,
+    hydration: Optional[Hydration] = None,
+) -> Iterator[Any]:
+    """Yield everything listed by a paginated command, which takes the offset
+    and count as its last two arguments, one page at a time. With a hydration,
+    the jobs are yielded rather than their jids, and each page of jobs is
+    fetched in the same round trip as the next page of jids. Like paging by
+    hand, jids may be skipped or repeated if the listing changes meanwhile."""
+    if page_size < 1:
+        raise ValueError("Page size must be positive, got %s" % page_size)
+    page = jids_of(client(*command, 0, page_size))
+    offset = page_size
+    while page:
+        following: List[Sequence[Any]] = []
+        if len(page) == page_size:
+            following.append([*command, offset, page_size])
+        offset += page_size
+        if hydration is None:
+            yield from page
+            page = jids_of(client(*following[0])) if following else []
+            continue
+        commands, to_jobs = hydration
+        hydrating = commands(page)
+        results = check(client.call_many(hydrating + following))
+        yield from to_jobs(results[: len(hydrating)])
+        page = jids_of(results[-1]) if following else []
@@ -17,6 +17,13 @@ class QueuePriorityPattern:
         self.patterns: List[str] = patterns
         self.should_distribute_fairly: bool = should_distribute_fairly
 
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, QueuePriorityPattern)
+            and self.patterns == other.patterns
+            and self.should_distribute_fairly == other.should_distribute_fairly
+        )
+
     def __repr__(self) -> str:
         return (
             f"<QueuePriorityPattern patterns={self.patterns}"
@@ -1,18 +1,31 @@
 """Our Queue and supporting classes"""
 
-import json
 import time
 import uuid
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type, Union
 
 from reqless.abstract import (
     AbstractClient,
+    AbstractCompressor,
     AbstractJob,
     AbstractQueue,
     AbstractQueueJobs,
+    AbstractRecurringJob,
+    AbstractSerializer,
     AbstractThrottle,
 )
-from reqless.job import Job
+from reqless.compression import compress_payload
+from reqless.exceptions import ReqlessError
+from reqless.job import Job, RecurringJob
+from reqless.pagination import iter_listing, multiget_hydration, recurring_hydration
+from reqless.util import chunks
+
+
+# How many commands to send per round trip in put_many and recur_many, and how
+# many jobs to fetch per call in Jobs.iter_get
+DEFAULT_CHUNK_SIZE = 500
+# The serialized form of empty tags, depends and throttles
+EMPTY_JSON_LIST = "[]"
 
 
 class Jobs(AbstractQueueJobs):
@@ -51,19 +64,176 @@ class Jobs(AbstractQueueJobs):
         response: List[str] = self.client("jobs", "stalled", self.name, offset, count)
         return response
 
+    def iter_depends(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:
+        """Stream through all the currently dependent jobs. See `iter_running`"""
+        return self._iter("depends", hydrate, page_size, light)
+
+    def iter_recurring(
+        self, hydrate: bool = False, page_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Union[str, AbstractRecurringJob]]:
+        """Stream through all the recurring jobs. See `iter_running`"""
+        hydration = recurring_hydration(self.client, RecurringJob) if hydrate else None
+        return iter_listing(
+            self.client,
+            ("jobs", "recurring", self.name),
+            page_size,
+            hydration=hydration,
+        )
+
+    def iter_running(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:
+        """Stream through the jids of all the currently-running jobs, fetching
+        page_size at a time so as to use constant memory. With hydrate, the
+        jobs are yielded instead, each page of them fetched in the same round
+        trip as the next page of jids, and light as in `Queue.pop`."""
+        return self._iter("running", hydrate, page_size, light)
+
+    def iter_scheduled(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:
+        """Stream through all the currently-scheduled jobs. See `iter_running`"""
+        return self._iter("scheduled", hydrate, page_size, light)
+
+    def iter_stalled(
+        self,
+        hydrate: bool = False,
+        page_size: int = DEFAULT_CHUNK_SIZE,
+        light: bool = False,
+    ) -> Iterator[Union[str, AbstractJob]]:
+        """Stream through all the currently-stalled jobs. See `iter_running`"""
+        return self._iter("stalled", hydrate, page_size, light)
+
+    def _iter(
+        self, state: str, hydrate: bool, page_size: int, light: bool
+    ) -> Iterator[Union[str, AbstractJob]]:
+        hydration = multiget_hydration(self.client, Job, light) if hydrate else None
+        return iter_listing(
+            self.client, ("jobs", state, self.name), page_size, hydration=hydration
+        )
+
+
+class BaseQueue:
+    """Behavior shared by the synchronous and asynchronous queues"""
+
+    def __init__(
+        self,
+        name: str,
+        worker_name: str,
+        serializer: AbstractSerializer,
+        compressor: Optional[AbstractCompressor] = None,
+    ):
+        self._name: str = name
+        self.worker_name: str = worker_name
+        self.serializer: AbstractSerializer = serializer
+        self.compressor: Optional[AbstractCompressor] = compressor
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def projection(self, light: bool) -> List[str]:
+        """The trailing arguments of a `pop` or `peek` command. Light jobs are
+        fetched without their history, dependents and dependencies."""
+        return ["light"] if light else []
+
+    def class_string(self, klass: Union[str, Type]) -> str:
+        """Return a string representative of the class"""
+        if isinstance(klass, str):
+            return klass
+        return klass.__module__ + "." + klass.__name__
+
+    def _put_command(
+        self,
+        command: str,
+        klass: Union[str, Type],
+        data: str,
+        priority: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        delay: Optional[int] = None,
+        retries: Optional[int] = None,
+        jid: Optional[str] = None,
+        depends: Optional[List[str]] = None,
+        throttles: Optional[List[str]] = None,
+    ) -> List[Any]:
+        """The arguments of a `put` or `requeue` command"""
+        return [
+            command,
+            self.worker_name,
+            self.name,
+            jid or uuid.uuid4().hex,
+            self.class_string(klass),
+            compress_payload(data, self.compressor),
+            delay or 0,
+            "priority",
+            priority or 0,
+            "tags",
+            self.serializer.dumps(tags) if tags else EMPTY_JSON_LIST,
+            "retries",
+            retries or 5,
+            "depends",
+            self.serializer.dumps(depends) if depends else EMPTY_JSON_LIST,
+            "throttles",
+            self.serializer.dumps(throttles) if throttles else EMPTY_JSON_LIST,
+        ]
 
-class Queue(AbstractQueue):
+    def _recur_command(
+        self,
+        klass: Union[str, Type[AbstractJob]],
+        data: str,
+        interval: Optional[int] = None,
+        offset: Optional[int] = 0,
+        priority: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        retries: Optional[int] = None,
+        jid: Optional[str] = None,
+        throttles: Optional[List[str]] = None,
+    ) -> List[Any]:
+        """The arguments of a `recur` command"""
+        return [
+            "recur",
+            self.name,
+            jid or uuid.uuid4().hex,
+            self.class_string(klass),
+            compress_payload(data, self.compressor),
+            "interval",
+            interval,
+            offset,
+            "priority",
+            priority or 0,
+            "tags",
+            self.serializer.dumps(tags) if tags else EMPTY_JSON_LIST,
+            "retries",
+            retries or 5,
+            "throttles",
+            self.serializer.dumps(throttles) if throttles else EMPTY_JSON_LIST,
+        ]
+
+
+class Queue(BaseQueue, AbstractQueue):
     """The Queue class"""
 
     def __init__(self, name: str, client: AbstractClient, worker_name: str):
-        self._name: str = name
+        super().__init__(name, worker_name, client.serializer, client.compressor)
         self.client: AbstractClient = client
-        self.worker_name: str = worker_name
         self._jobs: Optional[AbstractQueueJobs] = None
 
     @property
     def counts(self) -> Dict[str, Any]:
-        response: Dict[str, Any] = json.loads(self.client("queues", self.name))
+        response: Dict[str, Any] = self.client.serializer.loads(
+            self.client("queues", self.name)
+        )
         return response
 
     @property
@@ -82,20 +252,10 @@ class Queue(AbstractQueue):
 
         return self._jobs
 
-    @property
-    def name(self) -> str:
-        return self._name
-
     @property
     def throttle(self) -> AbstractThrottle:
         return self.client.throttles[f"ql:q:{self.name}"]
 
-    def class_string(self, klass: Union[str, Type]) -> str:
-        """Return a string representative of the class"""
-        if isinstance(klass, str):
-            return klass
-        return klass.__module__ + "." + klass.__name__
-
     def pause(self) -> None:
         self.client("pause", self.name)
 
@@ -125,26 +285,40 @@ class Queue(AbstractQueue):
         the `valid after` argument should be in how many seconds the instance
         should be considered actionable."""
         response: str = self.client(
-            "put",
-            self.worker_name,
-            self.name,
-            jid or uuid.uuid4().hex,
-            self.class_string(klass),
-            data,
-            delay or 0,
-            "priority",
-            priority or 0,
-            "tags",
-            json.dumps(tags or []),
-            "retries",
-            retries or 5,
-            "depends",
-            json.dumps(depends or []),
-            "throttles",
-            json.dumps(throttles or []),
+            *self._put_command(
+                "put",
+                klass,
+                data,
+                priority=priority,
+                tags=tags,
+                delay=delay,
+                retries=retries,
+                jid=jid,
+                depends=depends,
+                throttles=throttles,
+            )
         )
         return response
 
+    def put_many(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[Union[str, ReqlessError]]:
+        """Put many jobs into this queue, pipelining the underlying `put`
+        commands in chunks of `chunk_size` so that each chunk costs a single
+        round trip. Each item of `jobs` is a dict of the keyword arguments
+        accepted by `put`. Returns, in order, the jid of each job or the
+        `ReqlessError` describing why that job could not be put."""
+        results: List[Union[str, ReqlessError]] = []
+        for chunk in chunks(jobs, chunk_size):
+            results.extend(
+                self.client.call_many(
+                    [self._put_command("put", **job) for job in chunk]
+                )
+            )
+        return results
+
     """Same function as above but check if the job already exists in the DB beforehand.
     You can re-queue for instance failed ones."""
 
@@ -161,23 +335,18 @@ class Queue(AbstractQueue):
         throttles: Optional[List[str]] = None,
     ) -> str:
         response: str = self.client(
-            "requeue",
-            self.worker_name,
-            self.name,
-            jid or uuid.uuid4().hex,
-            self.class_string(klass),
-            data,
-            delay or 0,
-            "priority",
-            priority or 0,
-            "tags",
-            json.dumps(tags or []),
-            "retries",
-            retries or 5,
-            "depends",
-            json.dumps(depends or []),
-            "throttles",
-            json.dumps(throttles or []),
+            *self._put_command(
+                "requeue",
+                klass,
+                data,
+                priority=priority,
+                tags=tags,
+                delay=delay,
+                retries=retries,
+                jid=jid,
+                depends=depends,
+                throttles=throttles,
+            )
         )
         return response
 
@@ -195,35 +364,51 @@ class Queue(AbstractQueue):
     ) -> str:
         """Place a recurring job in this queue"""
         response: str = self.client(
-            "recur",
-            self.name,
-            jid or uuid.uuid4().hex,
-            self.class_string(klass),
-            data,
-            "interval",
-            interval,
-            offset,
-            "priority",
-            priority or 0,
-            "tags",
-            json.dumps(tags or []),
-            "retries",
-            retries or 5,
-            "throttles",
-            json.dumps(throttles or []),
+            *self._recur_command(
+                klass,
+                data,
+                interval=interval,
+                offset=offset,
+                priority=priority,
+                tags=tags,
+                retries=retries,
+                jid=jid,
+                throttles=throttles,
+            )
         )
         return response
 
+    def recur_many(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> List[Union[str, ReqlessError]]:
+        """Like `put_many`, but for recurring jobs. Each item of `jobs` is a
+        dict of the keyword arguments accepted by `recur`."""
+        results: List[Union[str, ReqlessError]] = []
+        for chunk in chunks(jobs, chunk_size):
+            results.extend(
+                self.client.call_many([self._recur_command(**job) for job in chunk])
+            )
+        return results
+
     def pop(
-        self, count: Optional[int] = None
+        self, count: Optional[int] = None, light: bool = False
     ) -> Union[AbstractJob, List[AbstractJob], None]:
         """Passing in the queue from which to pull items, the current time,
         when the locks for these returned items should expire, and the number
-        of items to be popped off."""
+        of items to be popped off. Light jobs are fetched without their
+        history, dependents and dependencies, which then appear empty."""
         results: List[AbstractJob] = [
             Job(self.client, **job)
-            for job in json.loads(
-                self.client("pop", self.name, self.worker_name, count or 1)
+            for job in self.client.serializer.loads(
+                self.client(
+                    "pop",
+                    self.name,
+                    self.worker_name,
+                    count or 1,
+                    *self.projection(light),
+                )
             )
         ]
         if count is None:
@@ -231,7 +416,10 @@ class Queue(AbstractQueue):
         return results
 
     def peek(
-        self, offset: Optional[int] = None, count: Optional[int] = None
+        self,
+        offset: Optional[int] = None,
+        count: Optional[int] = None,
+        light: bool = False,
     ) -> Union[AbstractJob, List[AbstractJob], None]:
         """Similar to the pop command, except that it merely peeks at the next
         items"""
@@ -239,7 +427,9 @@ class Queue(AbstractQueue):
         _count = count or 1
         results: List[AbstractJob] = [
             Job(self.client, **rec)
-            for rec in json.loads(self.client("peek", self.name, _offset, _count))
+            for rec in self.client.serializer.loads(
+                self.client("peek", self.name, _offset, _count, *self.projection(light))
+            )
         ]
         if count is None:
             return (len(results) and results[0]) or None
@@ -263,7 +453,7 @@ class Queue(AbstractQueue):
         resolution for the first day, the hour resolution for the first 3
         days, and then at the day resolution from there on out. The
         `histogram` key is a list of those values."""
-        response: Dict = json.loads(
+        response: Dict = self.client.serializer.loads(
             self.client("stats", self.name, date or repr(time.time()))
         )
         return response
@@ -1,3 +1,4 @@
+from reqless.queue_resolvers.known_queue_names import KnownQueueNames
 from reqless.queue_resolvers.qmore_dynamic_mapping_queue_identifiers_transformer import (  # noqa: E501
     QmoreDynamicMappingQueueIdentifiersTransformer,
 )
@@ -10,6 +11,7 @@ from reqless.queue_resolvers.transforming_queue_resolver import (
 
 
 __all__ = [
+    "KnownQueueNames",
     "QmoreDynamicMappingQueueIdentifiersTransformer",
     "QmoreDynamicPriorityQueueIdentifiersTransformer",
     "TransformingQueueResolver",
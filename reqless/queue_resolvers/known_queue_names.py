@@ -0,0 +1,97 @@
+import threading
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from reqless.abstract import AbstractClient
+
+
+# How far back to look for queues when refreshing, to allow for queues first
+# seen by clients whose clocks are behind
+CLOCK_SKEW_SECONDS = 60.0
+
+
+class KnownQueueNames:
+    """The names of all the queues that exist, cached for a while.
+
+    Queues are never removed, so once the cache expires, only the queues first
+    seen since the last refresh are fetched. If that doesn't account for every
+    queue, all of them are fetched again."""
+
+    _shared: "weakref.WeakKeyDictionary[AbstractClient, KnownQueueNames]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _shared_lock: threading.Lock = threading.Lock()
+
+    def __init__(
+        self,
+        client: AbstractClient,
+        refresh_frequency_milliseconds: Optional[int] = None,
+    ):
+        self.reqless_client: AbstractClient = client
+        self._ttl_time_delta: timedelta = timedelta(
+            milliseconds=(
+                1000
+                if refresh_frequency_milliseconds is None
+                else refresh_frequency_milliseconds
+            ),
+        )
+        self._expires_at: datetime = datetime.now(tz=timezone.utc)
+        self._first_seen: Dict[str, float] = {}
+        self._names: Optional[List[str]] = None
+        # Bumped whenever the names change
+        self.generation: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def for_client(cls, client: AbstractClient) -> "KnownQueueNames":
+        """The known queue names shared by everything using this client"""
+        with cls._shared_lock:
+            known_queue_names = cls._shared.get(client)
+            if known_queue_names is None:
+                known_queue_names = cls._shared[client] = cls(client)
+            return known_queue_names
+
+    def get(self) -> List[str]:
+        """The names of all the queues, in the order they were first seen"""
+        with self._lock:
+            if self._names is None or self._expires_at <= datetime.now(tz=timezone.utc):
+                self._refresh()
+                self._expires_at = datetime.now(tz=timezone.utc) + self._ttl_time_delta
+            assert self._names is not None
+            return self._names
+
+    def invalidate(self) -> None:
+        """Forget all the known queue names, so the next read fetches them all"""
+        with self._lock:
+            self._first_seen = {}
+            self._names = None
+            self.generation += 1
+
+    def _refresh(self) -> None:
+        since: Optional[float] = None
+        if self._first_seen:
+            since = max(self._first_seen.values()) - CLOCK_SKEW_SECONDS
+        count = self._fetch(since)
+        if since is not None and count != len(self._first_seen):
+            self._first_seen = {}
+            self._fetch(None)
+        names = sorted(
+            self._first_seen, key=lambda name: (self._first_seen[name], name)
+        )
+        # Only replaced when they change, so that what's derived from them can
+        # be kept until then
+        if names != self._names:
+            self._names = names
+            self.generation += 1
+
+    def _fetch(self, since: Optional[float]) -> int:
+        args = [] if since is None else [repr(since)]
+        response = self.reqless_client.serializer.loads(
+            self.reqless_client("queues.names", *args)
+        )
+        flattened = list(response["queues"] or [])
+        for name, first_seen in zip(flattened[::2], flattened[1::2]):
+            self._first_seen[name] = float(first_seen)
+        count: int = response["count"]
+        return count
@@ -1,10 +1,11 @@
-import re
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, List, Optional
 
 from reqless import Client
 from reqless.abstract import AbstractQueueIdentifiersTransformer
 from reqless.qmore.client import QmoreClient
+from reqless.queue_resolvers.known_queue_names import KnownQueueNames
+from reqless.queue_resolvers.queue_name_matcher import QueueNameMatcher
 
 
 class QmoreDynamicMappingQueueIdentifiersTransformer(
@@ -14,11 +15,16 @@ class QmoreDynamicMappingQueueIdentifiersTransformer(
         self,
         client: Client,
         dynamic_queue_mapping_refresh_frequency_milliseconds: Optional[int] = None,
+        known_queue_names: Optional[KnownQueueNames] = None,
     ):
         self.reqless_client: Client = client
         self.qmore_client: QmoreClient = QmoreClient(
             database=self.reqless_client.database
         )
+        # Shared with every other transformer using the same client by default
+        self.known_queue_names: KnownQueueNames = (
+            known_queue_names or KnownQueueNames.for_client(client)
+        )
 
         self._dynamic_queue_mapping: Optional[Dict[str, List[str]]] = None
         self._dynamic_queue_mapping_ttl_time_delta: timedelta = timedelta(
@@ -27,15 +33,19 @@ class QmoreDynamicMappingQueueIdentifiersTransformer(
             ),
         )
         self._dynamic_queue_mapping_expires_at: datetime = datetime.now(tz=timezone.utc)
+        # Bumped whenever the dynamic queue mapping changes
+        self._dynamic_queue_mapping_generation: int = 0
+        self._queue_name_matcher: Optional[QueueNameMatcher] = None
 
     def _get_dynamic_queue_mapping(self) -> Dict[str, List[str]]:
         if (
             self._dynamic_queue_mapping is None
             or self._dynamic_queue_mapping_expires_at <= datetime.now(tz=timezone.utc)
         ):
-            self._dynamic_queue_mapping = (
-                self.qmore_client.get_queue_identifier_patterns()
-            )
+            dynamic_queue_mapping = self.qmore_client.get_queue_identifier_patterns()
+            if dynamic_queue_mapping != self._dynamic_queue_mapping:
+                self._dynamic_queue_mapping = dynamic_queue_mapping
+                self._dynamic_queue_mapping_generation += 1
             self._dynamic_queue_mapping_expires_at = (
                 datetime.now(tz=timezone.utc)
                 + self._dynamic_queue_mapping_ttl_time_delta
@@ -47,6 +57,7 @@ class QmoreDynamicMappingQueueIdentifiersTransformer(
         dynamic_queue_mapping: Dict[str, List[str]],
         known_queue_names: List[str],
         patterns: List[str],
+        queue_name_matcher: Optional[QueueNameMatcher] = None,
     ) -> List[str]:
         # First, resolve dynamic identifiers to patterns, negating where appropriate
         expanded_patterns: List[str] = []
@@ -66,36 +77,54 @@ class QmoreDynamicMappingQueueIdentifiersTransformer(
             else:
                 expanded_patterns.append(queue_pattern)
 
-        # Next, resolve patterns to actual queue names
-        matched_queues: List[str] = []
+        # Next, resolve patterns to actual queue names. The matched queues are
+        # kept as the keys of a dict, which is an ordered set
+        matcher = queue_name_matcher or QueueNameMatcher(known_queue_names)
+        matched_queues: Dict[str, None] = {}
         for pattern in expanded_patterns:
             is_static_pattern = "!" not in pattern and "*" not in pattern
             # Always include static queue names even if the queue doesn't exist
-            if is_static_pattern and pattern not in matched_queues:
-                matched_queues.append(pattern)
+            if is_static_pattern:
+                matched_queues.setdefault(pattern)
                 continue
 
             negated = pattern.startswith("!")
             pattern_without_negate = pattern[1:] if negated else pattern
-            regex = re.compile(pattern_without_negate.replace("*", ".*"))
-            for known_queue_name in known_queue_names:
-                if regex.fullmatch(known_queue_name):
-                    if negated:
-                        matched_queues.remove(known_queue_name)
-                    else:
-                        # Only add queue name if it hasn't been added already
-                        # In this way, a given match will maintain its earliest
-                        # position unless fully removed
-                        if known_queue_name not in matched_queues:
-                            matched_queues.append(known_queue_name)
+            for known_queue_name in matcher.match(pattern_without_negate):
+                if negated:
+                    matched_queues.pop(known_queue_name, None)
+                else:
+                    # Only add queue name if it hasn't been added already
+                    # In this way, a given match will maintain its earliest
+                    # position unless fully removed
+                    matched_queues.setdefault(known_queue_name)
+
+        return list(matched_queues)
 
-        return matched_queues
+    def _get_queue_name_matcher(self) -> QueueNameMatcher:
+        # Known queue names are only replaced when they change, so the matcher
+        # is only rebuilt when there's something new to match
+        known_queue_names = self.known_queue_names.get()
+        if (
+            self._queue_name_matcher is None
+            or self._queue_name_matcher.known_queue_names is not known_queue_names
+        ):
+            self._queue_name_matcher = QueueNameMatcher(known_queue_names)
+        return self._queue_name_matcher
+
+    def generation(self) -> Optional[Hashable]:
+        self._get_dynamic_queue_mapping()
+        self.known_queue_names.get()
+        return (
+            self._dynamic_queue_mapping_generation,
+            self.known_queue_names.generation,
+        )
 
     def transform(self, queue_identifiers: List[str]) -> List[str]:
+        matcher = self._get_queue_name_matcher()
         return QmoreDynamicMappingQueueIdentifiersTransformer.resolve_queue_names(
             dynamic_queue_mapping=self._get_dynamic_queue_mapping(),
-            known_queue_names=[
-                count["name"] for count in self.reqless_client.queues.counts
-            ],
+            known_queue_names=matcher.known_queue_names,
             patterns=queue_identifiers,
+            queue_name_matcher=matcher,
         )
@@ -1,11 +1,16 @@
-import re
 from datetime import datetime, timedelta, timezone
 from random import SystemRandom
-from typing import List, Optional
+from typing import Dict, Hashable, List, Optional, Tuple
 
 from reqless import Client
 from reqless.abstract import AbstractQueueIdentifiersTransformer
 from reqless.qmore.client import QmoreClient, QueuePriorityPattern
+from reqless.queue_resolvers.queue_name_matcher import QueueNameMatcher
+
+
+# Groups of queues in priority order, each with whether its queues should be
+# distributed fairly
+QueueGroups = List[Tuple[List[str], bool]]
 
 
 class QmoreDynamicPriorityQueueIdentifiersTransformer(
@@ -30,6 +35,10 @@ class QmoreDynamicPriorityQueueIdentifiersTransformer(
         self._dynamic_queue_priorities_expires_at: datetime = datetime.now(
             tz=timezone.utc
         )
+        # Bumped whenever the dynamic queue priorities change
+        self._dynamic_queue_priorities_generation: int = 0
+        # The queue identifiers last grouped, when, and their groups
+        self._queue_groups: Optional[Tuple[List[str], int, QueueGroups]] = None
 
     def _get_dynamic_queue_priorities(self) -> List[QueuePriorityPattern]:
         if (
@@ -37,9 +46,10 @@ class QmoreDynamicPriorityQueueIdentifiersTransformer(
             or self._dynamic_queue_priorities_expires_at
             <= datetime.now(tz=timezone.utc)
         ):
-            self._dynamic_queue_priorities = (
-                self.qmore_client.get_queue_priority_patterns()
-            )
+            dynamic_queue_priorities = self.qmore_client.get_queue_priority_patterns()
+            if dynamic_queue_priorities != self._dynamic_queue_priorities:
+                self._dynamic_queue_priorities = dynamic_queue_priorities
+                self._dynamic_queue_priorities_generation += 1
             self._dynamic_queue_priorities_expires_at = (
                 datetime.now(tz=timezone.utc)
                 + self._dynamic_queue_priorities_ttl_time_delta
@@ -51,9 +61,23 @@ class QmoreDynamicPriorityQueueIdentifiersTransformer(
         queue_identifiers: List[str],
         queue_priority_patterns: List[QueuePriorityPattern],
     ) -> List[str]:
-        rand = SystemRandom()
-        prioritized_queue_groups: List[List[str]] = []
-        _queue_identifiers = list(queue_identifiers)
+        return QmoreDynamicPriorityQueueIdentifiersTransformer.distribute_queues(
+            QmoreDynamicPriorityQueueIdentifiersTransformer.group_queues(
+                queue_identifiers=queue_identifiers,
+                queue_priority_patterns=queue_priority_patterns,
+            )
+        )
+
+    @staticmethod
+    def group_queues(
+        queue_identifiers: List[str],
+        queue_priority_patterns: List[QueuePriorityPattern],
+    ) -> QueueGroups:
+        prioritized_queue_groups: QueueGroups = []
+        matcher = QueueNameMatcher(queue_identifiers)
+        # The queues not yet in a priority group, as the keys of a dict, which
+        # is an ordered set
+        remaining_queues: Dict[str, None] = dict.fromkeys(queue_identifiers)
 
         default_index = -1
         default_should_distribute_fairly = False
@@ -66,52 +90,73 @@ class QmoreDynamicPriorityQueueIdentifiersTransformer(
                 )
                 continue
 
-            priority_group_queues: List[str] = []
+            matched_queues: Dict[str, None] = {}
             for pattern in queue_priority_pattern.patterns:
                 negated = pattern.startswith("!")
                 _pattern = pattern[1:] if negated else pattern
-                regex = re.compile(_pattern.replace("*", ".*"))
-
-                if negated:
-                    queues_to_remove = []
-                    for queue in priority_group_queues:
-                        if regex.fullmatch(queue):
-                            queues_to_remove.append(queue)
-                    for queue in queues_to_remove:
-                        priority_group_queues.remove(queue)
-                else:
-                    for queue in _queue_identifiers:
-                        if (
-                            regex.fullmatch(queue)
-                            and queue not in priority_group_queues
-                        ):
-                            priority_group_queues.append(queue)
 
-            # Remove matched queues from remaining queue identifiers
-            for queue_identifier in priority_group_queues:
-                _queue_identifiers.remove(queue_identifier)
+                for queue in matcher.match(_pattern):
+                    if negated:
+                        matched_queues.pop(queue, None)
+                    elif queue in remaining_queues:
+                        matched_queues.setdefault(queue)
 
-            if queue_priority_pattern.should_distribute_fairly:
-                rand.shuffle(priority_group_queues)
+            # Remove matched queues from remaining queue identifiers
+            for queue_identifier in matched_queues:
+                del remaining_queues[queue_identifier]
 
-            prioritized_queue_groups.append(priority_group_queues)
+            prioritized_queue_groups.append(
+                (
+                    list(matched_queues),
+                    queue_priority_pattern.should_distribute_fairly,
+                )
+            )
 
         # insert remaining queues at the position of the default item (or at the end)
-        if default_should_distribute_fairly:
-            rand.shuffle(_queue_identifiers)
-
         _default_index = (
             default_index if default_index != -1 else len(prioritized_queue_groups)
         )
-        prioritized_queue_groups.insert(_default_index, _queue_identifiers)
+        prioritized_queue_groups.insert(
+            _default_index,
+            (list(remaining_queues), default_should_distribute_fairly),
+        )
+        return prioritized_queue_groups
 
+    @staticmethod
+    def distribute_queues(queue_groups: QueueGroups) -> List[str]:
+        rand = SystemRandom()
         prioritized_queues = []
-        for prioritized_queue_group in prioritized_queue_groups:
-            prioritized_queues.extend(prioritized_queue_group)
+        for queue_group, should_distribute_fairly in queue_groups:
+            if should_distribute_fairly:
+                queue_group = list(queue_group)
+                rand.shuffle(queue_group)
+            prioritized_queues.extend(queue_group)
         return prioritized_queues
 
+    def generation(self) -> Optional[Hashable]:
+        # Fairly distributed queues are shuffled anew every time
+        queue_priority_patterns = self._get_dynamic_queue_priorities()
+        if any(pattern.should_distribute_fairly for pattern in queue_priority_patterns):
+            return None
+        return self._dynamic_queue_priorities_generation
+
     def transform(self, queue_identifiers: List[str]) -> List[str]:
-        return QmoreDynamicPriorityQueueIdentifiersTransformer.prioritize_queues(
-            queue_identifiers=queue_identifiers,
-            queue_priority_patterns=self._get_dynamic_queue_priorities(),
+        queue_priority_patterns = self._get_dynamic_queue_priorities()
+        # Grouping only depends on the identifiers and the priorities, so the
+        # groups are kept until either changes, and are just shuffled again
+        if (
+            self._queue_groups is None
+            or self._queue_groups[0] is not queue_identifiers
+            or self._queue_groups[1] != self._dynamic_queue_priorities_generation
+        ):
+            self._queue_groups = (
+                queue_identifiers,
+                self._dynamic_queue_priorities_generation,
+                QmoreDynamicPriorityQueueIdentifiersTransformer.group_queues(
+                    queue_identifiers=queue_identifiers,
+                    queue_priority_patterns=queue_priority_patterns,
+                ),
+            )
+        return QmoreDynamicPriorityQueueIdentifiersTransformer.distribute_queues(
+            self._queue_groups[2]
         )
@@ -0,0 +1,61 @@
+import bisect
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern
+
+
+# Patterns without any of these (besides `*`) are plain globs, and can be
+# matched without a regex
+REGEX_CHARACTERS = frozenset(".^$+?{}[]()|\\")
+
+
+@lru_cache(maxsize=4096)
+def compile_pattern(pattern: str) -> Pattern[str]:
+    """The regex for a queue name pattern, in which `*` matches anything"""
+    return re.compile(pattern.replace("*", ".*"))
+
+
+class QueueNameMatcher:
+    """Matches queue name patterns against a list of known queue names.
+
+    The names matching each pattern are computed once and remembered, so a
+    matcher should be kept for as long as the known queue names don't change.
+    Patterns that are just a prefix followed by `*` are looked up in a sorted
+    index of the names, rather than tried against every one of them."""
+
+    def __init__(self, known_queue_names: List[str]):
+        self.known_queue_names: List[str] = known_queue_names
+        self._positions: Dict[str, int] = {}
+        for position, name in enumerate(known_queue_names):
+            self._positions.setdefault(name, position)
+        self._sorted_names: Optional[List[str]] = None
+        self._matches: Dict[str, List[str]] = {}
+
+    def match(self, pattern: str) -> List[str]:
+        """The known queue names matching a pattern, in their original order"""
+        matches = self._matches.get(pattern)
+        if matches is None:
+            matches = self._matches[pattern] = self._match(pattern)
+        return matches
+
+    def _match(self, pattern: str) -> List[str]:
+        if REGEX_CHARACTERS.isdisjoint(pattern):
+            if pattern == "*":
+                return list(self._positions)
+            if "*" not in pattern:
+                return [pattern] if pattern in self._positions else []
+            if pattern.index("*") == len(pattern) - 1:
+                return self._match_prefix(pattern[:-1])
+        regex = compile_pattern(pattern)
+        return [name for name in self._positions if regex.fullmatch(name)]
+
+    def _match_prefix(self, prefix: str) -> List[str]:
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._positions)
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        end = start
+        while end < len(self._sorted_names) and self._sorted_names[end].startswith(
+            prefix
+        ):
+            end += 1
+        return sorted(self._sorted_names[start:end], key=self._positions.__getitem__)
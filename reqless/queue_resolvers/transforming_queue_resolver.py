@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Hashable, List, Optional, Tuple
 
 from reqless.abstract import AbstractQueueIdentifiersTransformer, AbstractQueueResolver
 
@@ -13,13 +13,37 @@ class TransformingQueueResolver(AbstractQueueResolver):
         self._transformers: Optional[List[AbstractQueueIdentifiersTransformer]] = (
             transformers
         )
+        # For each transformer, what it was last given, its generation at the
+        # time, and what it returned
+        self._transformed: List[Optional[Tuple[List[str], Hashable, List[str]]]] = [
+            None for _ in transformers or []
+        ]
 
     def resolve(self) -> List[str]:
         if not self._transformers:
             return self._queue_identifiers
 
         resolved_identifiers = self._queue_identifiers
-        for transformer in self._transformers:
-            resolved_identifiers = transformer.transform(resolved_identifiers)
+        for index, transformer in enumerate(self._transformers):
+            # A transformation is reused as long as the transformer is given the
+            # very same identifiers, and its generation hasn't changed
+            generation = transformer.generation()
+            transformed = self._transformed[index]
+            if (
+                generation is not None
+                and transformed is not None
+                and transformed[0] is resolved_identifiers
+                and transformed[1] == generation
+            ):
+                resolved_identifiers = transformed[2]
+                continue
+
+            transformed_identifiers = transformer.transform(resolved_identifiers)
+            self._transformed[index] = (
+                resolved_identifiers,
+                generation,
+                transformed_identifiers,
+            )
+            resolved_identifiers = transformed_identifiers
 
         return resolved_identifiers
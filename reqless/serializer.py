@@ -0,0 +1,70 @@
+"""Serializers for the JSON exchanged with the Lua scripts"""
+
+import json
+from typing import Any, Union
+
+from reqless.abstract import AbstractSerializer
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+class JsonSerializer(AbstractSerializer):
+    """Serializes with the standard library's json module"""
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(AbstractSerializer):
+    """Serializes with orjson, which must be installed"""
+
+    def dumps(self, value: Any) -> str:
+        return orjson.dumps(value).decode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecSerializer(AbstractSerializer):
+    """Serializes with msgspec, which must be installed"""
+
+    def __init__(self) -> None:
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def dumps(self, value: Any) -> str:
+        result: bytes = self._encoder.encode(value)
+        return result.decode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+
+def default_serializer() -> AbstractSerializer:
+    """The fastest serializer available: orjson or msgspec if installed, and
+    the standard library's json module otherwise"""
+    if orjson is not None:
+        return OrjsonSerializer()
+    if msgspec is not None:  # pragma: no cover
+        return MsgspecSerializer()
+    return JsonSerializer()  # pragma: no cover
+
+
+__all__ = [
+    "JsonSerializer",
+    "MsgspecSerializer",
+    "OrjsonSerializer",
+    "default_serializer",
+]
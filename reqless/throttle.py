@@ -1,4 +1,3 @@
-import json
 from typing import Any, Dict, List, Optional
 
 from reqless.abstract import AbstractClient, AbstractThrottle
@@ -22,7 +21,9 @@ class Throttle(AbstractThrottle):
 
     def maximum(self) -> int:
         json_state = self.client("throttle.get", self.name)
-        state: Dict[str, Any] = json.loads(json_state) if json_state else {}
+        state: Dict[str, Any] = (
+            self.client.serializer.loads(json_state) if json_state else {}
+        )
         maximum: int = state.get("maximum", 0)
         return maximum
 
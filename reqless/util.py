@@ -1,6 +1,11 @@
 """Some utility functions"""
 
-from typing import Type
+import sys
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Type, TypeVar
+
+
+T = TypeVar("T")
 
 
 def import_class(klass: str) -> Type:
@@ -10,3 +15,33 @@ def import_class(klass: str) -> Type:
         mod = getattr(mod, segment)
     cls: Type = getattr(mod, klass.rpartition(".")[2])
     return cls
+
+
+def chunks(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Lazily split the provided items into lists of at most size items"""
+    if size < 1:
+        raise ValueError("Chunk size must be positive, got %s" % size)
+    iterator = iter(items)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def intern_strings(items: List[str]) -> List[str]:
+    """Intern the provided strings in place, so that those repeated across
+    many jobs, like tags and queue names, are only kept once"""
+    for index, item in enumerate(items):
+        items[index] = sys.intern(item)
+    return items
+
+
+def intern_history(history: List[Dict]) -> List[Dict]:
+    """Intern the strings in the provided history entries in place. Most of
+    them, like what happened and which worker it happened on, are repeated
+    across many jobs"""
+    for entry in history:
+        for key, value in entry.items():
+            if isinstance(value, str):
+                entry[key] = sys.intern(value)
+    return history
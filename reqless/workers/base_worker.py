@@ -1,9 +1,21 @@
 """Our base worker"""
 
-import json
 import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Any, Dict, Generator, Iterable, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 from reqless import exceptions, logger
 from reqless.abstract import (
@@ -14,6 +26,14 @@ from reqless.abstract import (
 )
 from reqless.listener import Listener
 from reqless.queue_resolvers import TransformingQueueResolver
+from reqless.workers.heartbeater import Heartbeater
+from reqless.workers.prefetch import PrefetchBuffer
+from reqless.workers.util import rss_mb
+
+
+# Jobs put or advanced into a queue are announced on its own channel, so that
+# idle workers can wake early, hearing only about the queues they pop from
+WAKE_CHANNEL_PREFIX = "ql:wake:"
 
 
 class BaseWorker:
@@ -59,23 +79,103 @@ class BaseWorker:
         self.interval: float = interval or 60.0
         # To mark whether or not we should shutdown after work is done
         self.shutdown: bool = False
+        # The queue names we last popped from, and an event set when work lands
+        # in one of them so that we needn't wait out the polling interval
+        self.queue_names: List[str] = []
+        self._queue_name_set: FrozenSet[str] = frozenset()
+        self._listener: Optional[Listener] = None
+        # Where the next pop starts in our queues, so that each gets its turn
+        self._queue_offset: int = 0
+        self._wakeup: threading.Event = threading.Event()
+        # If configured, completing a job pops the next ones in the same call,
+        # and those jobs are handed out before we pop any more. They may be
+        # discarded from another thread, such as the listener's
+        self.pop_next: int = kwargs.get("pop_next", 0)
+        self.popped: Deque[AbstractJob] = deque()
+        self._popped_lock: threading.Lock = threading.Lock()
+        # If configured, in-flight jobs are heartbeated in the background. Jobs
+        # popped ahead of time are heartbeated until they're handed out,
+        # whether or not in-flight jobs are
+        heartbeat_fraction: Optional[float] = kwargs.get("heartbeat_fraction")
+        self.heartbeat_in_flight: bool = heartbeat_fraction is not None
+        self.heartbeater: Optional[Heartbeater] = (
+            self.create_heartbeater(heartbeat_fraction or 0.5)
+            if self.heartbeat_in_flight or self.pop_next or kwargs.get("prefetch")
+            else None
+        )
+        # An optional local buffer of popped jobs, to save a round trip per job
+        self.prefetch: Optional[PrefetchBuffer] = (
+            PrefetchBuffer(
+                client,
+                counts=kwargs.get("prefetch_counts"),
+                max_count=kwargs.get("prefetch_max", 50),
+                window=kwargs.get("prefetch_window", 1.0),
+                heartbeater=self.heartbeater,
+            )
+            if kwargs.get("prefetch")
+            else None
+        )
+        # If configured, the worker retires once it has processed so many
+        # jobs, grown so large or lived so long, to be replaced by a fresh one.
+        # Whoever replaces it is told as soon as it decides to, through
+        # `on_retire`, so that the replacement can start while it winds down
+        self.max_jobs: Optional[int] = kwargs.get("max_jobs_per_child")
+        self.max_rss_mb: Optional[float] = kwargs.get("max_rss_mb")
+        self.max_age: Optional[float] = kwargs.get("max_child_age_s")
+        self.on_retire: Optional[Callable[[str], None]] = kwargs.get("on_retire")
+        # Whether we're idle for want of jobs, and who to tell when that changes
+        self.idle: bool = False
+        self.on_idle: Optional[Callable[[bool], None]] = kwargs.get("on_idle")
+        self.started_at: float = time.time()
+        self.processed: int = 0
 
     @property
     def queues(self) -> Iterable[AbstractQueue]:
         for queue_name in self.queue_resolver.resolve():
             yield self.client.queues[queue_name]
 
+    def resolve_queue_names(self) -> List[str]:
+        """Resolve the names of the queues to pop from, in order"""
+        self.queue_names = list(self.queue_resolver.resolve())
+        queue_name_set = frozenset(self.queue_names)
+        if queue_name_set != self._queue_name_set:
+            self._queue_name_set = queue_name_set
+            listener = self._listener
+            if listener is not None:
+                listener.resubscribe(self.channels())
+        return self.queue_names
+
+    def rotated_queue_names(self) -> List[str]:
+        """Resolve the names of the queues to pop from, starting after the one
+        we last got a job from. Popping from them in this order, one job at a
+        time, takes from each queue with work in turn, so that a busy queue
+        can't starve those after it."""
+        queue_names = self.resolve_queue_names()
+        if not queue_names:
+            return queue_names
+        offset = self._queue_offset % len(queue_names)
+        return queue_names[offset:] + queue_names[:offset]
+
+    def took_from(self, queue_name: str) -> None:
+        """Note that we got a job from the named queue, so that the next pop
+        starts with the queue after it"""
+        if queue_name in self._queue_name_set:
+            self._queue_offset = self.queue_names.index(queue_name) + 1
+
     def resumable(self) -> List[AbstractJob]:
         """Find all the jobs that we'd previously been working on"""
         # First, find the jids of all the jobs registered to this client.
         # Then, get the corresponding job objects
         jids = self.client.workers[self.client.worker_name]["jobs"]
-        jobs = self.client.jobs.get(*jids)
 
         # We'll filter out all the jobs that aren't in any of the queues
         # we're working on.
         queue_names = set(self.queue_resolver.resolve())
-        return [job for job in jobs if job.queue_name in queue_names]
+        return [
+            job
+            for job in self.client.jobs.iter_get(jids)
+            if job.queue_name in queue_names
+        ]
 
     def jobs(
         self,
@@ -89,40 +189,191 @@ class BaseWorker:
                     yield job
             except exceptions.LostLockError:
                 logger.exception("Cannot resume %s" % job.jid)
+        # Jobs popped for us when completing earlier ones are handed out
+        # first. Otherwise, we pop from all of our queues in a single round
+        # trip, taking from each queue with work in turn. With a prefetch
+        # buffer, we hand out jobs from the buffer instead. Any jobs we're still
+        # holding when we stop are handed back to their queues
+        try:
+            while True:
+                next_job = self.take_popped()
+                if next_job is not None:
+                    self.took_from(next_job.queue_name)
+                    yield next_job
+                elif self.prefetch is None:
+                    popped_jobs = self.client.pop_from(self.rotated_queue_names())
+                    if popped_jobs:
+                        self.took_from(popped_jobs[0].queue_name)
+                    yield popped_jobs[0] if popped_jobs else None
+                else:
+                    prefetched = self.prefetch.pop(self.rotated_queue_names())
+                    if prefetched is not None:
+                        self.took_from(prefetched.queue_name)
+                    yield prefetched
+        finally:
+            self.release()
+
+    def release(self) -> None:
+        """Move any jobs we've popped but not started back to their queues"""
+        if self.prefetch is not None:
+            self.prefetch.release()
         while True:
-            seen = False
-            for queue in self.queues:
-                popped_job = queue.pop()
-                if popped_job:
-                    assert not isinstance(popped_job, List)
-                    seen = True
-                    yield popped_job
-            if not seen:
-                yield None
+            job = self.take_popped()
+            if job is None:
+                break
+            try:
+                job.move(job.queue_name)
+            except exceptions.ReqlessError:
+                logger.exception("Unable to release %s" % job.jid)
+
+    def create_heartbeater(self, fraction: float) -> Heartbeater:
+        """Create the heartbeater for jobs being processed by this worker"""
+        return Heartbeater(self.client, fraction=fraction, on_lost=self.lost)
+
+    @contextmanager
+    def heartbeating(self) -> Generator[None, None, None]:
+        """Heartbeat in-flight jobs in the background, if configured to"""
+        if self.heartbeater is None:
+            yield
+            return
+        self.heartbeater.start()
+        try:
+            yield
+        finally:
+            self.heartbeater.stop()
+
+    @contextmanager
+    def processing(self, job: AbstractJob) -> Generator[None, None, None]:
+        """Keep the provided job heartbeated while it's being processed, and
+        collect any jobs popped when it's completed. With a prefetch buffer, how
+        long it took is noted, so that the buffer can size its batches."""
+        if self.pop_next:
+            job.pop_on_complete(self.pop_next, self.rotated_queue_names())
+        if self.heartbeater is not None and self.heartbeat_in_flight:
+            self.heartbeater.add(job)
+        started = time.time()
+        try:
+            yield
+        finally:
+            if self.prefetch is not None:
+                self.prefetch.record(job.queue_name, time.time() - started)
+            if self.heartbeater is not None and self.heartbeat_in_flight:
+                self.heartbeater.remove(job.jid)
+            with self._popped_lock:
+                self.popped.extend(job.popped)
+            if self.heartbeater is not None:
+                for popped in job.popped:
+                    self.heartbeater.add(popped)
+
+    def take_popped(self) -> Optional[AbstractJob]:
+        """Take the next job popped for us when completing an earlier one, if
+        any, and stop heartbeating it"""
+        with self._popped_lock:
+            job = self.popped.popleft() if self.popped else None
+        if job is not None and self.heartbeater is not None:
+            self.heartbeater.remove(job.jid)
+        return job
 
     @contextmanager
     def listener(self) -> Generator[None, None, None]:
         """Listen for pubsub messages relevant to this worker in a thread"""
-        channels = ["ql:w:" + self.client.worker_name]
-        listener = Listener(self.client.database, channels)
+        self.resolve_queue_names()
+        listener = Listener(self.client.database, self.channels())
+        # Subscribe up front, so that we can unlisten however soon we stop
+        listener.subscribe()
+        self._listener = listener
         thread = threading.Thread(target=self.listen, args=(listener,))
         thread.start()
         try:
             yield
         finally:
+            self._listener = None
             listener.unlisten()
             thread.join()
 
+    def channels(self) -> List[str]:
+        """The channels to listen to: our own, and those of our queues"""
+        return ["ql:w:" + self.client.worker_name] + [
+            WAKE_CHANNEL_PREFIX + queue_name for queue_name in self.queue_names
+        ]
+
     def listen(self, listener: Listener) -> None:
         """Listen for events that affect our ownership of a job"""
         for message in listener.listen():
             try:
-                data = json.loads(message["data"])
+                if message["channel"].startswith(WAKE_CHANNEL_PREFIX):
+                    self.wake()
+                    continue
+                data = self.client.serializer.loads(message["data"])
                 if data["event"] in ("canceled", "lock_lost", "put"):
-                    self.halt_job_processing(data["jid"])
+                    self.lost(data["jid"])
             except Exception:
                 logger.exception("Pubsub error")
 
+    def lost(self, jid: str) -> None:
+        """Give up on a job whose lock we no longer hold, whether we've
+        started it or not"""
+        self.discard(jid)
+        self.halt_job_processing(jid)
+
+    def discard(self, jid: str) -> None:
+        """Drop a job we've popped but not started, having lost its lock"""
+        if self.prefetch is not None:
+            self.prefetch.discard(jid)
+        with self._popped_lock:
+            for job in list(self.popped):
+                if job.jid == jid:
+                    self.popped.remove(job)
+        if self.heartbeater is not None:
+            self.heartbeater.remove(jid)
+
+    def wake(self) -> None:
+        """Cut short any wait for work, since some may have arrived"""
+        self._wakeup.set()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for work to arrive in one of our
+        queues, returning whether or not we were woken early"""
+        woken = self._wakeup.wait(timeout)
+        self._wakeup.clear()
+        return woken
+
+    def retirement_reason(self) -> Optional[str]:
+        """Why this worker should retire, if it has reached any of its limits"""
+        if self.max_jobs is not None and self.processed >= self.max_jobs:
+            return "processed %i jobs" % self.processed
+        if self.max_age is not None:
+            age = time.time() - self.started_at
+            if age >= self.max_age:
+                return "lived for %is" % age
+        if self.max_rss_mb is not None:
+            rss = rss_mb()
+            if rss >= self.max_rss_mb:
+                return "grew to %iMB" % rss
+        return None
+
+    def retire(self, reason: str) -> None:
+        """Stop taking on jobs, and tell whoever replaces us"""
+        logger.info("Retiring, having %s" % reason)
+        self.shutdown = True
+        if self.on_retire is not None:
+            self.on_retire(reason)
+
+    def should_retire(self) -> bool:
+        """Retire if this worker has reached any of its limits"""
+        reason = self.retirement_reason()
+        if reason is None:
+            return False
+        self.retire(reason)
+        return True
+
+    def set_idle(self, idle: bool) -> None:
+        """Note whether we're idle, and say so whenever that changes"""
+        if idle != self.idle:
+            self.idle = idle
+            if self.on_idle is not None:
+                self.on_idle(idle)
+
     def halt_job_processing(self, jid: str) -> None:  # pragma: no cover
         """Stop processing the provided jid"""
         raise NotImplementedError('Derived classes must override "halt_job_processing"')
@@ -132,5 +383,6 @@ class BaseWorker:
         raise NotImplementedError('Derived classes must override "run"')
 
     def stop(self) -> None:
-        """Mark this for shutdown"""
+        """Mark this for shutdown, cutting short any wait for work"""
         self.shutdown = True
+        self.wake()
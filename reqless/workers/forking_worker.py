@@ -1,10 +1,26 @@
 """A worker that forks child processes"""
 
+import gc
+import importlib
+import math
 import multiprocessing
 import os
+import select
 import signal
+import time
 from types import FrameType
-from typing import Any, Dict, Iterable, List, Optional, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 from reqless import logger, util
 from reqless.abstract import (
@@ -13,6 +29,9 @@ from reqless.abstract import (
     AbstractQueue,
     AbstractQueueResolver,
 )
+from reqless.exceptions import ReqlessError
+from reqless.importer import Importer
+from reqless.pagination import check
 from reqless.workers.base_worker import BaseWorker
 from reqless.workers.serial_worker import SerialWorker
 from reqless.workers.signals import register_signal_handler
@@ -24,6 +43,15 @@ try:
 except NotImplementedError:
     NUM_CPUS = 1
 
+# How often to reap children that exited without our noticing, in seconds
+REAP_INTERVAL = 5.0
+
+# What children write to their lifelines: that they're retiring, that they've
+# run out of jobs, and that they've found more
+RETIRING = "r"
+IDLE = "i"
+BUSY = "b"
+
 
 class ForkingWorker(BaseWorker):
     """A worker that forks child processes"""
@@ -50,8 +78,42 @@ class ForkingWorker(BaseWorker):
         )
         # How many children to launch
         self.count: int = self.kwargs.pop("workers", 0) or NUM_CPUS
+        # Given room to, the number of children follows the demand in our
+        # queues: it grows when more than `scale_depth` jobs per child are
+        # waiting, or when jobs have waited more than `scale_wait` seconds on
+        # average today, and shrinks when no jobs are waiting at all
+        self.min_count: int = self.kwargs.pop("min_workers", 0) or self.count
+        self.max_count: int = max(self.kwargs.pop("max_workers", 0), self.min_count)
+        self.count = self.min_count
+        self.scale_depth: float = self.kwargs.pop("scale_depth", 10)
+        self.scale_wait: Optional[float] = self.kwargs.pop("scale_wait", None)
+        self.scale_interval: float = self.kwargs.pop("scale_interval", 10.0)
+        self.scaled_at: float = 0.0
         # A dictionary of child pids to information about them
         self.sandboxes: Dict[int, str] = {}
+        # The read end of a pipe to each child, which the child writes to when
+        # it retires, and which is closed when it exits
+        self.lifelines: Dict[int, int] = {}
+        # Retiring children, whose replacements have already been forked
+        self.replaced: Set[int] = set()
+        # Children that have run out of jobs, and those told to stop
+        self.idle_children: Set[int] = set()
+        self.stopping: Set[int] = set()
+        # Modules and job classes to import before forking, so that children
+        # share them rather than each importing them on its first job
+        self.preload: List[str] = list(self.kwargs.pop("preload", None) or [])
+        # Called in the parent before forking each child
+        self.before_fork_hook: Optional[Callable[["ForkingWorker"], None]] = (
+            self.kwargs.pop("before_fork", None)
+        )
+        # Called in each child once it's forked, to open its own resources
+        self.after_fork_hook: Optional[Callable[["ForkingWorker"], None]] = (
+            self.kwargs.pop("after_fork", None)
+        )
+        # Called in the parent with the pid and status of each child that exits
+        self.on_child_exit_hook: Optional[
+            Callable[["ForkingWorker", int, int], None]
+        ] = self.kwargs.pop("on_child_exit", None)
 
     def stop(self, sig: int = signal.SIGINT) -> None:
         """Stop all the workers, and then wait for them"""
@@ -69,10 +131,15 @@ class ForkingWorker(BaseWorker):
                 logger.info("Waiting for %i..." % cpid)
                 pid, status = os.waitpid(cpid, 0)
                 logger.warning("%i stopped with status %i" % (pid, status >> 8))
+                self.on_child_exit(pid, status)
             except OSError:  # pragma: no cover
                 logger.exception("Error waiting for %i..." % cpid)
             finally:
                 self.sandboxes.pop(cpid, None)
+                self.close_lifeline(cpid)
+        self.replaced.clear()
+        self.idle_children.clear()
+        self.stopping.clear()
 
     def spawn(self, **kwargs: Any) -> BaseWorker:
         """Return a new worker for a child process"""
@@ -86,53 +153,258 @@ class ForkingWorker(BaseWorker):
             signals=("TERM", "INT", "QUIT"),
         )
 
+    def warmup(self) -> None:
+        """Import the modules and job classes to preload. Each name is imported
+        as a module if it is one, or as a job class otherwise."""
+        for name in self.preload:
+            try:
+                try:
+                    importlib.import_module(name)
+                except ModuleNotFoundError:
+                    Importer.import_class(name)
+                logger.info("Preloaded %s" % name)
+            except Exception:
+                logger.exception("Failed to preload %s" % name)
+
+    def before_fork(self) -> None:
+        """Run in the parent before forking each child"""
+        if self.before_fork_hook is not None:
+            self.before_fork_hook(self)
+
+    def after_fork(self) -> None:
+        """Run in each child once it's forked. The client connects anew, so
+        that the child never shares the parent's sockets, and then the hook is
+        called, to do the same for any other pooled resources."""
+        self.client.reconnect()
+        if self.after_fork_hook is not None:
+            self.after_fork_hook(self)
+
+    def on_child_exit(self, pid: int, status: int) -> None:
+        """Run in the parent with the pid and status of each child reaped"""
+        if self.on_child_exit_hook is not None:
+            try:
+                self.on_child_exit_hook(self, pid, status)
+            except Exception:
+                logger.exception("Exception in on_child_exit hook")
+
+    def sandbox(self) -> str:
+        """The first sandbox that no child is working in"""
+        in_use = set(self.sandboxes.values())
+        index = 0
+        while True:
+            sandbox = os.path.join(
+                os.getcwd(), "reqless-py-workers", "sandbox-%s" % index
+            )
+            if sandbox not in in_use:
+                return sandbox
+            index += 1
+
+    def fork(self, sandbox: str, **kwargs: Any) -> int:
+        """Fork a child to work in the sandbox, returning its pid"""
+        self.before_fork()
+        reader, writer = os.pipe()
+        # Everything allocated so far is frozen, so that the garbage collector
+        # in the child never touches it, and the child keeps sharing it
+        # copy-on-write rather than copying it. The parent goes back to
+        # collecting as usual once the child is forked.
+        gc.freeze()
+        cpid = os.fork()
+        if cpid:
+            gc.unfreeze()
+            gc.enable()
+            os.close(writer)
+            self.sandboxes[cpid] = sandbox
+            self.lifelines[cpid] = reader
+            return cpid
+        else:  # pragma: no cover
+            gc.enable()
+            os.close(reader)
+            for lifeline in self.lifelines.values():
+                os.close(lifeline)
+            # Move to the sandbox as the current working directory
+            with create_sandbox(sandbox):
+                os.chdir(sandbox)
+                try:
+                    self.after_fork()
+                    # Only when autoscaling do we need to know who's idle
+                    if self.max_count > self.min_count:
+                        kwargs["on_idle"] = lambda idle: os.write(
+                            writer, (IDLE if idle else BUSY).encode()
+                        )
+                    worker = self.spawn(
+                        sandbox=sandbox,
+                        on_retire=lambda reason: os.write(writer, RETIRING.encode()),
+                        **kwargs,
+                    )
+                    # Told to quit, the child stops once it's done with its job
+                    register_signal_handler(
+                        handler=lambda signum, frame: worker.stop(),
+                        signals=("QUIT",),
+                    )
+                    worker.run()
+                except Exception:
+                    logger.exception("Exception in spawned worker")
+                finally:
+                    os._exit(0)
+
+    def close_lifeline(self, pid: int) -> None:
+        """Stop listening to a child"""
+        lifeline = self.lifelines.pop(pid, None)
+        if lifeline is not None:
+            os.close(lifeline)
+
+    def replace(self, pid: int) -> None:
+        """Fork a replacement for a child that's retiring, while it winds down"""
+        if pid in self.replaced:
+            return
+        self.replaced.add(pid)
+        cpid = self.fork(self.sandbox())
+        logger.info("Spawned worker %i to replace retiring worker %i" % (cpid, pid))
+
+    def reaped(self, pid: int, status: int) -> None:
+        """Forget a child that's exited, and replace it unless it already was"""
+        logger.warning(
+            "Worker %i died with status %i from signal %i"
+            % (pid, status >> 8, status & 0xFF)
+        )
+        self.sandboxes.pop(pid, None)
+        self.close_lifeline(pid)
+        self.on_child_exit(pid, status)
+        self.idle_children.discard(pid)
+        if pid in self.replaced or pid in self.stopping:
+            self.replaced.discard(pid)
+            self.stopping.discard(pid)
+        else:
+            cpid = self.fork(self.sandbox())
+            logger.info("Spawned replacement worker %i" % cpid)
+
+    def reap(self) -> None:
+        """Reap every child that's exited, without waiting for any others"""
+        while self.sandboxes:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if not pid:
+                return
+            if pid in self.sandboxes:
+                self.reaped(pid, status)
+
+    def heard(self, pid: int, message: str) -> None:
+        """Act on what a child wrote to its lifeline"""
+        if message == RETIRING:
+            self.idle_children.discard(pid)
+            self.replace(pid)
+        elif message == IDLE:
+            self.idle_children.add(pid)
+        elif message == BUSY:
+            self.idle_children.discard(pid)
+
+    def supervise(self, timeout: float = REAP_INTERVAL) -> None:
+        """Wait up to `timeout` seconds for children to write to their
+        lifelines, or to exit, and replace them. A retiring child writes to its
+        lifeline, and is replaced straight away, and a child that exits closes
+        it."""
+        pids = {lifeline: pid for pid, lifeline in self.lifelines.items()}
+        readable, _, _ = select.select(list(pids), [], [], timeout)
+        for lifeline in readable:
+            pid = pids[lifeline]
+            messages = os.read(lifeline, 64)
+            if messages:
+                for message in messages.decode():
+                    self.heard(pid, message)
+            else:
+                self.close_lifeline(pid)
+                _, status = os.waitpid(pid, 0)
+                self.reaped(pid, status)
+        self.reap()
+
+    def children(self) -> int:
+        """How many children are working, not counting those on their way out"""
+        return len(self.sandboxes) - len(self.replaced) - len(self.stopping)
+
+    def demand(self) -> Optional[Tuple[int, float]]:
+        """How many jobs are waiting in our queues, and how long jobs popped
+        from them today waited on average, fetched in a single round trip"""
+        queue_names = list(self.queue_resolver.resolve())
+        now = repr(time.time())
+        commands: List[Tuple[Any, ...]] = [("queues", name) for name in queue_names]
+        if self.scale_wait is not None:
+            commands.extend(("stats", name, now) for name in queue_names)
+        try:
+            results = check(self.client.call_many(commands))
+        except ReqlessError:
+            logger.exception("Unable to measure the demand in our queues")
+            return None
+        loads = self.client.serializer.loads
+        waiting = sum(
+            loads(result)["waiting"] for result in results[: len(queue_names)]
+        )
+        waits = [loads(result)["wait"] for result in results[len(queue_names) :]]
+        popped = sum(wait["count"] for wait in waits)
+        mean_wait = (
+            sum(wait["count"] * wait["mean"] for wait in waits) / popped
+            if popped
+            else 0.0
+        )
+        return waiting, mean_wait
+
+    def autoscale(self) -> None:
+        """Grow or shrink our children to match the demand in our queues. The
+        pool grows straight to the size the waiting jobs call for, and shrinks
+        one idle child at a time, which stops once it's done with its job."""
+        self.scaled_at = time.time()
+        demand = self.demand()
+        if demand is None:
+            return
+        waiting, mean_wait = demand
+        target = self.count
+        if waiting > self.scale_depth * self.count:
+            target = math.ceil(waiting / self.scale_depth)
+        elif waiting and self.scale_wait is not None and mean_wait > self.scale_wait:
+            target = self.count + 1
+        elif not waiting:
+            target = self.count - 1
+        target = max(self.min_count, min(self.max_count, target))
+
+        if target > self.count:
+            logger.info("Growing to %i workers for %i waiting jobs" % (target, waiting))
+            self.count = target
+        elif target < self.count and self.idle_children:
+            pid = min(self.idle_children)
+            logger.info("Shrinking to %i workers, stopping idle %i" % (target, pid))
+            self.idle_children.discard(pid)
+            self.stopping.add(pid)
+            self.count = target
+            try:
+                os.kill(pid, signal.SIGQUIT)
+            except OSError:  # pragma: no cover
+                logger.exception("Error stopping %s..." % pid)
+        while self.children() < self.count:
+            cpid = self.fork(self.sandbox())
+            logger.info("Spawned worker %i" % cpid)
+
     def run(self) -> None:
         """Run this worker"""
         self.before_run()
+        # Nothing is collected until the first child is forked, so that what
+        # we preload isn't interleaved with the holes that garbage leaves
+        gc.disable()
+        self.warmup()
         # Divide up the jobs that we have to divy up between the workers. This
         # produces evenly-sized groups of jobs
         resume = divide(self.resume, self.count)
         for index in range(self.count):
-            # The sandbox for the child worker
-            sandbox = os.path.join(
-                os.getcwd(), "reqless-py-workers", "sandbox-%s" % index
-            )
-            cpid = os.fork()
-            if cpid:
-                logger.info("Spawned worker %i" % cpid)
-                self.sandboxes[cpid] = sandbox
-            else:  # pragma: no cover
-                # Move to the sandbox as the current working directory
-                with create_sandbox(sandbox):
-                    os.chdir(sandbox)
-                    try:
-                        self.spawn(resume=resume[index], sandbox=sandbox).run()
-                    except Exception:
-                        logger.exception("Exception in spawned worker")
-                    finally:
-                        os._exit(0)
+            cpid = self.fork(self.sandbox(), resume=resume[index])
+            logger.info("Spawned worker %i" % cpid)
 
+        self.scaled_at = time.time()
         try:
             while not self.shutdown:
-                pid, status = os.wait()
-                logger.warning(
-                    "Worker %i died with status %i from signal %i"
-                    % (pid, status >> 8, status & 0xFF)
-                )
-                sandbox = self.sandboxes.pop(pid)
-                cpid = os.fork()
-                if cpid:
-                    logger.info("Spawned replacement worker %i" % cpid)
-                    self.sandboxes[cpid] = sandbox
-                else:  # pragma: no cover
-                    with create_sandbox(sandbox):
-                        os.chdir(sandbox)
-                        try:
-                            self.spawn(sandbox=sandbox).run()
-                        except Exception:
-                            logger.exception("Exception in spawned worker")
-                        finally:
-                            os._exit(0)
+                timeout = REAP_INTERVAL
+                if self.max_count > self.min_count:
+                    timeout = self.scaled_at + self.scale_interval - time.time()
+                    if timeout <= 0:
+                        self.autoscale()
+                        continue
+                self.supervise(min(timeout, REAP_INTERVAL))
         finally:
             self.stop(signal.SIGKILL)
 
@@ -1,13 +1,14 @@
 """A Gevent-based worker"""
 
 import os
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 import gevent
 from gevent import Greenlet
+from gevent.event import Event
 from gevent.pool import Pool
 
-from reqless import logger
+from reqless import exceptions, logger
 from reqless.abstract import (
     AbstractClient,
     AbstractJob,
@@ -15,10 +16,47 @@ from reqless.abstract import (
     AbstractQueueResolver,
 )
 from reqless.workers.base_worker import BaseWorker
+from reqless.workers.heartbeater import Heartbeater
 from reqless.workers.signals import basic_signal_handler, register_signal_handler
 from reqless.workers.util import create_sandbox
 
 
+class GeventHeartbeater(Heartbeater):
+    """Heartbeats in-flight jobs from a greenlet rather than a thread"""
+
+    def __init__(
+        self,
+        client: AbstractClient,
+        fraction: float = 0.5,
+        on_lost: Optional[Callable[[str], None]] = None,
+    ):
+        super().__init__(client, fraction=fraction, on_lost=on_lost)
+        self._greenlet: Optional[Greenlet] = None
+        self._greenlet_wakeup: Event = Event()
+
+    def start(self) -> None:
+        """Start heartbeating in the background"""
+        self._stopped = False
+        self._greenlet = gevent.spawn(self.run)
+
+    def stop(self) -> None:
+        """Stop heartbeating, and wait for the greenlet to finish"""
+        self._stopped = True
+        self.notify()
+        if self._greenlet is not None:
+            self._greenlet.join()
+            self._greenlet = None
+
+    def notify(self) -> None:
+        """Interrupt any wait, since there may be more to do"""
+        self._greenlet_wakeup.set()
+
+    def wait(self, timeout: Optional[float]) -> None:
+        """Wait until the next job is due or a job is added"""
+        self._greenlet_wakeup.wait(timeout)
+        self._greenlet_wakeup.clear()
+
+
 class GeventWorker(BaseWorker):
     """A Gevent-based worker"""
 
@@ -43,6 +81,9 @@ class GeventWorker(BaseWorker):
         self.greenlets: Dict[str, Greenlet] = {}
         count = kwargs.pop("greenlets", 10)
         self.pool = Pool(count)
+        # Prefetched batches are shared between all of our greenlets
+        if self.prefetch is not None:
+            self.prefetch.concurrency = count
         # A list of the sandboxes that we'll use
         sandbox_path = kwargs.pop(
             "sandbox_path", os.path.join(os.getcwd(), "reqless-py-workers")
@@ -50,55 +91,86 @@ class GeventWorker(BaseWorker):
         self.sandboxes: List[str] = [
             os.path.join(sandbox_path, "greenlet-%i" % i) for i in range(count)
         ]
+        # Our listener may run in a real thread, so wakeups are delivered to
+        # the hub through an async watcher that is safe to send from any thread
+        self._greenlet_wakeup: Event = Event()
+        self._wakeup_watcher: Any = None
 
     def process(self, job: AbstractJob) -> None:
         """Process a job"""
         sandbox = self.sandboxes.pop(0)
         try:
-            with create_sandbox(sandbox):
+            with create_sandbox(sandbox), self.processing(job):
                 job.sandbox = sandbox
                 job.process()
+        except exceptions.LostLockError:
+            logger.warning("Abandoned %s after losing its lock" % job.jid)
         finally:
             # Delete its entry from our greenlets mapping
             self.greenlets.pop(job.jid, None)
             self.sandboxes.append(sandbox)
+            self.processed += 1
 
     def halt_job_processing(self, jid: str) -> None:
         """Stop the greenlet processing the provided jid"""
         greenlet = self.greenlets.get(jid)
         if greenlet is not None:
             logger.warning("Lost ownership of %s" % jid)
-            greenlet.kill()
+            greenlet.kill(exceptions.LostLockError(jid))
+
+    def wake(self) -> None:
+        """Cut short any wait for work, since some may have arrived"""
+        if self._wakeup_watcher is not None:
+            self._wakeup_watcher.send()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for work to arrive in one of our
+        queues without blocking the other greenlets"""
+        woken = bool(self._greenlet_wakeup.wait(timeout))
+        self._greenlet_wakeup.clear()
+        return woken
+
+    def create_heartbeater(self, fraction: float) -> Heartbeater:
+        """Create the heartbeater for jobs being processed by this worker"""
+        return GeventHeartbeater(self.client, fraction=fraction, on_lost=self.lost)
 
     def before_run(self) -> None:
         register_signal_handler(handler=basic_signal_handler(on_quit=self.stop))
+        self._wakeup_watcher = gevent.get_hub().loop.async_()
+        self._wakeup_watcher.start(self._greenlet_wakeup.set)
 
     def run(self) -> None:
         """Work on jobs"""
         self.before_run()
 
-        # Start listening
-        with self.listener():
-            try:
+        try:
+            # Start listening
+            with self.listener(), self.heartbeating():
                 generator = self.jobs()
-                while not self.shutdown:
-                    self.pool.wait_available()
-                    job = next(generator)
-                    if job:
-                        # For whatever reason, doing imports within a greenlet
-                        # (there's one implicitly invoked in job.process), was
-                        # throwing exceptions. The simplest way to get around
-                        # this is to force the import to happen before the
-                        # greenlet is spawned.
-                        job.klass
-                        greenlet = Greenlet(self.process, job)
-                        self.greenlets[job.jid] = greenlet
-                        self.pool.start(greenlet)
-                    else:
-                        logger.debug("Sleeping for %fs" % self.interval)
-                        gevent.sleep(self.interval)
-            except StopIteration:
-                logger.info("Exhausted jobs")
-            finally:
-                logger.info("Waiting for greenlets to finish")
-                self.pool.join()
+                try:
+                    while not self.shutdown and not self.should_retire():
+                        self.pool.wait_available()
+                        job = next(generator)
+                        self.set_idle(not job and not self.greenlets)
+                        if job:
+                            # For whatever reason, doing imports within a greenlet
+                            # (there's one implicitly invoked in job.process), was
+                            # throwing exceptions. The simplest way to get around
+                            # this is to force the import to happen before the
+                            # greenlet is spawned.
+                            job.klass
+                            greenlet = Greenlet(self.process, job)
+                            self.greenlets[job.jid] = greenlet
+                            self.pool.start(greenlet)
+                        else:
+                            logger.debug("Sleeping for %fs" % self.interval)
+                            self.wait(self.interval)
+                except StopIteration:
+                    logger.info("Exhausted jobs")
+                finally:
+                    generator.close()
+                    logger.info("Waiting for greenlets to finish")
+                    self.pool.join()
+        finally:
+            self._wakeup_watcher.close()
+            self._wakeup_watcher = None
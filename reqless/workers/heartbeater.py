@@ -0,0 +1,110 @@
+"""Heartbeats in-flight jobs in the background"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from reqless import logger
+from reqless.abstract import AbstractClient, AbstractJob
+
+
+class Heartbeater:
+    """Renews the locks on in-flight jobs from a background thread.
+
+    Each job is heartbeated once `fraction` of its remaining ttl has elapsed,
+    so with the default of one half, a job with a 60 second lock is renewed
+    every 30 seconds. Jobs that come due together are heartbeated together in
+    a single round trip. If a job's lock can't be renewed, it's dropped and
+    `on_lost` is invoked with its jid."""
+
+    def __init__(
+        self,
+        client: AbstractClient,
+        fraction: float = 0.5,
+        on_lost: Optional[Callable[[str], None]] = None,
+    ):
+        if not 0 < fraction < 1:
+            raise ValueError("fraction must be between 0 and 1, not %s" % fraction)
+        self.client: AbstractClient = client
+        self.fraction: float = fraction
+        self.on_lost: Optional[Callable[[str], None]] = on_lost
+        self._jobs: Dict[str, AbstractJob] = {}
+        self._due: Dict[str, float] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._stopped: bool = True
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup: threading.Event = threading.Event()
+
+    def add(self, job: AbstractJob) -> None:
+        """Begin heartbeating a job"""
+        with self._lock:
+            self._jobs[job.jid] = job
+            self._due[job.jid] = self._next_due(job)
+        self.notify()
+
+    def remove(self, jid: str) -> None:
+        """Stop heartbeating a job"""
+        with self._lock:
+            self._jobs.pop(jid, None)
+            self._due.pop(jid, None)
+
+    def beat(self) -> Optional[float]:
+        """Heartbeat every job that's due in a single round trip, returning how
+        long until the next job is due, or None if there are no jobs"""
+        now = time.time()
+        with self._lock:
+            due = [self._jobs[jid] for jid, at in self._due.items() if at <= now]
+        expiries = self.client.heartbeat_many(due) if due else {}
+        for job in due:
+            with self._lock:
+                # It may have been finished while we were heartbeating
+                if job.jid not in self._jobs:
+                    continue
+                if expiries.get(job.jid) is not None:
+                    self._due[job.jid] = self._next_due(job)
+                    continue
+                self._jobs.pop(job.jid)
+                self._due.pop(job.jid)
+            logger.warning("Lost lock on %s while heartbeating" % job.jid)
+            if self.on_lost is not None:
+                self.on_lost(job.jid)
+        with self._lock:
+            if not self._due:
+                return None
+            return max(0.0, min(self._due.values()) - time.time())
+
+    def start(self) -> None:
+        """Start heartbeating in the background"""
+        self._stopped = False
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop heartbeating, and wait for the background thread to finish"""
+        self._stopped = True
+        self.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run(self) -> None:
+        """Heartbeat jobs as they come due until stopped"""
+        while not self._stopped:
+            try:
+                timeout = self.beat()
+            except Exception:
+                logger.exception("Heartbeating error")
+                timeout = 1.0
+            self.wait(timeout)
+
+    def notify(self) -> None:
+        """Interrupt any wait, since there may be more to do"""
+        self._wakeup.set()
+
+    def wait(self, timeout: Optional[float]) -> None:
+        """Wait until the next job is due or a job is added"""
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def _next_due(self, job: AbstractJob) -> float:
+        return time.time() + max(0.0, job.ttl) * self.fraction
@@ -17,6 +17,7 @@ class MainWorker(SerialWorker):
         is most likely to be called by the listener thread, we can interrupt
         the main thread to force a job to halt processing. We should probably
         only do this when called from a thread other than the main thread."""
+        super().halt_job_processing(jid)
         if threading.current_thread() is not threading.main_thread():
             _thread.interrupt_main()
 
@@ -0,0 +1,142 @@
+"""A local buffer of prefetched jobs"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+from reqless import logger
+from reqless.abstract import AbstractClient, AbstractJob
+from reqless.exceptions import LostLockError, ReqlessError
+from reqless.workers.heartbeater import Heartbeater
+
+
+# How much weight the latest duration carries in a queue's moving average
+DURATION_SMOOTHING = 0.2
+
+
+class PrefetchBuffer:
+    """Pops jobs in batches and hands them out one at a time.
+
+    Unless a batch size is configured for a queue, enough jobs are popped to
+    cover `window` seconds of work, judging by how long jobs from that queue
+    have recently taken to process and how many are processed at once
+    (`concurrency`), up to `max_count`. With a heartbeater, buffered
+    jobs are heartbeated in the background until they're handed out. Without
+    one, those about to lose their locks are heartbeated as they're handed out.
+    Any buffered jobs are moved back to their queues on `release`."""
+
+    def __init__(
+        self,
+        client: AbstractClient,
+        counts: Optional[Dict[str, int]] = None,
+        max_count: int = 50,
+        window: float = 1.0,
+        renew_margin: float = 10.0,
+        heartbeater: Optional[Heartbeater] = None,
+        concurrency: int = 1,
+    ):
+        self.client: AbstractClient = client
+        self.counts: Dict[str, int] = dict(counts or {})
+        self.max_count: int = max_count
+        self.window: float = window
+        self.renew_margin: float = renew_margin
+        self.heartbeater: Optional[Heartbeater] = heartbeater
+        self.concurrency: int = concurrency
+        self._durations: Dict[str, float] = {}
+        # Jobs may be discarded from another thread, such as the listener's
+        self._jobs: Deque[AbstractJob] = deque()
+        self._lock: threading.Lock = threading.Lock()
+        # The queue we last found work in, which sizes the next batch
+        self._last_queue_name: Optional[str] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def batch_size(self, queue_name: str) -> int:
+        """How many jobs to pop at once from the named queue"""
+        if queue_name in self.counts:
+            return self.counts[queue_name]
+        duration = self._durations.get(queue_name)
+        if duration is None:
+            return 1
+        if duration <= 0:
+            return self.max_count
+        count = int(self.window * self.concurrency / duration)
+        return max(1, min(self.max_count, count))
+
+    def record(self, queue_name: str, duration: float) -> None:
+        """Record how long it took to process a job from the named queue"""
+        average = self._durations.get(queue_name)
+        self._durations[queue_name] = (
+            duration
+            if average is None
+            else DURATION_SMOOTHING * duration + (1 - DURATION_SMOOTHING) * average
+        )
+
+    def discard(self, jid: str) -> None:
+        """Drop a buffered job whose lock we no longer hold"""
+        with self._lock:
+            for job in list(self._jobs):
+                if job.jid == jid:
+                    self._jobs.remove(job)
+        if self.heartbeater is not None:
+            self.heartbeater.remove(jid)
+
+    def pop(self, queue_names: Iterable[str]) -> Optional[AbstractJob]:
+        """Hand out the next buffered job, refilling the buffer if it's empty"""
+        queue_names = list(queue_names)
+        while True:
+            if not len(self):
+                self._fill(queue_names)
+                if not len(self):
+                    return None
+            if self.heartbeater is None:
+                self._renew()
+            with self._lock:
+                job = self._jobs.popleft() if self._jobs else None
+            if job is not None:
+                if self.heartbeater is not None:
+                    self.heartbeater.remove(job.jid)
+                return job
+
+    def release(self) -> None:
+        """Move all buffered jobs back to their queues, rather than leaving
+        them to wait out their locks"""
+        with self._lock:
+            jobs, self._jobs = list(self._jobs), deque()
+        for job in jobs:
+            if self.heartbeater is not None:
+                self.heartbeater.remove(job.jid)
+            try:
+                job.move(job.queue_name)
+            except ReqlessError:
+                logger.exception("Unable to release %s" % job.jid)
+
+    def _fill(self, queue_names: Iterable[str]) -> None:
+        # Pop from our queues in order, in a single round trip, as many jobs as
+        # the queue we last found work in calls for, since the next jobs most
+        # likely come from there too
+        queue_names = list(queue_names)
+        if not queue_names:
+            return
+        count = self.batch_size(self._last_queue_name or queue_names[0])
+        popped = self.client.pop_from(queue_names, count)
+        if not popped:
+            return
+        self._last_queue_name = popped[0].queue_name
+        with self._lock:
+            self._jobs.extend(popped)
+        if self.heartbeater is not None:
+            for job in popped:
+                self.heartbeater.add(job)
+
+    def _renew(self) -> None:
+        with self._lock:
+            expiring = [job for job in self._jobs if job.ttl < self.renew_margin]
+        for job in expiring:
+            try:
+                job.heartbeat()
+            except LostLockError:
+                logger.warning("Lost lock on prefetched %s" % job.jid)
+                self.discard(job.jid)
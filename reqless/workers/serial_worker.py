@@ -1,9 +1,11 @@
 """A worker that serially pops and complete jobs"""
 
 import os
-import time
+import threading
+from contextlib import closing
 from typing import Any, Iterable, List, Optional, Union
 
+from reqless import exceptions, logger
 from reqless.abstract import (
     AbstractClient,
     AbstractJob,
@@ -32,37 +34,61 @@ class SerialWorker(BaseWorker):
             resume,
             **kwargs,
         )
-        # The jid that we're working on at the moment
+        # The job that we're working on at the moment
         self.jid: Optional[str] = None
+        self._job: Optional[AbstractJob] = None
+        self._halt_lock: threading.Lock = threading.Lock()
         # This is the sandbox we use
         self._sandbox: str = kwargs.pop(
             "sandbox", os.path.join(os.getcwd(), "reqless-py-workers")
         )
 
     def halt_job_processing(self, jid: str) -> None:
-        """Since this method is most likely to be called by the listener, and
-        the worker is definitely running in a different thread from the
-        listenter, there's not a lot we can reliably do here. Trying to exit
-        would only kill the listener thread, while the thread doing the actual
-        work continued. So, in this scenario, we have to depend on the job
-        doing a good job of heartbeating since that's the best way for the job
-        to learn that it should halt. As such, do nothing."""
-        pass
+        """This method is called by the listener or the heartbeater, both of
+        which run in a different thread from the one doing the actual work.
+        Trying to exit would only kill that thread, while the thread doing the
+        actual work continued. So, if we're still working on the provided jid,
+        we flag the job as lost, and the next time it heartbeats or calls
+        `job.check()`, a `LostLockError` is raised in it."""
+        with self._halt_lock:
+            job = self._job
+            # Jobs that have already been completed or failed are left alone
+            if job is None or job.jid != jid or job.state != "running":
+                return
+            logger.warning("Lost ownership of %s" % jid)
+            job.lost = True
+
+    def process(self, job: AbstractJob) -> None:
+        """Process a job, keeping it heartbeated if configured to"""
+        with self._halt_lock:
+            self.jid = job.jid
+            self._job = job
+        try:
+            set_title("Working on %s (%s)" % (job.jid, job.klass_name))
+            with create_sandbox(self._sandbox), self.processing(job):
+                job.sandbox = self._sandbox
+                job.process()
+        finally:
+            with self._halt_lock:
+                self._job = None
 
     def run(self) -> None:
         """Run jobs, popping one after another"""
-        with self.listener():
-            for job in self.jobs():
+        with self.listener(), self.heartbeating(), closing(self.jobs()) as jobs:
+            for job in jobs:
                 # If there was no job to be had, we should sleep a little bit
                 if not job:
                     self.jid = None
+                    self.set_idle(True)
                     set_title("Sleeping for %fs" % self.interval)
-                    time.sleep(self.interval)
+                    self.wait(self.interval)
                 else:
-                    self.jid = job.jid
-                    set_title("Working on %s (%s)" % (job.jid, job.klass_name))
-                    with create_sandbox(self._sandbox):
-                        job.sandbox = self._sandbox
-                        job.process()
-                if self.shutdown:
+                    self.set_idle(False)
+                    try:
+                        self.process(job)
+                    except exceptions.LostLockError:
+                        logger.warning("Abandoned %s after losing its lock" % job.jid)
+                    finally:
+                        self.processed += 1
+                if self.shutdown or self.should_retire():
                     break
@@ -1,5 +1,7 @@
 import os
+import resource
 import shutil
+import sys
 from contextlib import contextmanager
 from itertools import zip_longest
 from typing import Callable, Generator, Iterable, List, Optional
@@ -20,6 +22,19 @@ def divide(jobs: Iterable[AbstractJob], count: int) -> List[List[AbstractJob]]:
     return job_groups
 
 
+def rss_mb() -> float:
+    """The resident set size of this process, in megabytes. Where there's no
+    /proc to read it from, this is the peak resident set size instead."""
+    try:
+        with open("/proc/self/statm") as fin:
+            pages = int(fin.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Reported in bytes on macOS, and in kilobytes elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
 def clean(path: str) -> None:
     """Clean up all the files in a provided path"""
     for pth in os.listdir(path):
@@ -0,0 +1,280 @@
+"""Basic tests about the asyncio client"""
+
+import asyncio
+from typing import Dict, List
+
+from reqless import ReqlessError
+from reqless.aio import CachedConfig, Client, Job, RecurringJob
+from reqless_test.common import TestReqlessAsync
+
+
+class TestClient(TestReqlessAsync):
+    """Test the client"""
+
+    async def test_track(self) -> None:
+        """Gives us access to track and untrack jobs"""
+        await self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="jid"
+        )
+        self.assertTrue(await self.client.track("jid"))
+        self.assertFalse(await self.client.track("jid"))
+        tracked = await self.client.jobs.tracked()
+        self.assertEqual(tracked["jobs"][0].jid, "jid")
+        self.assertTrue(await self.client.untrack("jid"))
+        self.assertFalse(await self.client.untrack("jid"))
+
+    async def test_tags(self) -> None:
+        """Provides access to top tags"""
+        for _ in range(10):
+            await self.client.queues["foo"].put(
+                "reqless_test.common.NoopJob", "{}", tags=["foo"]
+            )
+        self.assertEqual(await self.client.tags(), ["foo"])
+
+    async def test_call_many(self) -> None:
+        """Runs many commands in one round trip, reporting errors in place"""
+        await self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}")
+        results = await self.client.call_many(
+            [("length", "foo"), ("priority", "missing", 1)]
+        )
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ReqlessError)
+
+    async def test_pop_from(self) -> None:
+        """Pops from many queues in order, in one call"""
+        self.assertEqual(await self.client.pop_from([]), [])
+        await self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="foo"
+        )
+        await self.client.queues["bar"].put(
+            "reqless_test.common.NoopJob", "{}", jid="bar"
+        )
+        jobs = await self.client.pop_from(["bar", "foo"], 5)
+        self.assertEqual([job.jid for job in jobs], ["bar", "foo"])
+
+    async def test_heartbeat_many(self) -> None:
+        """Heartbeats many jobs in one call, marking those we no longer own"""
+        self.assertEqual(await self.client.heartbeat_many([]), {})
+        queue = self.client.queues["foo"]
+        for jid in ("jid-1", "jid-2"):
+            await queue.put("reqless_test.common.NoopJob", "{}", jid=jid)
+        jobs = await self.client.pop_from(["foo"], 2)
+        await queue.put("reqless_test.common.NoopJob", "{}", jid="jid-2")
+        expiries = await self.client.heartbeat_many(jobs)
+        self.assertEqual(expiries["jid-1"], jobs[0].expires_at)
+        self.assertEqual(expiries["jid-2"], None)
+
+    async def test_errors(self) -> None:
+        """Raises ReqlessError for failed commands"""
+        with self.assertRaises(ReqlessError):
+            await self.client("priority", "missing", 1)
+
+    async def test_unfail(self) -> None:
+        """Provides access to unfail"""
+        queue = self.client.queues["foo"]
+        await queue.put("reqless_test.common.NoopJob", "{}", jid="jid")
+        job = await queue.pop()
+        assert isinstance(job, Job)
+        await job.fail("foo", "bar")
+        self.assertEqual(await self.client.unfail("foo", "foo"), 1)
+        job_again = await self.client.jobs["jid"]
+        assert isinstance(job_again, Job)
+        self.assertEqual(job_again.state, "waiting")
+
+
+class TestJobs(TestReqlessAsync):
+    """Test the Jobs class"""
+
+    async def test_basic(self) -> None:
+        """Can give us access to jobs"""
+        self.assertIsNone(await self.client.jobs["jid"])
+        await self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="jid"
+        )
+        job = await self.client.jobs["jid"]
+        assert isinstance(job, Job)
+        self.assertEqual(job.jid, "jid")
+
+    async def test_recurring(self) -> None:
+        """Can give us access to recurring jobs"""
+        await self.client.queues["foo"].recur(
+            "reqless_test.common.NoopJob", "{}", 60, jid="jid"
+        )
+        self.assertIsInstance(await self.client.jobs["jid"], RecurringJob)
+
+    async def test_get(self) -> None:
+        """Gets many jobs at once"""
+        self.assertEqual(await self.client.jobs.get(), [])
+        for jid in ("a", "b"):
+            await self.client.queues["foo"].put(
+                "reqless_test.common.NoopJob", "{}", jid=jid
+            )
+        jobs = await self.client.jobs.get("a", "b")
+        self.assertEqual([job.jid for job in jobs], ["a", "b"])
+        jobs = [job async for job in self.client.jobs.iter_get(["a", "b"], 1)]
+        self.assertEqual([job.jid for job in jobs], ["a", "b"])
+        jids = [jid async for jid in self.client.queues["foo"].jobs.iter_running()]
+        self.assertEqual(jids, [])
+        tagged = [job async for job in self.client.jobs.iter_tagged("a", hydrate=True)]
+        self.assertEqual(tagged, [])
+        jobs = await self.client.jobs.get("a", "b", light=True)
+        self.assertEqual([job.jid for job in jobs], ["a", "b"])
+        self.assertEqual([job.history for job in jobs], [[], []])
+        jobs = await self.client.pop_from(["foo"], 2, light=True)
+        self.assertEqual([job.history for job in jobs], [[], []])
+
+    async def test_complete(self) -> None:
+        """Can give us access to complete jobs"""
+        await self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="jid"
+        )
+        job = await self.client.queues["foo"].pop()
+        assert isinstance(job, Job)
+        await job.complete()
+        self.assertEqual(await self.client.jobs.complete(), ["jid"])
+
+    async def test_tagged(self) -> None:
+        """Gives us access to tagged jobs"""
+        await self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="jid", tags=["foo"]
+        )
+        self.assertEqual((await self.client.jobs.tagged("foo"))["jobs"], ["jid"])
+
+    async def test_failed(self) -> None:
+        """Gives us access to failed jobs"""
+        await self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="jid"
+        )
+        job = await self.client.queues["foo"].pop()
+        assert isinstance(job, Job)
+        await job.fail("foo", "bar")
+        self.assertEqual(await self.client.jobs.failed(), {"foo": 1})
+        failed = await self.client.jobs.failed("foo")
+        self.assertEqual(failed["jobs"][0].jid, "jid")
+
+
+class TestWorkers(TestReqlessAsync):
+    """Test the Workers class"""
+
+    async def test_individual(self) -> None:
+        """Gives us access to individual workers"""
+        self.client.worker_name = "worker"
+        await self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="jid"
+        )
+        await self.client.queues["foo"].pop()
+        self.assertEqual(
+            await self.client.workers["worker"], {"jobs": ["jid"], "stalled": []}
+        )
+        self.assertEqual(
+            await self.client.workers.counts(),
+            [{"jobs": 1, "name": "worker", "stalled": 0}],
+        )
+
+
+class TestQueues(TestReqlessAsync):
+    """Test the Queues class"""
+
+    async def test_counts(self) -> None:
+        """Gives us access to counts"""
+        await self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}")
+        counts = await self.client.queues.counts()
+        self.assertEqual(counts[0]["waiting"], 1)
+
+
+class TestThrottles(TestReqlessAsync):
+    """Test the Throttles class"""
+
+    async def test_throttle_operations(self) -> None:
+        throttle = self.client.throttles["foo"]
+        self.assertEqual(throttle.name, "foo")
+        self.assertEqual(await throttle.maximum(), 0)
+        self.assertEqual(await throttle.ttl(), -2)
+        await throttle.set_maximum(5)
+        self.assertEqual(await throttle.maximum(), 5)
+        await throttle.set_maximum(None, 999)
+        self.assertEqual(await throttle.maximum(), 5)
+        self.assertLessEqual(await throttle.ttl(), 999)
+        self.assertEqual(await throttle.locks(), [])
+        self.assertEqual(await throttle.pending(), [])
+        await throttle.delete()
+        self.assertEqual(await throttle.ttl(), -2)
+
+
+class TestConfig(TestReqlessAsync):
+    """Test the Config class"""
+
+    async def test_set_get_unset(self) -> None:
+        """Basic set/get/unset"""
+        config = self.client.config
+        self.assertIsNone(await config.get("foo"))
+        self.assertEqual(await config.get("foo", 5), 5)
+        await config.set("foo", 5)
+        self.assertEqual(await config.get("foo"), 5)
+        self.assertEqual((await config.all())["foo"], "5")
+        await config.unset("foo")
+        self.assertIsNone(await config.get("foo"))
+
+    async def test_update_pop_clear(self) -> None:
+        """Dictionary-style update, pop and clear"""
+        config = self.client.config
+        original = await config.all()
+        await config.update({"foo": 1}, bar=2)
+        self.assertEqual(await config.pop("foo"), 1)
+        self.assertEqual(await config.get("bar"), 2)
+        await config.clear()
+        self.assertEqual(await config.all(), original)
+
+    async def test_cached(self) -> None:
+        """A cached config only sees changes made elsewhere once invalidated,
+        or as soon as they're published while watching"""
+        cached = Client(config_ttl=60)
+        self.addAsyncCleanup(cached.close)
+        config = cached.config
+        assert isinstance(config, CachedConfig)
+        self.assertIsNone(await config.get("foo"))
+        await self.client.config.set("foo", 5)
+        self.assertIsNone(await config.get("foo"))
+        config.invalidate()
+        self.assertEqual(await config.get("foo"), 5)
+        await config.set("foo", 6)
+        self.assertEqual(await config.get("foo"), 6)
+        async with config.watching():
+            await self.client.config.set("foo", 7)
+            for _ in range(100):
+                if await config.get("foo") == 7:
+                    break
+                await asyncio.sleep(0.01)
+        self.assertEqual(await config.get("foo"), 7)
+
+
+class TestEvents(TestReqlessAsync):
+    """Test the Events class"""
+
+    async def test_basic(self) -> None:
+        """Delivers events to plain and coroutine callbacks"""
+        await self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="jid"
+        )
+        self.assertTrue(await self.client.track("jid"))
+        seen: Dict[str, List[str]] = {"popped": [], "completed": []}
+
+        def popped(jid: str) -> None:
+            seen["popped"].append(jid)
+
+        async def completed(jid: str) -> None:
+            seen["completed"].append(jid)
+
+        events = self.client.events
+        events.on("popped", popped)
+        events.on("completed", completed)
+        async with events.task():
+            job = await self.client.queues["foo"].pop()
+            assert isinstance(job, Job)
+            await job.complete()
+        self.assertEqual(seen, {"popped": ["jid"], "completed": ["jid"]})
+
+    async def test_not_implemented(self) -> None:
+        """Ensure missing events throw errors"""
+        self.assertRaises(NotImplementedError, self.client.events.on, "foo", int)
+        self.assertIsNone(self.client.events.off("foo"))
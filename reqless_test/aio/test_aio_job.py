@@ -0,0 +1,188 @@
+"""Basic tests about the asyncio Job classes"""
+
+import json
+
+import reqless.aio
+from reqless.aio import Job, RecurringJob
+from reqless.compression import ZlibCompressor
+from reqless.exceptions import LostLockError
+from reqless_test.common import TestReqlessAsync
+
+
+class TestJob(TestReqlessAsync):
+    """Test the Job class"""
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.client.worker_name = "worker"
+        self.queue = self.client.queues["foo"]
+        await self.queue.put(
+            "reqless_test.common.NoopJob", '{"whiz": "bang"}', jid="jid", tags=["a"]
+        )
+
+    async def get_job(self, jid: str = "jid") -> Job:
+        job = await self.client.jobs[jid]
+        assert isinstance(job, Job)
+        return job
+
+    async def pop_job(self) -> Job:
+        job = await self.queue.pop()
+        assert isinstance(job, Job)
+        return job
+
+    async def test_attributes(self) -> None:
+        """Has all the basic attributes we'd expect"""
+        job = await self.get_job()
+        self.assertEqual(job.jid, "jid")
+        self.assertEqual(job.klass_name, "reqless_test.common.NoopJob")
+        self.assertEqual(job.queue_name, "foo")
+        self.assertEqual(job.queue.name, "foo")
+        self.assertEqual(job.state, "waiting")
+        self.assertEqual(job.tags, ["a"])
+        self.assertEqual(job.dependencies, [])
+        self.assertEqual(job.dependents, [])
+        self.assertFalse(job.tracked)
+        self.assertEqual(job.original_retries, 5)
+        self.assertEqual(job.retries_left, 5)
+        self.assertEqual(len(job.history), 1)
+        self.assertEqual(job.klass.__name__, "NoopJob")
+        self.assertEqual(repr(job), "<reqless_test.common.NoopJob jid>")
+
+    async def test_heartbeat_and_complete(self) -> None:
+        """Heartbeats and completes with updated data"""
+        job = await self.pop_job()
+        self.assertGreater(await job.heartbeat(), 0)
+        self.assertGreater(job.ttl, 0)
+        self.assertEqual(job.worker_name, "worker")
+        job.data = json.dumps({"whiz": "pop"})
+        await job.complete()
+        job = await self.get_job()
+        self.assertEqual(job.state, "complete")
+        self.assertEqual(json.loads(job.data), {"whiz": "pop"})
+
+    async def test_complete_next(self) -> None:
+        """Advances to another queue on completion"""
+        job = await self.pop_job()
+        await job.complete("bar", delay=0)
+        self.assertEqual((await self.get_job()).queue_name, "bar")
+
+    async def test_lost_lock(self) -> None:
+        """Raises LostLockError when heartbeating a job we don't hold"""
+        job = await self.get_job()
+        with self.assertRaises(LostLockError):
+            await job.heartbeat()
+
+    async def test_priority_tags_and_tracking(self) -> None:
+        """Changes priority, tags and tracking"""
+        job = await self.get_job()
+        await job.set_priority(10)
+        self.assertEqual(job.priority, 10)
+        await job.tag("b")
+        self.assertEqual((await self.get_job()).tags, ["a", "b"])
+        await job.untag("a")
+        self.assertEqual((await self.get_job()).tags, ["b"])
+        self.assertTrue(await job.track())
+        self.assertTrue((await self.get_job()).tracked)
+        self.assertTrue(await job.untrack())
+        self.assertEqual((await self.get_job()).priority, 10)
+
+    async def test_move_retry_fail_timeout(self) -> None:
+        """Moves, retries, fails and times out jobs"""
+        job = await self.get_job()
+        await job.move("bar")
+        self.assertEqual((await self.get_job()).queue_name, "bar")
+        job = await self.pop_from("bar")
+        self.assertEqual(await job.retry(), 4)
+        job = await self.pop_from("bar")
+        await job.timeout()
+        self.assertEqual((await self.get_job()).state, "stalled")
+        job = await self.pop_from("bar")
+        await job.fail("group", "message")
+        job = await self.get_job()
+        self.assertEqual(job.state, "failed")
+        assert job.failure is not None
+        self.assertEqual(job.failure["group"], "group")
+
+    async def test_depends(self) -> None:
+        """Adds and removes dependencies"""
+        await self.queue.put("reqless_test.common.NoopJob", "{}", jid="a")
+        await self.queue.put("reqless_test.common.NoopJob", "{}", jid="b")
+        await self.queue.put(
+            "reqless_test.common.NoopJob", "{}", jid="c", depends=["a"]
+        )
+        job = await self.get_job("c")
+        self.assertTrue(await job.depend("b"))
+        self.assertEqual(set((await self.get_job("c")).dependencies), {"a", "b"})
+        self.assertTrue(await job.undepend("a"))
+        self.assertTrue(await job.undepend(all=True))
+        self.assertEqual((await self.get_job("c")).state, "waiting")
+
+    async def test_cancel(self) -> None:
+        """Cancels jobs"""
+        job = await self.get_job()
+        self.assertEqual(await job.cancel(), ["jid"])
+        self.assertIsNone(await self.client.jobs["jid"])
+
+    async def pop_from(self, queue_name: str) -> Job:
+        job = await self.client.queues[queue_name].pop()
+        assert isinstance(job, Job)
+        return job
+
+
+class TestRecurringJob(TestReqlessAsync):
+    """Test the RecurringJob class"""
+
+    async def get_job(self) -> RecurringJob:
+        job = await self.client.jobs["jid"]
+        assert isinstance(job, RecurringJob)
+        return job
+
+    async def test_attributes_and_update(self) -> None:
+        """Exposes and updates the recurring job's template"""
+        queue = self.client.queues["foo"]
+        await queue.recur("reqless_test.common.NoopJob", "{}", 60, jid="jid")
+        job = await self.get_job()
+        self.assertEqual((job.interval, job.retries, job.count), (60, 5, 0))
+        self.assertIsNotNone(await job.next())
+        await job.update(interval=120, priority=5, klass=TestRecurringJob)
+        self.assertEqual((job.interval, job.priority), (120, 5))
+        self.assertEqual(job.klass, TestRecurringJob)
+        job = await self.get_job()
+        self.assertEqual((job.interval, job.priority), (120, 5))
+        self.assertEqual(job.klass_name, "test_aio_job.TestRecurringJob")
+        await job.tag("a")
+        self.assertEqual((await self.get_job()).tags, ["a"])
+        await job.untag("a")
+        self.assertTrue(await job.move("bar"))
+        self.assertEqual((await self.get_job()).queue_name, "bar")
+        self.assertEqual(await job.cancel(), ["jid"])
+        self.assertIsNone(await self.client.jobs["jid"])
+
+
+class TestCompressedJob(TestReqlessAsync):
+    """Test jobs with compressed data"""
+
+    async def test_compressed(self) -> None:
+        """Data is compressed on put, update and complete, and decompressed"""
+        client = reqless.aio.Client(compressor=ZlibCompressor(threshold=0))
+        client.worker_name = "worker"
+        queue = client.queues["foo"]
+        data = json.dumps({"whiz": ["bang"] * 100})
+        await queue.put("reqless_test.common.NoopJob", data, jid="jid")
+        job = await queue.pop()
+        assert isinstance(job, Job)
+        self.assertEqual(job.data, data)
+        job.data = json.dumps({"whiz": ["pop"] * 100})
+        await job.complete()
+        completed = await self.client.jobs["jid"]
+        assert isinstance(completed, Job)
+        self.assertEqual(json.loads(completed.data), {"whiz": ["pop"] * 100})
+        await queue.recur("reqless_test.common.NoopJob", "{}", 60, jid="recur")
+        recurring = await client.jobs["recur"]
+        assert isinstance(recurring, RecurringJob)
+        await recurring.update(data=data)
+        self.assertEqual(recurring.data, data)
+        recurring = await self.client.jobs["recur"]
+        assert isinstance(recurring, RecurringJob)
+        self.assertEqual(recurring.data, data)
+        await client.close()
@@ -0,0 +1,113 @@
+"""Basic tests about the asyncio Queue class"""
+
+import json
+from typing import List
+
+from reqless.aio import Job
+from reqless.exceptions import ReqlessError
+from reqless_test.common import TestReqlessAsync
+
+
+class TestQueue(TestReqlessAsync):
+    """Test the Queue class"""
+
+    async def test_jobs(self) -> None:
+        """The queue.Jobs class provides access to job listings"""
+        queue = self.client.queues["foo"]
+        await queue.put("reqless_test.common.NoopJob", "{}", jid="jid")
+        self.assertEqual(await queue.jobs.depends(), [])
+        self.assertEqual(await queue.jobs.stalled(), [])
+        self.assertEqual(await queue.jobs.scheduled(), [])
+        self.assertEqual(await queue.jobs.recurring(), [])
+        await queue.pop()
+        self.assertEqual(await queue.jobs.running(), ["jid"])
+
+    async def test_counts_and_length(self) -> None:
+        """Provides access to job counts"""
+        queue = self.client.queues["foo"]
+        await queue.put("reqless_test.common.NoopJob", "{}")
+        self.assertEqual((await queue.counts())["waiting"], 1)
+        self.assertEqual(await queue.length(), 1)
+
+    async def test_pause(self) -> None:
+        """Pause/Unpause Queue"""
+        queue = self.client.queues["foo"]
+        await queue.pause()
+        self.assertTrue((await queue.counts())["paused"])
+        await queue.unpause()
+        self.assertFalse((await queue.counts())["paused"])
+
+    async def test_heartbeat(self) -> None:
+        """Provides access to heartbeat configuration"""
+        queue = self.client.queues["foo"]
+        self.assertEqual(await queue.heartbeat(), 60)
+        await queue.set_heartbeat(10)
+        self.assertEqual(await queue.heartbeat(), 10)
+
+    async def test_pop_and_peek(self) -> None:
+        """Exposes single and multi pop and peek"""
+        queue = self.client.queues["foo"]
+        self.assertIsNone(await queue.pop())
+        self.assertIsNone(await queue.peek())
+        await queue.put("reqless_test.common.NoopJob", '{"a": 1}', jid="a")
+        await queue.put("reqless_test.common.NoopJob", "{}", jid="b")
+        job = await queue.peek()
+        assert isinstance(job, Job)
+        self.assertEqual((job.jid, json.loads(job.data)), ("a", {"a": 1}))
+        jobs = await queue.peek(count=10)
+        assert isinstance(jobs, List)
+        self.assertEqual(len(jobs), 2)
+        jobs = await queue.pop(10)
+        assert isinstance(jobs, List)
+        self.assertEqual([job.jid for job in jobs], ["a", "b"])
+
+    async def test_requeue(self) -> None:
+        """Requeues failed jobs"""
+        queue = self.client.queues["foo"]
+        await queue.put("reqless_test.common.NoopJob", "{}", jid="jid")
+        job = await queue.pop()
+        assert isinstance(job, Job)
+        await job.fail("foo", "bar")
+        await queue.requeue("reqless_test.common.NoopJob", "{}", jid="jid")
+        self.assertEqual(await queue.length(), 1)
+
+    async def test_put_many(self) -> None:
+        """Puts many jobs, reporting failures in place"""
+        queue = self.client.queues["foo"]
+        results = await queue.put_many(
+            [
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "jid": "a"},
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "priority": "x"},
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "jid": "c"},
+            ],
+            chunk_size=2,
+        )
+        self.assertEqual(results[0], "a")
+        self.assertIsInstance(results[1], ReqlessError)
+        self.assertEqual(results[2], "c")
+        self.assertEqual(await queue.length(), 2)
+
+    async def test_recur_many(self) -> None:
+        """Places many recurring jobs"""
+        queue = self.client.queues["foo"]
+        jids = await queue.recur_many(
+            [
+                {
+                    "klass": "reqless_test.common.NoopJob",
+                    "data": "{}",
+                    "interval": 60,
+                    "jid": jid,
+                }
+                for jid in ("a", "b")
+            ]
+        )
+        self.assertEqual(jids, ["a", "b"])
+        self.assertEqual(len(await queue.jobs.recurring()), 2)
+
+    async def test_stats(self) -> None:
+        """Exposes stats"""
+        self.assertIn("run", await self.client.queues["foo"].stats())
+
+    async def test_throttle(self) -> None:
+        """Exposes the queue's throttle"""
+        self.assertEqual(self.client.queues["foo"].throttle.name, "ql:q:foo")
@@ -10,8 +10,10 @@ from typing import List
 from redis import Redis
 
 import reqless
+import reqless.aio
 from reqless import logger
 from reqless.abstract import AbstractJob
+from reqless.exceptions import LostLockError
 
 
 class BlockingJob:
@@ -37,6 +39,20 @@ class NoopJob:
         job.complete()
 
 
+class LostLockJob:
+    """Job that runs until it loses its lock, then records its jid in `lost`"""
+
+    @staticmethod
+    def process(job: AbstractJob) -> None:
+        try:
+            while True:
+                time.sleep(0.01)
+                job.check()
+        except LostLockError:
+            job.client.database.rpush("lost", job.jid)  # type: ignore[attr-defined]
+            raise
+
+
 class TestReqless(unittest.TestCase):
     """Base class for all of our tests"""
 
@@ -67,3 +83,27 @@ class TestReqless(unittest.TestCase):
     def tearDown(self) -> None:
         # Ensure that we leave no keys behind, and that we've unfrozen time
         self.database.flushdb()
+
+
+class TestReqlessAsync(unittest.IsolatedAsyncioTestCase):
+    """Base class for all of our tests of the asyncio client"""
+
+    database: Redis
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        reqless.logger.setLevel(logging.CRITICAL)
+        cls.database = Redis()
+        # Clear the script cache, and nuke everything
+        cls.database.execute_command("script", "flush")
+
+    async def asyncSetUp(self) -> None:
+        all_keys: List = self.database.keys("*")
+        assert len(all_keys) == 0
+        # The reqless client we're using
+        self.client = reqless.aio.Client()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        # Ensure that we leave no keys behind
+        self.database.flushdb()
@@ -0,0 +1,56 @@
+from unittest import mock
+
+import reqless
+from reqless.queue_resolvers.known_queue_names import KnownQueueNames
+from reqless_test.common import TestReqless
+
+
+class TestKnownQueueNames(TestReqless):
+    def test_get(self) -> None:
+        """It returns the names of all the queues in the order first seen"""
+        self.ensure_queues_exist(["one", "two", "three"])
+        subject = KnownQueueNames(client=self.client)
+        self.assertEqual(["one", "two", "three"], subject.get())
+
+    def test_caches_names_for_some_duration(self) -> None:
+        """It caches the names until they expire or are invalidated"""
+        subject = KnownQueueNames(client=self.client)
+        self.assertEqual([], subject.get())
+        self.ensure_queues_exist(["one"])
+        self.assertEqual([], subject.get())
+        subject.invalidate()
+        self.assertEqual(["one"], subject.get())
+
+    def test_refreshes_incrementally(self) -> None:
+        """It only fetches the queues first seen since the last refresh"""
+        self.ensure_queues_exist(["one"])
+        subject = KnownQueueNames(client=self.client, refresh_frequency_milliseconds=0)
+        self.assertEqual(["one"], subject.get())
+        self.ensure_queues_exist(["two"])
+        with mock.patch.object(
+            reqless.Client,
+            "__call__",
+            autospec=True,
+            side_effect=reqless.Client.__call__,
+        ) as call:
+            self.assertEqual(["one", "two"], subject.get())
+        self.assertEqual(1, call.call_count)
+        _, command, since = call.call_args.args
+        self.assertEqual("queues.names", command)
+
+    def test_refreshes_fully_when_queues_are_missed(self) -> None:
+        """It fetches every queue if the refresh doesn't account for them all"""
+        self.ensure_queues_exist(["one"])
+        subject = KnownQueueNames(client=self.client, refresh_frequency_milliseconds=0)
+        self.assertEqual(["one"], subject.get())
+        # As if first seen by a client whose clock is far behind
+        self.database.zadd("ql:queues", {"zero": 0})
+        self.assertEqual(["zero", "one"], subject.get())
+        self.database.delete("ql:queues")
+        self.assertEqual([], subject.get())
+
+    def test_for_client(self) -> None:
+        """It shares the known queue names between users of the same client"""
+        subject = KnownQueueNames.for_client(self.client)
+        self.assertIs(subject, KnownQueueNames.for_client(self.client))
+        self.assertIsNot(subject, KnownQueueNames.for_client(reqless.Client()))
@@ -3,6 +3,7 @@ from typing import Dict, List
 from uuid import uuid4
 
 from reqless.qmore.client import QmoreClient
+from reqless.queue_resolvers.known_queue_names import KnownQueueNames
 from reqless.queue_resolvers.qmore_dynamic_mapping_queue_identifiers_transformer import (  # noqa: E501
     QmoreDynamicMappingQueueIdentifiersTransformer,
 )
@@ -384,3 +385,50 @@ class TestQmoreDynamicMappingQueueIdentifiersTransformer(TestReqless):
                 patterns=patterns,
             ),
         )
+
+    def test_negating_unmatched_queue_names(self) -> None:
+        """It ignores negated patterns for queues that weren't matched"""
+        self.assertEqual(
+            ["one"],
+            self.collect_queue_names(
+                dynamic_queue_mapping={},
+                known_queue_names=["one", "two"],
+                patterns=["one", "!two"],
+            ),
+        )
+
+    def test_queue_name_matcher_is_kept_while_queues_are_unchanged(self) -> None:
+        """It only rebuilds the queue name matcher when queues are added"""
+        self.ensure_queues_exist(["one"])
+        subject = QmoreDynamicMappingQueueIdentifiersTransformer(
+            client=self.client,
+            known_queue_names=KnownQueueNames(
+                client=self.client, refresh_frequency_milliseconds=0
+            ),
+        )
+        self.assertEqual(["one"], subject.transform(["*"]))
+        matcher = subject._queue_name_matcher
+        self.assertEqual(["one"], subject.transform(["*"]))
+        self.assertIs(matcher, subject._queue_name_matcher)
+        self.ensure_queues_exist(["two"])
+        self.assertEqual(["one", "two"], subject.transform(["*"]))
+        self.assertIsNot(matcher, subject._queue_name_matcher)
+
+    def test_generation(self) -> None:
+        """It has a generation that changes with the mapping or the queues"""
+        subject = QmoreDynamicMappingQueueIdentifiersTransformer(
+            client=self.client,
+            dynamic_queue_mapping_refresh_frequency_milliseconds=1,
+            known_queue_names=KnownQueueNames(
+                client=self.client, refresh_frequency_milliseconds=0
+            ),
+        )
+        generation = subject.generation()
+        time.sleep(0.01)
+        self.assertEqual(generation, subject.generation())
+        self.set_dynamic_queues({"other": ["one"]})
+        time.sleep(0.01)
+        self.assertNotEqual(generation, subject.generation())
+        generation = subject.generation()
+        self.ensure_queues_exist(["one"])
+        self.assertNotEqual(generation, subject.generation())
@@ -326,3 +326,42 @@ class TestQmoreDynamicPriorityQueueIdentifiersTransformer(TestReqless):
         self.assertEqual(expected_queues, transformed_queues)
         transformed_queues.sort()
         self.assertEqual(self.queue_identifiers, transformed_queues)
+
+    def test_transform_reshuffles_kept_groups(self) -> None:
+        """It keeps the groups for the same identifiers, but shuffles them anew"""
+        subject = QmoreDynamicPriorityQueueIdentifiersTransformer(client=self.client)
+        self.qmore_client.set_queue_priority_patterns(
+            [
+                QueuePriorityPattern(
+                    patterns=["default"], should_distribute_fairly=True
+                ),
+            ]
+        )
+        self.assertIsNone(subject.generation())
+        subject.transform(queue_identifiers=self.queue_identifiers)
+        queue_groups = subject._queue_groups
+        orders = set()
+        for _ in range(10):
+            orders.add(
+                tuple(subject.transform(queue_identifiers=self.queue_identifiers))
+            )
+            self.assertIs(queue_groups, subject._queue_groups)
+        self.assertGreater(len(orders), 1)
+
+    def test_generation(self) -> None:
+        """It has a generation unless it distributes queues fairly"""
+        subject = QmoreDynamicPriorityQueueIdentifiersTransformer(
+            client=self.client,
+            dynamic_queue_priorities_refresh_frequency_milliseconds=1,
+        )
+        generation = subject.generation()
+        self.assertIsNotNone(generation)
+        time.sleep(0.01)
+        self.assertEqual(generation, subject.generation())
+        self.qmore_client.set_queue_priority_patterns(
+            [
+                QueuePriorityPattern(patterns=["g*"], should_distribute_fairly=False),
+            ]
+        )
+        time.sleep(0.01)
+        self.assertNotEqual(generation, subject.generation())
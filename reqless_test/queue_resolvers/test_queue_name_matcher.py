@@ -0,0 +1,37 @@
+import re
+import unittest
+from typing import List
+
+from reqless.queue_resolvers.queue_name_matcher import QueueNameMatcher
+
+
+class TestQueueNameMatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.known_queue_names = ["b-two", "a-one", "b-one", "c.one", "a-two", "b"]
+        self.subject = QueueNameMatcher(self.known_queue_names)
+
+    def naive_match(self, pattern: str) -> List[str]:
+        regex = re.compile(pattern.replace("*", ".*"))
+        return [name for name in self.known_queue_names if regex.fullmatch(name)]
+
+    def test_match(self) -> None:
+        """It matches just like a regex per pattern, in the original order"""
+        patterns = [
+            "*",
+            "b*",
+            "b-*",
+            "*one",
+            "a*o",
+            "b-two",
+            "missing",
+            "missing*",
+            "c.*",
+            "[ab]-*",
+            "",
+        ]
+        for pattern in patterns:
+            self.assertEqual(self.naive_match(pattern), self.subject.match(pattern))
+
+    def test_match_is_remembered(self) -> None:
+        """It only computes the matches for a pattern once"""
+        self.assertIs(self.subject.match("b*"), self.subject.match("b*"))
@@ -1,6 +1,6 @@
 """Basic tests of TransformingQueueResolver class"""
 
-from typing import List
+from typing import Hashable, List, Optional
 
 from reqless.abstract import AbstractQueueIdentifiersTransformer
 from reqless.queue_resolvers.transforming_queue_resolver import (
@@ -16,6 +16,19 @@ class OrderReversingQueueIdentifiersTransformer(AbstractQueueIdentifiersTransfor
         return _queue_identifiers
 
 
+class CountingQueueIdentifiersTransformer(OrderReversingQueueIdentifiersTransformer):
+    def __init__(self, generation: Optional[Hashable]):
+        self._generation: Optional[Hashable] = generation
+        self.count: int = 0
+
+    def generation(self) -> Optional[Hashable]:
+        return self._generation
+
+    def transform(self, queue_identifiers: List[str]) -> List[str]:
+        self.count += 1
+        return super().transform(queue_identifiers)
+
+
 class TestTransformingQueueResolver(TestReqless):
     def test_resolve_with_no_transformers(self) -> None:
         """It returns the given queue identifiers when no transformers"""
@@ -37,3 +50,37 @@ class TestTransformingQueueResolver(TestReqless):
         expected_queue_names = list(given_queue_names)
         expected_queue_names.reverse()
         self.assertEqual(expected_queue_names, queue_names)
+
+    def test_resolve_reuses_transformations(self) -> None:
+        """It only transforms again when a transformer's generation changes"""
+        first = CountingQueueIdentifiersTransformer(generation=1)
+        second = CountingQueueIdentifiersTransformer(generation="a")
+        subject = TransformingQueueResolver(
+            queue_identifiers=["one", "two", "three"],
+            transformers=[first, second],
+        )
+        queue_names = subject.resolve()
+        self.assertEqual(["one", "two", "three"], queue_names)
+        self.assertIs(queue_names, subject.resolve())
+        self.assertEqual((1, 1), (first.count, second.count))
+
+        second._generation = "b"
+        self.assertEqual(["one", "two", "three"], subject.resolve())
+        self.assertEqual((1, 2), (first.count, second.count))
+
+        # A new transformation upstream means one downstream too
+        first._generation = 2
+        self.assertEqual(["one", "two", "three"], subject.resolve())
+        self.assertEqual((2, 3), (first.count, second.count))
+
+    def test_resolve_without_generations(self) -> None:
+        """It always transforms when a transformer has no generation"""
+        first = CountingQueueIdentifiersTransformer(generation=1)
+        second = CountingQueueIdentifiersTransformer(generation=None)
+        subject = TransformingQueueResolver(
+            queue_identifiers=["one", "two", "three"],
+            transformers=[first, second],
+        )
+        subject.resolve()
+        subject.resolve()
+        self.assertEqual((1, 2), (first.count, second.count))
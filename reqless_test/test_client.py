@@ -1,8 +1,9 @@
 """Basic tests about the client"""
 
 from typing import List
+from unittest import mock
 
-from reqless import retry
+from reqless import Client, ReqlessError, retry
 from reqless.abstract import AbstractClient, AbstractJob
 from reqless.workers.base_worker import BaseWorker
 from reqless_test.common import TestReqless
@@ -27,6 +28,20 @@ class TestClient(TestReqless):
         self.assertFalse(self.client.untrack("jid"))
         self.assertEqual(self.client.jobs.tracked(), {"jobs": [], "expired": {}})
 
+    def test_reconnect(self) -> None:
+        """Resets its connection pool, and listens for events anew"""
+        database = self.client.database
+        events = self.client.events
+        with mock.patch.object(
+            database.connection_pool, "reset", wraps=database.connection_pool.reset
+        ) as reset:
+            self.client.reconnect()
+        reset.assert_called_once_with()
+        self.assertIs(database, self.client.database)
+        self.assertIsNot(events, self.client.events)
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="jid")
+        self.assertEqual(self.client.jobs["jid"].jid, "jid")  # type: ignore[union-attr]
+
     def test_attribute_error(self) -> None:
         """Throws AttributeError for non-attributes"""
         self.assertRaises(
@@ -43,6 +58,52 @@ class TestClient(TestReqless):
             )
         self.assertEqual(self.client.tags(), ["foo"])
 
+    def test_call_many(self) -> None:
+        """Runs many commands in one round trip, reporting errors in place"""
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="jid")
+        results = self.client.call_many(
+            [("length", "foo"), ("priority", "missing", 1), ("length", "bar")]
+        )
+        self.assertEqual(results[0], 1)
+        self.assertIsInstance(results[1], ReqlessError)
+        self.assertEqual(results[2], 0)
+
+    def test_pop_from(self) -> None:
+        """Pops from many queues in order, in one call"""
+        self.assertEqual(self.client.pop_from([]), [])
+        self.assertEqual(self.client.pop_from(["foo", "bar"]), [])
+        for jid in ("foo-1", "foo-2"):
+            self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid=jid)
+        for jid in ("bar-1", "bar-2"):
+            self.client.queues["bar"].put("reqless_test.common.NoopJob", "{}", jid=jid)
+        jobs = self.client.pop_from(["bar", "foo"], 3)
+        self.assertEqual([job.jid for job in jobs], ["bar-1", "bar-2", "foo-1"])
+        self.assertEqual([job.jid for job in self.client.pop_from(["foo"])], ["foo-2"])
+
+    def test_pop_from_light(self) -> None:
+        """Pops light jobs, without their history"""
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="jid")
+        jobs = self.client.pop_from(["foo"], light=True)
+        self.assertEqual([job.jid for job in jobs], ["jid"])
+        self.assertEqual(jobs[0].history, [])
+        self.assertEqual(jobs[0].data, "{}")
+
+    def test_heartbeat_many(self) -> None:
+        """Heartbeats many jobs in one call, marking those we no longer own"""
+        self.assertEqual(self.client.heartbeat_many([]), {})
+        self.client.worker_name = "worker"
+        for jid in ("jid-1", "jid-2"):
+            self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid=jid)
+        jobs = self.client.pop_from(["foo"], 2)
+        for job in jobs:
+            job.expires_at = 0
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="jid-2")
+        expiries = self.client.heartbeat_many(jobs)
+        self.assertEqual(expiries["jid-1"], jobs[0].expires_at)
+        self.assertGreater(jobs[0].ttl, 0)
+        self.assertEqual(expiries["jid-2"], None)
+        self.assertEqual(jobs[1].expires_at, 0)
+
     def test_unfail(self) -> None:
         """Provides access to unfail"""
         job_count = 10
@@ -71,6 +132,38 @@ class TestJobs(TestReqless):
         self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="jid")
         self.assertNotEqual(self.client.jobs["jid"], None)
 
+    def test_iter_get(self) -> None:
+        """Lazily gets jobs in chunks"""
+        jids = ["jid-%i" % index for index in range(5)]
+        for jid in jids:
+            self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid=jid)
+        with mock.patch.object(
+            Client, "__call__", autospec=True, side_effect=Client.__call__
+        ) as call:
+            jobs = self.client.jobs.iter_get(iter(jids + ["missing"]), chunk_size=2)
+            self.assertEqual(call.call_count, 0)
+            self.assertEqual(next(jobs).jid, "jid-0")
+            self.assertEqual(call.call_count, 1)
+            self.assertEqual([job.jid for job in jobs], jids[1:])
+            self.assertEqual(call.call_count, 3)
+        self.assertEqual(len(self.client.jobs.get(*jids)), 5)
+
+    def test_get_light(self) -> None:
+        """Gets light jobs, without their history, dependents and dependencies"""
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="a")
+        self.client.queues["foo"].put(
+            "reqless_test.common.NoopJob", "{}", jid="b", depends=["a"]
+        )
+        jobs = self.client.jobs.get("a", "b", light=True)
+        self.assertEqual([job.jid for job in jobs], ["a", "b"])
+        self.assertEqual([job.state for job in jobs], ["waiting", "depends"])
+        self.assertEqual([job.history for job in jobs], [[], []])
+        self.assertEqual(jobs[0].dependents, [])
+        self.assertEqual(jobs[1].dependencies, [])
+        jobs = self.client.jobs.get("a", "b")
+        self.assertEqual(jobs[0].dependents, ["b"])
+        self.assertEqual(jobs[1].dependencies, ["a"])
+
     def test_recurring(self) -> None:
         """Can give us access to recurring jobs"""
         self.assertEqual(self.client.jobs["jid"], None)
@@ -108,6 +201,23 @@ class TestJobs(TestReqless):
         pop_one(self.client, "foo").fail("foo", "bar")
         self.assertEqual(self.client.jobs.failed("foo")["jobs"][0].jid, "jid")
 
+    def test_iter_listings(self) -> None:
+        """Streams through complete, failed and tagged jobs"""
+        for index in range(3):
+            self.client.queues["foo"].put(
+                "reqless_test.common.NoopJob", "{}", jid="jid-%i" % index, tags=["a"]
+            )
+        pop_one(self.client, "foo").complete()
+        pop_one(self.client, "foo").fail("group", "message")
+        self.assertEqual(list(self.client.jobs.iter_complete()), ["jid-0"])
+        jobs = list(self.client.jobs.iter_failed("group", hydrate=True))
+        self.assertEqual([getattr(job, "jid") for job in jobs], ["jid-1"])
+        self.assertEqual(
+            sorted(self.client.jobs.iter_tagged("a", page_size=2)),
+            ["jid-0", "jid-1", "jid-2"],
+        )
+        self.assertEqual(list(self.client.jobs.iter_tagged("b", hydrate=True)), [])
+
     def test_failures(self) -> None:
         """Gives us access to failure types"""
         self.assertEqual(self.client.jobs.failed(), {})
@@ -0,0 +1,156 @@
+"""Test the compression of job payloads"""
+
+import json
+import unittest
+
+import reqless
+from reqless import compression
+from reqless.compression import (
+    PREFIX,
+    RESERVED_KEY,
+    Lz4Compressor,
+    ZlibCompressor,
+    compress_payload,
+    decompress_payload,
+)
+from reqless.exceptions import ReqlessError
+from reqless.job import Job, RecurringJob
+from reqless_test.common import TestReqless
+
+
+LARGE = json.dumps({"items": ["item-%i" % (index % 10) for index in range(1000)]})
+
+
+class TestCompression(unittest.TestCase):
+    """Test compressing and decompressing payloads"""
+
+    def test_round_trip(self) -> None:
+        """Large payloads are compressed into a JSON object, and decompressed"""
+        compressed = compress_payload(LARGE, ZlibCompressor())
+        self.assertLess(len(compressed), len(LARGE) / 5)
+        self.assertTrue(json.loads(compressed)[RESERVED_KEY].startswith("zlib:"))
+        self.assertEqual(decompress_payload(compressed), LARGE)
+
+    def test_reencoded(self) -> None:
+        """Payloads re-encoded with escaped slashes still decompress"""
+        compressed = compress_payload(LARGE, ZlibCompressor())
+        value = json.loads(compressed)[RESERVED_KEY]
+        self.assertIn("/", value)
+        reencoded = '{"%s":"%s"}' % (RESERVED_KEY, value.replace("/", "\\/"))
+        self.assertEqual(decompress_payload(reencoded), LARGE)
+
+    @unittest.skipIf(compression.lz4 is None, "lz4 is not installed")
+    def test_lz4(self) -> None:
+        """Payloads may be compressed with lz4"""
+        compressed = compress_payload(LARGE, Lz4Compressor())
+        self.assertTrue(json.loads(compressed)[RESERVED_KEY].startswith("lz4:"))
+        self.assertEqual(decompress_payload(compressed), LARGE)
+
+    def test_threshold(self) -> None:
+        """Payloads smaller than the threshold are left as they are"""
+        self.assertEqual(compress_payload("{}", ZlibCompressor()), "{}")
+        self.assertEqual(compress_payload(LARGE, None), LARGE)
+        self.assertEqual(
+            compress_payload(LARGE, ZlibCompressor(threshold=len(LARGE) + 1)), LARGE
+        )
+
+    def test_incompressible(self) -> None:
+        """Payloads that don't shrink are left as they are"""
+        data = json.dumps("".join(chr(ord("a") + index % 26) for index in range(30)))
+        self.assertEqual(compress_payload(data, ZlibCompressor(threshold=0)), data)
+
+    def test_uncompressed(self) -> None:
+        """Payloads that aren't only the reserved key are returned as they are"""
+        for data in (
+            '{"whiz": "bang"}',
+            '"reqless"',
+            '"reqless:zlib:YWJj"',
+            '{"%s":"zlib:YWJj","whiz":"bang"}' % RESERVED_KEY,
+            '{"%s":["zlib"]}' % RESERVED_KEY,
+        ):
+            self.assertEqual(decompress_payload(data), data)
+
+    def test_unknown(self) -> None:
+        """Payloads compressed with an unknown compressor can't be decoded"""
+        self.assertRaises(
+            ReqlessError, decompress_payload, '{"%s":"foo:YWJj"}' % RESERVED_KEY
+        )
+
+    def test_corrupt(self) -> None:
+        """Payloads that aren't valid base64 can't be decoded"""
+        self.assertRaises(
+            ReqlessError, decompress_payload, '{"%s":"zlib:YW?j"}' % RESERVED_KEY
+        )
+
+
+class TestCompressedJobs(TestReqless):
+    """Test putting and getting jobs with compressed data"""
+
+    def setUp(self) -> None:
+        TestReqless.setUp(self)
+        self.compressed = reqless.Client(compressor=ZlibCompressor())
+        self.compressed.worker_name = "worker"
+
+    def stored_data(self, jid: str) -> str:
+        data: bytes = self.database.hget(  # type: ignore[assignment]
+            "ql:j:" + jid, "data"
+        )
+        return data.decode()
+
+    def test_put(self) -> None:
+        """Large data is compressed on put, and decompressed lazily"""
+        self.compressed.queues["foo"].put(
+            "reqless_test.common.NoopJob", LARGE, jid="jid"
+        )
+        self.assertTrue(self.stored_data("jid").startswith(PREFIX))
+        job = self.client.jobs["jid"]
+        assert isinstance(job, Job)
+        self.assertIsNone(job._data)
+        self.assertEqual(job.data, LARGE)
+
+    def test_mixed(self) -> None:
+        """Jobs put without compression still decode"""
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", LARGE, jid="jid")
+        self.assertEqual(self.stored_data("jid"), LARGE)
+        job = self.compressed.jobs["jid"]
+        assert job is not None
+        self.assertEqual(job.data, LARGE)
+
+    def test_heartbeat_and_complete(self) -> None:
+        """Modified data is compressed on heartbeat and complete"""
+        queue = self.compressed.queues["foo"]
+        queue.put("reqless_test.common.NoopJob", "{}", jid="jid")
+        job = queue.pop()
+        assert isinstance(job, Job)
+        job.data = LARGE
+        job.heartbeat()
+        self.assertTrue(self.stored_data("jid").startswith(PREFIX))
+        job.data = LARGE.replace("item", "other")
+        job.complete()
+        self.assertEqual(
+            decompress_payload(self.stored_data("jid")), LARGE.replace("item", "other")
+        )
+
+    def test_move(self) -> None:
+        """Moving a job keeps its data as it was stored"""
+        queue = self.compressed.queues["foo"]
+        queue.put("reqless_test.common.NoopJob", LARGE, jid="jid")
+        stored = self.stored_data("jid")
+        job = self.client.jobs["jid"]
+        assert isinstance(job, Job)
+        job.move("bar")
+        self.assertEqual(self.stored_data("jid"), stored)
+
+    def test_recurring(self) -> None:
+        """Recurring jobs compress their data too"""
+        queue = self.compressed.queues["foo"]
+        queue.recur("reqless_test.common.NoopJob", "{}", 60, jid="jid")
+        job = self.compressed.jobs["jid"]
+        assert isinstance(job, RecurringJob)
+        job.data = LARGE
+        job = self.client.jobs["jid"]
+        assert isinstance(job, RecurringJob)
+        self.assertEqual(job.data, LARGE)
+        popped = queue.pop()
+        assert isinstance(popped, Job)
+        self.assertEqual(popped.data, LARGE)
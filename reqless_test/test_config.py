@@ -1,5 +1,11 @@
 """Tests about the config class"""
 
+import time
+from typing import List
+
+import reqless
+from reqless.config import CachedConfig
+from reqless.exceptions import ReqlessError
 from reqless_test.common import TestReqless
 
 
@@ -14,6 +20,22 @@ class TestConfig(TestReqless):
         del self.client.config["foo"]
         self.assertEqual(self.client.config["foo"], None)
 
+    def test_change_channel(self) -> None:
+        """Each option changed is published on a channel of its own"""
+        pubsub = self.client.database.pubsub()
+        pubsub.subscribe("ql:config")
+        self.client.config["foo"] = 5
+        self.client.config.update({"bar": 1, "baz": 2})
+        del self.client.config["foo"]
+        options: List[str] = []
+        while len(options) < 4:
+            message = pubsub.get_message(timeout=1)
+            assert message is not None
+            if message["type"] == "message":
+                options.append(message["data"])
+        pubsub.close()
+        self.assertEqual(options, ["foo", "bar", "baz", "foo"])
+
     def test_get_all(self) -> None:
         """Ensure we can get all the configuration"""
         self.assertEqual(
@@ -78,6 +100,63 @@ class TestConfig(TestReqless):
         self.client.config.update(updated)
         self.assertEqual(self.client.config.all, updated)
 
+    def test_update_many(self) -> None:
+        """Updates many options in a single call, and nothing if one is bad"""
+        self.client.config.update({"foo-%i" % index: index for index in range(50)})
+        self.assertEqual(self.client.config["foo-49"], 49)
+        self.assertRaises(ReqlessError, self.client, "config.set.many", "bar", 1, "baz")
+        self.assertEqual(self.client.config["bar"], None)
+        self.client.config.update({})
+
     def test_default_config(self) -> None:
         """We can get default config values."""
         self.assertEqual(self.client.config["heartbeat"], 60)
+
+
+class TestCachedConfig(TestConfig):
+    """Test the cached config class, which should behave just like the config
+    class for changes made through it"""
+
+    def setUp(self) -> None:
+        TestConfig.setUp(self)
+        self.client = reqless.Client(config_ttl=60)
+        self.other = reqless.Client()
+
+    def test_cached(self) -> None:
+        """Changes made elsewhere are only seen once the cache is invalidated"""
+        self.assertEqual(self.client.config["foo"], None)
+        self.other.config["foo"] = 5
+        self.assertEqual(self.client.config["foo"], None)
+        self.client.config.invalidate()
+        self.assertEqual(self.client.config["foo"], 5)
+
+    def test_ttl(self) -> None:
+        """Changes made elsewhere are seen once the cache expires"""
+        config = CachedConfig(self.client, ttl=60)
+        self.assertNotIn("foo", config)
+        self.other.config["foo"] = 5
+        self.assertNotIn("foo", config)
+        config.ttl = 0
+        self.assertIn("foo", config)
+
+    def test_heartbeat(self) -> None:
+        """Reading a queue's heartbeat doesn't fetch the config every time"""
+        queue = self.client.queues["foo"]
+        self.assertEqual(queue.heartbeat, 60)
+        self.other.config["heartbeat"] = 10
+        self.assertEqual(queue.heartbeat, 60)
+        queue.heartbeat = 20
+        self.assertEqual(queue.heartbeat, 20)
+
+    def test_watching(self) -> None:
+        """Changes made elsewhere are seen as soon as they're published"""
+        config = self.client.config
+        assert isinstance(config, CachedConfig)
+        self.assertEqual(config["foo"], None)
+        with config.watching():
+            self.other.config["foo"] = 5
+            for _ in range(100):
+                if config["foo"] is not None:
+                    break
+                time.sleep(0.01)
+        self.assertEqual(config["foo"], 5)
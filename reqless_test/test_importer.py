@@ -1,3 +1,5 @@
+import gc
+import weakref
 from unittest import mock
 
 from reqless.importer import Importer
@@ -24,3 +26,68 @@ class TestImporter(TestReqless):
         with mock.patch("reqless.importer.os.stat", side_effect=exc):
             Importer.import_class("reqless_test.test_job.Foo")
             Importer.import_class("reqless_test.test_job.Foo")
+
+    def test_reload_interval(self) -> None:
+        """Modules are only checked for changes every so often"""
+        class_name = "reqless_test.test_importer.ImporterTestClass"
+        Importer.import_class(class_name)
+        try:
+            Importer.set_reload_interval(60)
+            with mock.patch("reqless.importer.os.stat") as stat:
+                _class = Importer.import_class(class_name)
+            self.assertEqual(_class, ImporterTestClass)
+            stat.assert_not_called()
+        finally:
+            Importer.set_reload_interval(0)
+
+    def test_frozen(self) -> None:
+        """Modules are never checked for changes unless marked for reloading"""
+        class_name = "reqless_test.test_importer.ImporterTestClass"
+        try:
+            Importer.set_reload_interval(None)
+            Importer.mark_for_reload_on_next_import(class_name)
+            with mock.patch(
+                "reqless.importer.importlib.reload", side_effect=lambda mod: mod
+            ) as reload:
+                Importer.import_class(class_name)
+                reload.assert_called_once()
+                Importer.import_class(class_name)
+                Importer._classes.pop(class_name)
+                with mock.patch("reqless.importer.os.stat") as stat:
+                    Importer.import_class(class_name)
+                stat.assert_not_called()
+                reload.assert_called_once()
+        finally:
+            Importer.set_reload_interval(0)
+
+    def test_job_method(self) -> None:
+        """Finds the method named after the queue, or else process"""
+
+        class Processor:
+            @staticmethod
+            def process() -> None:
+                pass
+
+            @staticmethod
+            def foo() -> None:
+                pass
+
+        self.assertEqual(Importer.job_method(Processor, "foo"), Processor.foo)
+        self.assertEqual(Importer.job_method(Processor, "bar"), Processor.process)
+        self.assertIsNone(Importer.job_method(ImporterTestClass, "bar"))
+
+    def test_job_method_forgotten(self) -> None:
+        """Classes that have been replaced, as by a reload, are not kept alive
+        by their cached methods"""
+
+        class Processor:
+            @classmethod
+            def process(cls) -> None:
+                pass
+
+        self.assertEqual(Importer.job_method(Processor, "foo"), Processor.process)
+        self.assertIn(Processor, Importer._methods)
+        ref = weakref.ref(Processor)
+        del Processor
+        gc.collect()
+        self.assertIsNone(ref())
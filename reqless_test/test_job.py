@@ -1,8 +1,11 @@
 """Basic tests about the Job class"""
 
 import json
+import weakref
 from typing import List
+from unittest import mock
 
+from reqless import Client
 from reqless.abstract import AbstractJob
 from reqless.job import Job, RecurringJob
 from reqless_test.common import TestReqless
@@ -79,6 +82,40 @@ class TestJob(TestReqless):
             },
         )
 
+    def test_compact(self) -> None:
+        """Jobs keep their fields in slots, and empty ones are created lazily"""
+        self.client.queues["foo"].put("reqless_test.test_job.Foo", "{}", jid="jid")
+        job = self.get_job("jid")
+        self.assertFalse(hasattr(job, "__dict__"))
+        self.assertIsNone(job._dependents)
+        self.assertIsNone(job._failure)
+        self.assertEqual(job.dependents, [])
+        job.dependents.append("other")
+        self.assertEqual(job.dependents, ["other"])
+        self.assertEqual(job.failure, {})
+        self.assertEqual(len(job.history), 1)
+
+    def test_own_attributes(self) -> None:
+        """Jobs can't be given attributes of our own, but can be weakly
+        referenced"""
+        self.client.queues["foo"].put("reqless_test.test_job.Foo", "{}", jid="jid")
+        job = self.get_job("jid")
+        with self.assertRaises(AttributeError):
+            job.started = 1  # type: ignore[attr-defined]
+        self.assertIs(weakref.ref(job)(), job)
+
+    def test_shared_strings(self) -> None:
+        """Strings repeated across jobs are only kept once"""
+        for jid in ("a", "b"):
+            self.client.queues["foo"].put(
+                "reqless_test.test_job.Foo", "{}", jid=jid, tags=["bar"]
+            )
+        first, second = self.client.jobs.get("a", "b")
+        self.assertIs(first.klass_name, second.klass_name)
+        self.assertIs(first.queue_name, second.queue_name)
+        self.assertIs(first.tags[0], second.tags[0])
+        self.assertIs(first.history[0]["what"], second.history[0]["what"])
+
     def test_set_priority(self) -> None:
         """We can set a job's priority"""
         self.client.queues["foo"].put(
@@ -158,6 +195,7 @@ class TestJob(TestReqless):
         job = self.client.queues["foo"].pop()
         assert job is not None and not isinstance(job, List)
         job.complete()
+        self.assertEqual(job.state, "complete")
         job = self.get_job("jid")
         self.assertEqual(job.state, "complete")
 
@@ -167,9 +205,34 @@ class TestJob(TestReqless):
         job = self.client.queues["foo"].pop()
         assert job is not None and not isinstance(job, List)
         job.complete("bar")
+        self.assertEqual(job.state, "waiting")
         job = self.get_job("jid")
         self.assertEqual(job.state, "waiting")
 
+    def test_complete_pop_next(self) -> None:
+        """Completing a job can pop the next ones in the same call"""
+        for jid in ("jid-1", "jid-2", "jid-3"):
+            self.client.queues["foo"].put("reqless_test.test_job.Foo", "{}", jid=jid)
+        job = self.client.queues["foo"].pop()
+        assert job is not None and not isinstance(job, List)
+        self.assertEqual(job.complete(pop_next=2), "complete")
+        self.assertEqual([popped.jid for popped in job.popped], ["jid-2", "jid-3"])
+        self.assertEqual(self.get_job("jid-2").state, "running")
+        job = self.get_job("jid-3")
+        self.assertEqual(job.complete(pop_next=1), "complete")
+        self.assertEqual(job.popped, [])
+
+    def test_pop_on_complete(self) -> None:
+        """Jobs can be told which queues to pop from when completed"""
+        self.client.queues["foo"].put("reqless_test.test_job.Foo", "{}", jid="foo")
+        self.client.queues["bar"].put("reqless_test.test_job.Foo", "{}", jid="bar")
+        job = self.client.queues["foo"].pop()
+        assert job is not None and not isinstance(job, List)
+        job.pop_on_complete(2, ["bar", "whiz"])
+        self.assertEqual(job.complete("whiz"), "waiting")
+        self.assertEqual([popped.jid for popped in job.popped], ["bar", "foo"])
+        self.assertEqual(job.popped[1].queue_name, "whiz")
+
     def test_heartbeat(self) -> None:
         """Provides access to heartbeat"""
         self.client.config["heartbeat"] = 10
@@ -181,6 +244,39 @@ class TestJob(TestReqless):
         job.heartbeat()
         self.assertTrue(job.ttl > before)
 
+    def test_data_modified(self) -> None:
+        """Data is only sent back to the server once it's been modified"""
+        self.client.queues["foo"].put(
+            "reqless_test.test_job.Foo", '{"a": 1}', jid="jid"
+        )
+        job = self.client.queues["foo"].pop()
+        assert job is not None and not isinstance(job, List)
+        self.assertFalse(job.data_modified)
+        with mock.patch.object(
+            Client, "__call__", autospec=True, side_effect=Client.__call__
+        ) as call:
+            job.heartbeat()
+        call.assert_called_once_with(self.client, "heartbeat", "jid", mock.ANY)
+        job.data = '{"a": 2}'
+        self.assertTrue(job.data_modified)
+        job.heartbeat()
+        self.assertFalse(job.data_modified)
+        self.assertEqual(json.loads(self.get_job("jid").data), {"a": 2})
+
+    def test_complete_unmodified(self) -> None:
+        """Completing a job leaves its data be unless it's been modified"""
+        queue = self.client.queues["foo"]
+        queue.put("reqless_test.test_job.Foo", '{"a": 1}', jid="jid")
+        job = queue.pop()
+        assert job is not None and not isinstance(job, List)
+        job.complete("foo")
+        self.assertEqual(json.loads(self.get_job("jid").data), {"a": 1})
+        job = queue.pop()
+        assert job is not None and not isinstance(job, List)
+        job.data = '{"a": 2}'
+        job.complete()
+        self.assertEqual(json.loads(self.get_job("jid").data), {"a": 2})
+
     def test_heartbeat_fail(self) -> None:
         """Failed heartbeats raise an error"""
         from reqless.exceptions import LostLockError
@@ -188,6 +284,32 @@ class TestJob(TestReqless):
         self.client.queues["foo"].put("reqless_test.test_job.Foo", "{}", jid="jid")
         job = self.get_job("jid")
         self.assertRaises(LostLockError, job.heartbeat)
+        self.assertTrue(job.lost)
+
+    def test_check(self) -> None:
+        """Jobs flagged as lost raise an error on check and heartbeat"""
+        from reqless.exceptions import LostLockError
+
+        self.client.queues["foo"].put("reqless_test.test_job.Foo", "{}", jid="jid")
+        job = self.client.queues["foo"].pop()
+        assert job is not None and not isinstance(job, List)
+        job.check()
+        job.lost = True
+        self.assertRaises(LostLockError, job.check)
+        self.assertRaises(LostLockError, job.heartbeat)
+
+    def test_process_lost(self) -> None:
+        """Losing the lock while processing is raised, rather than failing"""
+        from reqless.exceptions import LostLockError
+
+        self.client.queues["foo"].put(
+            "reqless_test.common.LostLockJob", "{}", jid="jid"
+        )
+        job = self.client.queues["foo"].pop()
+        assert job is not None and not isinstance(job, List)
+        job.lost = True
+        self.assertRaises(LostLockError, job.process)
+        self.assertEqual(self.get_job("jid").state, "running")
 
     def test_track_untrack(self) -> None:
         """Exposes a track, untrack method"""
@@ -45,3 +45,14 @@ class TestListener(TestReqless):
         listener.unlisten()
         thread.join()
         self.assertEqual(count, 1)
+
+    def test_resubscribe(self) -> None:
+        """Listeners can switch the channels they listen to"""
+        listener = Listener(channels=["ql:popped"], database=self.client.database)
+        listener.subscribe()
+        listener.resubscribe(["ql:put"])
+        self.client.queues["foo"].pop()
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="jid")
+        message = next(listener.listen())
+        listener.unlisten()
+        self.assertEqual((message["channel"], message["data"]), ("ql:put", "jid"))
@@ -2,6 +2,8 @@
 
 from typing import List
 
+from reqless.exceptions import ReqlessError
+from reqless.job import Job, RecurringJob
 from reqless_test.common import TestReqless
 
 
@@ -18,6 +20,33 @@ class TestQueue(TestReqless):
         self.assertEqual(queue.jobs.scheduled(), [])
         self.assertEqual(queue.jobs.recurring(), [])
 
+    def test_iter_jobs(self) -> None:
+        """Streams through the jobs in each state, a page at a time"""
+        queue = self.client.queues["foo"]
+        jids = ["jid-%i" % index for index in range(5)]
+        for jid in jids:
+            queue.put("reqless_test.common.NoopJob", "{}", jid=jid)
+        queue.pop(5)
+        self.assertEqual(sorted(queue.jobs.iter_running(page_size=2)), jids)
+        jobs = list(queue.jobs.iter_running(hydrate=True, page_size=2))
+        self.assertEqual(sorted(getattr(job, "jid") for job in jobs), jids)
+        self.assertTrue(all(isinstance(job, Job) for job in jobs))
+        self.assertEqual(list(queue.jobs.iter_stalled(hydrate=True)), [])
+        self.assertEqual(list(queue.jobs.iter_depends()), [])
+        self.assertRaises(ValueError, list, queue.jobs.iter_scheduled(page_size=0))
+
+    def test_iter_recurring(self) -> None:
+        """Streams through the recurring jobs, a page at a time"""
+        queue = self.client.queues["foo"]
+        for jid in ("a", "b", "c"):
+            queue.recur("reqless_test.common.NoopJob", "{}", 60, jid=jid)
+        self.assertEqual(
+            sorted(queue.jobs.iter_recurring(page_size=2)), ["a", "b", "c"]
+        )
+        jobs = list(queue.jobs.iter_recurring(hydrate=True, page_size=2))
+        self.assertEqual(sorted(getattr(job, "jid") for job in jobs), ["a", "b", "c"])
+        self.assertTrue(all(isinstance(job, RecurringJob) for job in jobs))
+
     def test_counts(self) -> None:
         """Provides access to job counts"""
         self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}")
@@ -82,6 +111,20 @@ class TestQueue(TestReqless):
         assert isinstance(jobs, List)
         self.assertEqual(len(jobs), 2)
 
+    def test_light(self) -> None:
+        """Peeks and pops light jobs, without their history"""
+        queue = self.client.queues["foo"]
+        queue.put("reqless_test.common.NoopJob", "{}", jid="jid")
+        queue.put("reqless_test.common.NoopJob", "{}", jid="dependent", depends=["jid"])
+        for job in (queue.peek(light=True), queue.pop(light=True)):
+            assert job is not None and not isinstance(job, List)
+            self.assertEqual(job.jid, "jid")
+            self.assertEqual(job.history, [])
+            self.assertEqual(job.dependents, [])
+        fetched = self.client.jobs["jid"]
+        assert isinstance(fetched, Job)
+        self.assertEqual(len(fetched.history), 2)
+
     def test_stats(self) -> None:
         """Exposes stats"""
         self.client.queues["foo"].stats()
@@ -109,6 +152,55 @@ class TestQueue(TestReqless):
         queue_throttle = queue.throttle.name
         self.assertEqual(job.throttles, ["throttle", queue_throttle])
 
+    def test_put_many(self) -> None:
+        """Puts many jobs, returning their jids in order"""
+        queue = self.client.queues["foo"]
+        jids = queue.put_many(
+            [
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "jid": "a"},
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "jid": "b"},
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "tags": ["t"]},
+            ],
+            chunk_size=2,
+        )
+        self.assertEqual(jids[:2], ["a", "b"])
+        self.assertEqual(len(queue), 3)
+        job = self.client.jobs[str(jids[2])]
+        assert job is not None
+        self.assertEqual(job.tags, ["t"])
+
+    def test_put_many_failures(self) -> None:
+        """Reports failures for individual jobs without losing the others"""
+        queue = self.client.queues["foo"]
+        results = queue.put_many(
+            [
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "jid": "a"},
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "priority": "x"},
+                {"klass": "reqless_test.common.NoopJob", "data": "{}", "jid": "c"},
+            ]
+        )
+        self.assertEqual(results[0], "a")
+        self.assertIsInstance(results[1], ReqlessError)
+        self.assertEqual(results[2], "c")
+        self.assertEqual(len(queue), 2)
+
+    def test_recur_many(self) -> None:
+        """Places many recurring jobs"""
+        queue = self.client.queues["foo"]
+        jids = queue.recur_many(
+            [
+                {
+                    "klass": "reqless_test.common.NoopJob",
+                    "data": "{}",
+                    "interval": 60,
+                    "jid": jid,
+                }
+                for jid in ("a", "b")
+            ]
+        )
+        self.assertEqual(jids, ["a", "b"])
+        self.assertEqual(len(queue.jobs.recurring()), 2)
+
     def test_requeue_with_throttles(self) -> None:
         """Test requeue with throttles given"""
         queue = self.client.queues["foo"]
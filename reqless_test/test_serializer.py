@@ -0,0 +1,86 @@
+"""Test the serializers"""
+
+import unittest
+from typing import Any, Union
+from unittest import mock
+
+import reqless
+from reqless import serializer
+from reqless.abstract import AbstractSerializer
+from reqless.serializer import (
+    JsonSerializer,
+    MsgspecSerializer,
+    OrjsonSerializer,
+    default_serializer,
+)
+from reqless_test.common import TestReqless
+
+
+VALUE = {"foo": ["bar", 1, 2.5, None, True], "whiz": {"bang": "é"}}
+
+
+class CountingSerializer(JsonSerializer):
+    """Serializer that counts how often it's used"""
+
+    def __init__(self) -> None:
+        self.dumped: int = 0
+        self.loaded: int = 0
+
+    def dumps(self, value: Any) -> str:
+        self.dumped += 1
+        return super().dumps(value)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        self.loaded += 1
+        return super().loads(data)
+
+
+class TestSerializers(unittest.TestCase):
+    """Test the serializers"""
+
+    def assert_round_trips(self, instance: AbstractSerializer) -> None:
+        dumped = instance.dumps(VALUE)
+        self.assertIsInstance(dumped, str)
+        self.assertEqual(instance.loads(dumped), VALUE)
+        self.assertEqual(instance.loads(dumped.encode()), VALUE)
+        self.assertEqual(JsonSerializer().loads(dumped), VALUE)
+
+    def test_json(self) -> None:
+        """The standard library serializer round trips"""
+        self.assert_round_trips(JsonSerializer())
+
+    @unittest.skipIf(serializer.orjson is None, "orjson is not installed")
+    def test_orjson(self) -> None:
+        """The orjson serializer round trips"""
+        self.assert_round_trips(OrjsonSerializer())
+
+    @unittest.skipIf(serializer.msgspec is None, "msgspec is not installed")
+    def test_msgspec(self) -> None:
+        """The msgspec serializer round trips"""
+        self.assert_round_trips(MsgspecSerializer())
+
+    def test_default(self) -> None:
+        """The default is the fastest available serializer"""
+        with (
+            mock.patch.object(serializer, "orjson", None),
+            mock.patch.object(serializer, "msgspec", None),
+        ):
+            self.assertIsInstance(default_serializer(), JsonSerializer)
+        if serializer.orjson is not None:
+            self.assertIsInstance(default_serializer(), OrjsonSerializer)
+
+
+class TestClientSerializer(TestReqless):
+    """Test the client with a custom serializer"""
+
+    def test_custom_serializer(self) -> None:
+        """Clients use the serializer they're given"""
+        counting = CountingSerializer()
+        client = reqless.Client(serializer=counting)
+        self.assertIs(client.serializer, counting)
+        client.queues["foo"].put("reqless_test.common.NoopJob", "{}", tags=["tag"])
+        self.assertEqual(counting.dumped, 1)
+        job = client.queues["foo"].pop()
+        assert job is not None and not isinstance(job, list)
+        self.assertEqual(job.tags, ["tag"])
+        self.assertGreater(counting.loaded, 0)
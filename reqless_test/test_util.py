@@ -0,0 +1,36 @@
+"""Tests for our utility functions"""
+
+import unittest
+
+from reqless.util import chunks, import_class, intern_history, intern_strings
+from reqless.workers.serial_worker import SerialWorker
+
+
+class TestUtil(unittest.TestCase):
+    """Test the utility functions"""
+
+    def test_import_class(self) -> None:
+        """Imports a class by its full name"""
+        self.assertEqual(
+            import_class("reqless.workers.serial_worker.SerialWorker"), SerialWorker
+        )
+
+    def test_chunks(self) -> None:
+        """Splits items into lists of at most the given size"""
+        self.assertEqual(list(chunks(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunks([], 2)), [])
+
+    def test_chunks_invalid_size(self) -> None:
+        """Refuses to make empty chunks"""
+        self.assertRaises(ValueError, lambda: list(chunks([1], 0)))
+
+    def test_intern_strings(self) -> None:
+        """Equal strings are replaced with the same one"""
+        first, second = intern_strings(["".join(["fo", "o"])]), ["foo"]
+        self.assertIs(first[0], intern_strings(second)[0])
+
+    def test_intern_history(self) -> None:
+        """Strings in history entries are interned, and the rest left alone"""
+        history = intern_history([{"what": "".join(["po", "pped"]), "when": 1}])
+        self.assertEqual(history, [{"what": "popped", "when": 1}])
+        self.assertIs(history[0]["what"], intern_strings(["popped"])[0])
@@ -1,6 +1,7 @@
 """Test worker"""
 
-from typing import List
+from typing import List, Tuple
+from unittest import mock
 
 import reqless
 from reqless.abstract import AbstractClient, AbstractJob
@@ -62,6 +63,145 @@ class TestBaseWorker(TestReqless):
         jids = [job.jid for job in worker.resume]
         self.assertEqual(jids, [jid])
 
+    def test_jobs_in_queue_order(self) -> None:
+        """Jobs are popped from earlier queues first, yielding None when idle"""
+        worker = BaseWorker(["foo", "bar"], self.client)
+        self.client.queues["bar"].put("reqless_test.common.NoopJob", "{}", jid="bar")
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="foo")
+        jobs = worker.jobs()
+        jids = [getattr(next(jobs), "jid", None) for _ in range(3)]
+        self.assertEqual(jids, ["foo", "bar", None])
+
+    def test_jobs_round_robin(self) -> None:
+        """Each queue with work takes its turn, however busy the ones before"""
+        worker = BaseWorker(["foo", "bar", "baz"], self.client)
+        for jid in ("foo-1", "foo-2", "foo-3"):
+            self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid=jid)
+        for jid in ("baz-1", "baz-2"):
+            self.client.queues["baz"].put("reqless_test.common.NoopJob", "{}", jid=jid)
+        jobs = worker.jobs()
+        jids = [getattr(next(jobs), "jid", None) for _ in range(6)]
+        self.assertEqual(jids, ["foo-1", "baz-1", "foo-2", "baz-2", "foo-3", None])
+
+    def test_pop_next(self) -> None:
+        """Jobs popped when completing a job are handed out next"""
+        for jid in ("jid-1", "jid-2", "jid-3"):
+            self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid=jid)
+        worker = BaseWorker(["foo"], self.client, pop_next=2)
+        jobs = worker.jobs()
+        job = next(jobs)
+        assert job is not None
+        with worker.processing(job):
+            job.complete()
+        self.assertEqual([popped.jid for popped in worker.popped], ["jid-2", "jid-3"])
+        assert worker.heartbeater is not None
+        self.assertEqual(sorted(worker.heartbeater._jobs), ["jid-2", "jid-3"])
+        self.assertEqual(getattr(next(jobs), "jid", None), "jid-2")
+        self.assertEqual(sorted(worker.heartbeater._jobs), ["jid-3"])
+        jobs.close()
+        self.assertEqual(self.client.queues["foo"].counts["waiting"], 1)
+        self.assertEqual(worker.heartbeater._jobs, {})
+
+    def test_discard_popped(self) -> None:
+        """Jobs popped when completing a job are dropped once lost"""
+        for jid in ("jid-1", "jid-2", "jid-3"):
+            self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid=jid)
+        worker = BaseWorker(["foo"], self.client, pop_next=2)
+        jobs = worker.jobs()
+        job = next(jobs)
+        assert job is not None
+        with worker.processing(job):
+            job.complete()
+        worker.discard("jid-2")
+        worker.discard("jid-4")
+        self.assertEqual([popped.jid for popped in worker.popped], ["jid-3"])
+        assert worker.heartbeater is not None
+        self.assertEqual(sorted(worker.heartbeater._jobs), ["jid-3"])
+        self.assertEqual(getattr(next(jobs), "jid", None), "jid-3")
+        jobs.close()
+
+    def test_wait(self) -> None:
+        """Waiting for work times out unless we're woken"""
+        self.assertFalse(self.worker.wait(0.01))
+        self.worker.wake()
+        self.assertTrue(self.worker.wait(1))
+        self.assertFalse(self.worker.wait(0.01))
+
+    def test_stop(self) -> None:
+        """Stopping cuts short any wait for work"""
+        self.worker.stop()
+        self.assertTrue(self.worker.shutdown)
+        self.assertTrue(self.worker.wait(1))
+
+    def test_retirement_reason(self) -> None:
+        """Workers retire once they reach any of their limits"""
+        self.assertIsNone(self.worker.retirement_reason())
+        worker = BaseWorker(["foo"], self.client, max_jobs_per_child=2)
+        worker.processed = 1
+        self.assertIsNone(worker.retirement_reason())
+        worker.processed = 2
+        self.assertEqual(worker.retirement_reason(), "processed 2 jobs")
+        worker = BaseWorker(["foo"], self.client, max_child_age_s=60)
+        self.assertIsNone(worker.retirement_reason())
+        worker.started_at -= 61
+        self.assertEqual(worker.retirement_reason(), "lived for 61s")
+        worker = BaseWorker(["foo"], self.client, max_rss_mb=100)
+        with mock.patch("reqless.workers.base_worker.rss_mb", return_value=99):
+            self.assertIsNone(worker.retirement_reason())
+        with mock.patch("reqless.workers.base_worker.rss_mb", return_value=150):
+            self.assertEqual(worker.retirement_reason(), "grew to 150MB")
+
+    def test_retire(self) -> None:
+        """Retiring stops the worker and says why"""
+        reasons: List[str] = []
+        worker = BaseWorker(
+            ["foo"], self.client, max_jobs_per_child=1, on_retire=reasons.append
+        )
+        self.assertFalse(worker.should_retire())
+        worker.processed = 1
+        self.assertTrue(worker.should_retire())
+        self.assertTrue(worker.shutdown)
+        self.assertEqual(reasons, ["processed 1 jobs"])
+
+    def test_listen_wakes(self) -> None:
+        """Work landing in the queues we pop from wakes the worker"""
+        listener = mock.Mock()
+        listener.listen.return_value = [{"channel": "ql:wake:foo", "data": "jid"}]
+        with mock.patch.object(self.worker, "wake") as wake:
+            self.worker.listen(listener)
+        wake.assert_called_once_with()
+
+    def test_wake_channels(self) -> None:
+        """Jobs put or advanced into a queue are announced on its channel"""
+        pubsub = self.client.database.pubsub()
+        pubsub.subscribe("ql:wake:foo", "ql:wake:bar")
+        self.client.queues["foo"].put("reqless_test.common.NoopJob", "{}", jid="jid")
+        job = self.client.queues["foo"].pop()
+        assert job is not None and not isinstance(job, List)
+        job.complete("bar")
+        messages: List[Tuple[str, str]] = []
+        while len(messages) < 2:
+            message = pubsub.get_message(timeout=1)
+            assert message is not None
+            if message["type"] == "message":
+                messages.append((message["channel"], message["data"]))
+        pubsub.close()
+        self.assertEqual(messages, [("ql:wake:foo", "jid"), ("ql:wake:bar", "jid")])
+
+    def test_channels_follow_queues(self) -> None:
+        """The listener follows the queues we pop from as they change"""
+        self.worker.resolve_queue_names()
+        listener = mock.Mock()
+        self.worker._listener = listener
+        with mock.patch.object(
+            self.worker.queue_resolver, "resolve", return_value=["foo", "bar"]
+        ):
+            self.worker.resolve_queue_names()
+            self.worker.resolve_queue_names()
+        listener.resubscribe.assert_called_once_with(
+            ["ql:w:worker", "ql:wake:foo", "ql:wake:bar"]
+        )
+
     def test_queue_resolver_when_list_of_queues_given(self) -> None:
         """When given a list of queues, it wraps them in a queue resolver"""
         queue_names = ["foo"]
@@ -1,16 +1,19 @@
 """Test the forking worker"""
 
+import gc
 import json
 import os
 import signal
 import time
 from threading import Thread
-from typing import Optional
+from typing import Any, List, Optional, Tuple
+from unittest import mock
 
 from reqless.abstract import AbstractJob
+from reqless.importer import Importer
 from reqless.workers.base_worker import BaseWorker
 from reqless.workers.forking_worker import ForkingWorker
-from reqless_test.common import TestReqless
+from reqless_test.common import NoopJob, TestReqless
 
 
 class Foo:
@@ -56,6 +59,8 @@ class TestForkingWorker(TestReqless):
     def tearDown(self) -> None:
         if self.thread:
             self.thread.join()
+        # Running the worker disables the garbage collector until it forks
+        gc.enable()
         TestReqless.tearDown(self)
 
     def test_respawn(self) -> None:
@@ -94,3 +99,188 @@ class TestForkingWorker(TestReqless):
     def test_spawn(self) -> None:
         """It gives us back a worker instance"""
         self.assertIsInstance(self.worker.spawn(), BaseWorker)
+
+    def test_warmup(self) -> None:
+        """It preloads modules and job classes, and skips what it can't"""
+        worker = PatchedForkingWorker(
+            ["foo"],
+            self.client,
+            preload=[
+                "reqless_test.common",
+                "reqless_test.workers.test_forking_worker.CWD",
+                "reqless_test.missing",
+            ],
+        )
+        self.assertNotIn("preload", worker.kwargs)
+        Importer._classes.pop("reqless_test.workers.test_forking_worker.CWD", None)
+        worker.warmup()
+        self.assertIn("reqless_test.workers.test_forking_worker.CWD", Importer._classes)
+
+    def test_before_fork(self) -> None:
+        """It runs the hook, and freezes the heap only while forking"""
+        manager = mock.Mock()
+        manager.fork.return_value = 12345
+        worker = PatchedForkingWorker(["foo"], self.client, before_fork=manager.hook)
+        self.assertNotIn("before_fork", worker.kwargs)
+        with mock.patch("reqless.workers.forking_worker.gc", manager.gc):
+            with mock.patch("reqless.workers.forking_worker.os.fork", manager.fork):
+                self.assertEqual(worker.fork(worker.sandbox()), 12345)
+        os.close(worker.lifelines.pop(12345))
+        self.assertEqual(
+            manager.mock_calls,
+            [
+                mock.call.hook(worker),
+                mock.call.gc.freeze(),
+                mock.call.fork(),
+                mock.call.gc.unfreeze(),
+                mock.call.gc.enable(),
+            ],
+        )
+
+    def test_after_fork(self) -> None:
+        """It connects the client anew, and then runs the hook"""
+        calls: List[str] = []
+        worker = PatchedForkingWorker(
+            ["foo"],
+            self.client,
+            after_fork=lambda worker: calls.append("hook"),
+        )
+        self.assertNotIn("after_fork", worker.kwargs)
+        with mock.patch.object(
+            self.client, "reconnect", side_effect=lambda: calls.append("reconnect")
+        ):
+            worker.after_fork()
+        self.assertEqual(calls, ["reconnect", "hook"])
+
+    def test_on_child_exit(self) -> None:
+        """It tells the hook about every child that exits"""
+        exits: List[Tuple[int, int]] = []
+        self.worker = PatchedForkingWorker(
+            ["foo"],
+            self.client,
+            workers=1,
+            interval=1,
+            on_child_exit=lambda worker, pid, status: exits.append((pid, status)),
+        )
+        self.thread = Thread(target=self.worker.run)
+        self.thread.start()
+        time.sleep(0.1)
+        self.worker.shutdown = True
+        self.queue.put(Foo, "{}")
+        self.thread.join(1)
+        self.assertFalse(self.thread.is_alive())
+        # The child that killed itself, and then its replacement
+        self.assertEqual(len(exits), 2)
+        self.assertEqual(exits[0][1] & 0xFF, signal.SIGKILL)
+
+    def test_recycle(self) -> None:
+        """Children retire once they reach their limits, and are replaced"""
+        exits: List[Tuple[int, int]] = []
+        self.worker = PatchedForkingWorker(
+            ["foo"],
+            self.client,
+            workers=1,
+            interval=1,
+            max_jobs_per_child=1,
+            on_child_exit=lambda worker, pid, status: exits.append((pid, status)),
+        )
+        self.thread = Thread(target=self.worker.run)
+        self.thread.start()
+        first = self.queue.put(NoopJob, "{}")
+        deadline = time.time() + 5
+        while not exits and time.time() < deadline:
+            time.sleep(0.01)
+        # The first child exited cleanly, and its replacement works next
+        self.assertEqual(exits[0][1], 0)
+        self.worker.shutdown = True
+        second = self.queue.put(NoopJob, "{}")
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        for jid in (first, second):
+            job = self.client.jobs[jid]
+            assert isinstance(job, AbstractJob)
+            self.assertEqual(job.state, "complete")
+
+    def test_replace(self) -> None:
+        """A retiring child is replaced once, without waiting for it to exit"""
+        with mock.patch.object(self.worker, "fork", return_value=2) as fork:
+            self.worker.sandboxes[1] = self.worker.sandbox()
+            self.worker.replace(1)
+            self.worker.replace(1)
+            self.assertEqual(fork.call_count, 1)
+            # Once it exits, it isn't replaced again
+            self.worker.reaped(1, 0)
+            self.assertEqual(fork.call_count, 1)
+            self.assertEqual(self.worker.replaced, set())
+            # But a child that dies unexpectedly is
+            self.worker.sandboxes[3] = self.worker.sandbox()
+            self.worker.reaped(3, signal.SIGKILL)
+            self.assertEqual(fork.call_count, 2)
+
+    def test_sandbox(self) -> None:
+        """Each child gets the first sandbox that's free"""
+        path = os.path.join(os.getcwd(), "reqless-py-workers", "sandbox-%s")
+        self.assertEqual(self.worker.sandbox(), path % 0)
+        self.worker.sandboxes = {1: path % 0, 2: path % 2}
+        self.assertEqual(self.worker.sandbox(), path % 1)
+
+    def fork(self, sandbox: str, **kwargs: Any) -> int:
+        """Pretend to fork a child"""
+        pid = max(self.worker.sandboxes, default=0) + 1
+        self.worker.sandboxes[pid] = sandbox
+        return pid
+
+    def test_demand(self) -> None:
+        """It measures how many jobs are waiting, and how long they wait"""
+        for _ in range(3):
+            self.queue.put(NoopJob, "{}")
+        self.assertEqual(self.worker.demand(), (3, 0.0))
+        worker = PatchedForkingWorker(["foo"], self.client, scale_wait=1)
+        self.queue.pop()
+        demand = worker.demand()
+        assert demand is not None
+        self.assertEqual(demand[0], 2)
+        self.assertGreaterEqual(demand[1], 0)
+
+    def test_autoscale_grows(self) -> None:
+        """It forks as many children as the waiting jobs call for"""
+        self.worker = PatchedForkingWorker(
+            ["foo"], self.client, min_workers=1, max_workers=4, scale_depth=2
+        )
+        self.assertEqual(self.worker.count, 1)
+        self.fork(self.worker.sandbox())
+        for _ in range(5):
+            self.queue.put(NoopJob, "{}")
+        with mock.patch.object(self.worker, "fork", side_effect=self.fork):
+            self.worker.autoscale()
+            self.assertEqual(self.worker.count, 3)
+            self.assertEqual(len(self.worker.sandboxes), 3)
+            # But never beyond the most children allowed
+            for _ in range(20):
+                self.queue.put(NoopJob, "{}")
+            self.worker.autoscale()
+            self.assertEqual(self.worker.count, 4)
+            self.assertEqual(len(self.worker.sandboxes), 4)
+
+    def test_autoscale_shrinks(self) -> None:
+        """It stops idle children, one at a time, once no jobs are waiting"""
+        self.worker = PatchedForkingWorker(
+            ["foo"], self.client, min_workers=1, max_workers=4
+        )
+        self.worker.count = 3
+        for _ in range(3):
+            self.fork(self.worker.sandbox())
+        with mock.patch.object(self.worker, "fork", side_effect=self.fork) as fork:
+            with mock.patch("reqless.workers.forking_worker.os.kill") as kill:
+                # Busy children aren't stopped
+                self.worker.autoscale()
+                self.assertEqual(self.worker.count, 3)
+                self.worker.heard(2, "i")
+                self.worker.heard(3, "i")
+                self.worker.autoscale()
+                kill.assert_called_once_with(2, signal.SIGQUIT)
+            self.assertEqual(self.worker.count, 2)
+            self.assertEqual(self.worker.children(), 2)
+            # And once it's gone, it isn't replaced
+            self.worker.reaped(2, 0)
+            fork.assert_not_called()
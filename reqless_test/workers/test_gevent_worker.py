@@ -8,6 +8,7 @@ from typing import Generator, Optional
 import gevent
 
 from reqless.abstract import AbstractJob, AbstractQueue
+from reqless.exceptions import LostLockError
 from reqless.listener import Listener
 from reqless.workers.gevent_worker import GeventWorker
 from reqless_test.common import TestReqless
@@ -93,7 +94,7 @@ class TestGeventWorker(TestReqless):
         worker.greenlets["foo"] = greenlet
         worker.halt_job_processing("foo")
         greenlet.join()
-        self.assertIsInstance(greenlet.value, gevent.GreenletExit)
+        self.assertIsInstance(greenlet.exception, LostLockError)
 
     def test_halt_job_processing_dead(self) -> None:
         """Does not panic if the greenlet handling a job is no longer around"""
@@ -0,0 +1,75 @@
+"""Test the heartbeater"""
+
+import time
+from typing import List
+
+from reqless.abstract import AbstractJob
+from reqless.workers.gevent_worker import GeventHeartbeater
+from reqless.workers.heartbeater import Heartbeater
+from reqless_test.common import TestReqless
+
+
+class TestHeartbeater(TestReqless):
+    """Test the heartbeater"""
+
+    def setUp(self) -> None:
+        TestReqless.setUp(self)
+        self.client.worker_name = "worker"
+        self.queue = self.client.queues["foo"]
+        self.queue.put("reqless_test.common.NoopJob", "{}", jid="jid")
+        job = self.queue.pop()
+        assert job is not None and isinstance(job, AbstractJob)
+        self.job: AbstractJob = job
+        self.lost: List[str] = []
+
+    def expire(self, job: AbstractJob) -> None:
+        """Make the provided job look due for a heartbeat"""
+        job.expires_at = time.time()
+
+    def test_fraction(self) -> None:
+        """The fraction must fall strictly between 0 and 1"""
+        self.assertRaises(ValueError, Heartbeater, self.client, fraction=0)
+        self.assertRaises(ValueError, Heartbeater, self.client, fraction=1)
+
+    def test_beat(self) -> None:
+        """Jobs are heartbeated once the fraction of their ttl has elapsed"""
+        heartbeater = Heartbeater(self.client, fraction=0.5)
+        self.assertIsNone(heartbeater.beat())
+        heartbeater.add(self.job)
+        timeout = heartbeater.beat()
+        assert timeout is not None
+        self.assertAlmostEqual(timeout, self.job.ttl / 2, delta=1)
+        self.expire(self.job)
+        heartbeater.add(self.job)
+        heartbeater.beat()
+        self.assertGreater(self.job.ttl, 1)
+
+    def test_remove(self) -> None:
+        """Removed jobs are no longer heartbeated"""
+        heartbeater = Heartbeater(self.client)
+        self.expire(self.job)
+        heartbeater.add(self.job)
+        heartbeater.remove(self.job.jid)
+        self.assertIsNone(heartbeater.beat())
+        self.assertLess(self.job.ttl, 1)
+
+    def test_lost(self) -> None:
+        """Jobs whose locks are lost are dropped and reported"""
+        heartbeater = Heartbeater(self.client, on_lost=self.lost.append)
+        self.queue.put("reqless_test.common.NoopJob", "{}", jid="jid")
+        self.expire(self.job)
+        heartbeater.add(self.job)
+        self.assertIsNone(heartbeater.beat())
+        self.assertEqual(self.lost, ["jid"])
+
+    def test_background(self) -> None:
+        """Jobs are heartbeated in the background once started"""
+        for heartbeater in (Heartbeater(self.client), GeventHeartbeater(self.client)):
+            self.expire(self.job)
+            heartbeater.start()
+            heartbeater.add(self.job)
+            deadline = time.time() + 5
+            while self.job.ttl < 1:
+                self.assertLess(time.time(), deadline)
+                heartbeater.wait(0.01)
+            heartbeater.stop()
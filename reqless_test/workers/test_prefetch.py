@@ -0,0 +1,188 @@
+"""Test the prefetch buffer"""
+
+import json
+from unittest import mock
+
+from reqless.abstract import AbstractJob
+from reqless.exceptions import LostLockError
+from reqless.job import Job
+from reqless.workers.base_worker import BaseWorker
+from reqless.workers.heartbeater import Heartbeater
+from reqless.workers.prefetch import PrefetchBuffer
+from reqless.workers.serial_worker import SerialWorker
+from reqless_test.common import TestReqless
+
+
+class TestPrefetchBuffer(TestReqless):
+    """Test the prefetch buffer"""
+
+    def setUp(self) -> None:
+        TestReqless.setUp(self)
+        self.client.worker_name = "worker"
+        self.queue = self.client.queues["foo"]
+        for index in range(5):
+            self.queue.put("reqless_test.common.NoopJob", "{}", jid="jid-%i" % index)
+
+    def test_configured_count(self) -> None:
+        """Popping fills the buffer with the configured number of jobs"""
+        buffer = PrefetchBuffer(self.client, counts={"foo": 3})
+        job = buffer.pop(["foo"])
+        assert job is not None
+        self.assertEqual(job.jid, "jid-0")
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(self.queue.counts["running"], 3)
+
+    def test_single_round_trip(self) -> None:
+        """Each batch is popped in a single call, sized for the last queue
+        that had work"""
+        buffer = PrefetchBuffer(self.client, counts={"foo": 3, "bar": 2})
+        with mock.patch.object(
+            self.client, "pop_from", wraps=self.client.pop_from
+        ) as pop_from:
+            buffer.pop(["bar", "foo"])
+            pop_from.assert_called_once_with(["bar", "foo"], 2)
+            self.assertEqual(len(buffer), 1)
+            buffer.pop(["bar", "foo"])
+            buffer.pop(["bar", "foo"])
+            self.assertEqual(pop_from.call_args, mock.call(["bar", "foo"], 3))
+
+    def test_batch_size(self) -> None:
+        """Batches cover the window at the recorded rate, within bounds"""
+        buffer = PrefetchBuffer(self.client, max_count=10, window=1.0)
+        self.assertEqual(buffer.batch_size("foo"), 1)
+        buffer.record("foo", 0.25)
+        self.assertEqual(buffer.batch_size("foo"), 4)
+        buffer.record("bar", 0.001)
+        self.assertEqual(buffer.batch_size("bar"), 10)
+        buffer.record("whiz", 5.0)
+        self.assertEqual(buffer.batch_size("whiz"), 1)
+
+    def test_batch_size_concurrency(self) -> None:
+        """Batches cover the window for all of the jobs processed at once"""
+        buffer = PrefetchBuffer(self.client, window=1.0, concurrency=4)
+        buffer.record("foo", 0.5)
+        self.assertEqual(buffer.batch_size("foo"), 8)
+
+    def test_record_smooths(self) -> None:
+        """Later durations are blended with earlier ones"""
+        buffer = PrefetchBuffer(self.client, window=1.0)
+        buffer.record("foo", 0.1)
+        buffer.record("foo", 1.1)
+        self.assertEqual(buffer.batch_size("foo"), 3)
+
+    def test_discard(self) -> None:
+        """Discarded jobs are not handed out"""
+        buffer = PrefetchBuffer(self.client, counts={"foo": 3})
+        buffer.pop(["foo"])
+        buffer.discard("jid-1")
+        job = buffer.pop(["foo"])
+        assert job is not None
+        self.assertEqual(job.jid, "jid-2")
+
+    def test_release(self) -> None:
+        """Releasing the buffer puts unstarted jobs back in their queues"""
+        buffer = PrefetchBuffer(self.client, counts={"foo": 3})
+        buffer.pop(["foo"])
+        buffer.release()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(self.queue.counts["running"], 1)
+        self.assertEqual(self.queue.counts["waiting"], 4)
+
+    def test_renew(self) -> None:
+        """Buffered jobs close to expiring are heartbeated before handout"""
+        buffer = PrefetchBuffer(self.client, counts={"foo": 2}, renew_margin=120)
+        buffer.pop(["foo"])
+        with mock.patch.object(Job, "heartbeat", autospec=True) as heartbeat:
+            job = buffer.pop(["foo"])
+        heartbeat.assert_called_once_with(job)
+
+    def test_heartbeated_while_buffered(self) -> None:
+        """With a heartbeater, jobs are heartbeated until handed out"""
+        heartbeater = Heartbeater(self.client)
+        buffer = PrefetchBuffer(self.client, counts={"foo": 4}, heartbeater=heartbeater)
+        job = buffer.pop(["foo"])
+        assert job is not None
+        self.assertEqual(sorted(heartbeater._jobs), ["jid-1", "jid-2", "jid-3"])
+        buffer.discard("jid-1")
+        self.assertEqual(sorted(heartbeater._jobs), ["jid-2", "jid-3"])
+        with mock.patch.object(Job, "heartbeat", autospec=True) as heartbeat:
+            buffer.pop(["foo"])
+        heartbeat.assert_not_called()
+        self.assertEqual(sorted(heartbeater._jobs), ["jid-3"])
+        buffer.release()
+        self.assertEqual(heartbeater._jobs, {})
+
+    def test_discarded_while_renewing(self) -> None:
+        """Jobs discarded meanwhile don't trip up renewal"""
+        buffer = PrefetchBuffer(self.client, counts={"foo": 3}, renew_margin=120)
+        buffer.pop(["foo"])
+
+        def heartbeat(job: AbstractJob) -> float:
+            buffer.discard(job.jid)
+            raise LostLockError(job.jid)
+
+        with mock.patch.object(Job, "heartbeat", autospec=True) as patched:
+            patched.side_effect = heartbeat
+            self.assertIsNone(buffer.pop(["foo"]))
+
+    def test_lost_lock(self) -> None:
+        """Buffered jobs we can no longer heartbeat are dropped"""
+        buffer = PrefetchBuffer(self.client, counts={"foo": 2}, renew_margin=120)
+        buffer.pop(["foo"])
+        self.queue.put("reqless_test.common.NoopJob", "{}", jid="jid-1")
+        self.assertEqual(getattr(buffer.pop(["foo"]), "jid", None), "jid-2")
+
+    def test_worker_prefetch(self) -> None:
+        """Workers hand out prefetched jobs one at a time, releasing the rest"""
+        worker = BaseWorker(
+            ["foo"], self.client, prefetch=True, prefetch_counts={"foo": 2}
+        )
+        jobs = worker.jobs()
+        jids = [getattr(next(jobs), "jid", None) for _ in range(2)]
+        self.assertEqual(jids, ["jid-0", "jid-1"])
+        self.assertEqual(self.queue.counts["running"], 2)
+        next(jobs)
+        jobs.close()
+        self.assertEqual(self.queue.counts["running"], 3)
+        self.assertEqual(self.queue.counts["waiting"], 2)
+
+    def test_worker_records_processing(self) -> None:
+        """Workers record how long jobs took to process, not to hand out"""
+        worker = BaseWorker(["foo"], self.client, prefetch=True)
+        assert worker.prefetch is not None
+        jobs = worker.jobs()
+        job = next(jobs)
+        assert job is not None
+        with mock.patch.object(worker.prefetch, "record") as record:
+            with mock.patch("time.time", side_effect=[100.0, 102.5]):
+                with worker.processing(job):
+                    pass
+            record.assert_called_once_with("foo", 2.5)
+            next(jobs)
+            jobs.close()
+            record.assert_called_once_with("foo", 2.5)
+
+    def test_worker_heartbeats_buffer(self) -> None:
+        """Prefetching workers heartbeat buffered jobs, but not in-flight ones
+        unless asked to"""
+        worker = BaseWorker(["foo"], self.client, prefetch=True)
+        assert worker.prefetch is not None
+        self.assertIs(worker.prefetch.heartbeater, worker.heartbeater)
+        self.assertFalse(worker.heartbeat_in_flight)
+
+    def test_worker_listen_discards(self) -> None:
+        """Jobs we lose the lock on while buffered are discarded"""
+        worker = SerialWorker(
+            ["foo"], self.client, prefetch=True, prefetch_counts={"foo": 3}
+        )
+        jobs = worker.jobs()
+        next(jobs)
+        listener = mock.Mock()
+        listener.listen.return_value = [
+            {
+                "channel": "ql:w:worker",
+                "data": json.dumps({"event": "lock_lost", "jid": "jid-1"}),
+            }
+        ]
+        worker.listen(listener)
+        self.assertEqual(getattr(next(jobs), "jid", None), "jid-2")
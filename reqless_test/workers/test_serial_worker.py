@@ -4,12 +4,13 @@ import json
 import time
 from tempfile import NamedTemporaryFile
 from threading import Thread
-from typing import Generator, Optional
+from typing import Generator, List, Optional
 
+from reqless import logger
 from reqless.abstract import AbstractJob
 from reqless.listener import Listener
 from reqless.workers.serial_worker import SerialWorker
-from reqless_test.common import BlockingJob, TestReqless
+from reqless_test.common import BlockingJob, LostLockJob, NoopJob, TestReqless
 
 
 class ShortLivedSerialWorker(SerialWorker):
@@ -22,6 +23,11 @@ class ShortLivedSerialWorker(SerialWorker):
         self.client.database.rpush("foo", jid)
 
 
+class UnlistenedSerialWorker(SerialWorker):
+    def listen(self, listener: Listener) -> None:
+        pass
+
+
 class NoListenSerialWorker(ShortLivedSerialWorker):
     def listen(self, listener: Listener) -> None:
         pass
@@ -64,6 +70,31 @@ class TestSerialWorker(TestReqless):
         NoListenSerialWorker(["foo"], self.client, interval=0.2).run()
         self.assertGreater(time.time() - before, 0.2)
 
+    def test_pop_next(self) -> None:
+        """Completing jobs can pop the jobs the worker works on next"""
+        jids = [self.queue.put(NoopJob, "{}") for _ in range(3)]
+        worker = NoListenSerialWorker(["foo"], self.client, interval=0.1, pop_next=1)
+        worker.run()
+        for jid in jids:
+            job = self.client.jobs[jid]
+            assert job is not None and isinstance(job, AbstractJob)
+            self.assertEqual(job.state, "complete")
+
+    def test_wakes_for_new_work(self) -> None:
+        """An idle worker wakes as soon as work lands in one of its queues"""
+        worker = SerialWorker(["foo"], self.client, interval=60)
+        self.thread = Thread(target=worker.run)
+        self.thread.start()
+        # Give the worker a chance to subscribe and find nothing to do
+        time.sleep(0.2)
+        jid = self.queue.put(NoopJob, "{}")
+        deadline = time.time() + 5
+        while self.client.jobs[jid].state != "complete":  # type: ignore[union-attr]
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+        worker.stop()
+        worker.wake()
+
     def test_lost_locks(self) -> None:
         """The worker should be able to stop processing if need be"""
         temp_file = NamedTemporaryFile()
@@ -84,6 +115,41 @@ class TestSerialWorker(TestReqless):
         temp_file.close()
         self.assertEqual(self.client.database.brpop(["foo"], 1), ("foo", jid))
 
+    def test_lost_lock_raised_in_job(self) -> None:
+        """Jobs whose locks are lost have a LostLockError raised in them when
+        they next check, which the worker sees rather than failing the job"""
+        jid = self.queue.put(LostLockJob, "{}")
+        worker = UnlistenedSerialWorker(["foo"], self.client, interval=0.1)
+        self.thread = Thread(target=worker.run)
+        self.thread.start()
+        job = self.client.jobs[jid]
+        assert job is not None and isinstance(job, AbstractJob)
+        while job.state != "running":
+            time.sleep(0.01)
+            job = self.client.jobs[jid]
+            assert job is not None and isinstance(job, AbstractJob)
+        worker.stop()
+        with self.assertLogs(logger, "WARNING") as logs:
+            worker.halt_job_processing(jid)
+            self.assertEqual(self.client.database.brpop(["lost"], 5), ("lost", jid))
+            assert self.thread is not None
+            self.thread.join()
+        self.assertIn("Abandoned %s after losing its lock" % jid, logs.output[-1])
+        job = self.client.jobs[jid]
+        assert job is not None and isinstance(job, AbstractJob)
+        self.assertEqual(job.state, "running")
+
+    def test_halt_finished_job(self) -> None:
+        """Jobs that have already been completed are left alone"""
+        jid = self.queue.put(NoopJob, "{}")
+        job = self.queue.pop()
+        assert job is not None and isinstance(job, AbstractJob)
+        job.complete()
+        worker = SerialWorker(["foo"], self.client)
+        worker._job = job
+        worker.halt_job_processing(jid)
+        self.assertFalse(job.lost)
+
     def test_halt_job_processing(self) -> None:
         """Should be able to fall on its sword if need be"""
         worker = SerialWorker([], self.client)
@@ -105,3 +171,32 @@ class TestSerialWorker(TestReqless):
         worker = SerialWorker([], self.client, interval=0.1)
         worker.stop()
         worker.run()
+
+    def test_max_jobs_per_child(self) -> None:
+        """It retires after processing so many jobs"""
+        jids = [self.queue.put(NoopJob, "{}") for _ in range(3)]
+        reasons: List[str] = []
+        worker = UnlistenedSerialWorker(
+            ["foo"],
+            self.client,
+            interval=0.1,
+            max_jobs_per_child=2,
+            on_retire=reasons.append,
+        )
+        worker.run()
+        self.assertEqual(reasons, ["processed 2 jobs"])
+        states = []
+        for jid in jids:
+            job = self.client.jobs[jid]
+            assert job is not None and isinstance(job, AbstractJob)
+            states.append(job.state)
+        self.assertEqual(states, ["complete", "complete", "waiting"])
+
+    def test_idle(self) -> None:
+        """It says when it runs out of jobs"""
+        self.queue.put(NoopJob, "{}")
+        reports: List[bool] = []
+        NoListenSerialWorker(
+            ["foo"], self.client, interval=0.01, on_idle=reports.append
+        ).run()
+        self.assertEqual(reports, [True])
@@ -2,7 +2,14 @@ import itertools
 import os
 
 from reqless.job import Job
-from reqless.workers.util import clean, create_sandbox, divide, get_title, set_title
+from reqless.workers.util import (
+    clean,
+    create_sandbox,
+    divide,
+    get_title,
+    rss_mb,
+    set_title,
+)
 from reqless_test.common import TestReqless
 
 
@@ -105,3 +112,12 @@ class TestWorkerUtil(TestReqless):
         self.assertEqual(list(range(100)), divided_jids)
         lengths = [len(batch) for batch in items]
         self.assertLessEqual(max(lengths) - min(lengths), 1)
+
+    def test_rss_mb(self) -> None:
+        """It measures how much memory we're using"""
+        rss = rss_mb()
+        self.assertGreater(rss, 1)
+        # Growing by 64MB shows up in the measurement
+        ballast = bytearray(64 * 1024 * 1024)
+        self.assertGreater(rss_mb(), rss + 32)
+        del ballast